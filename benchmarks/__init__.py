@@ -0,0 +1 @@
+"""benchmarks of plxhelper's hot local paths and remote-call budgets; see __main__.py"""
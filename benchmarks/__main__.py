@@ -0,0 +1,93 @@
+"""command line for the plxhelper benchmarks
+
+    python -m benchmarks run [PATTERN ...] [--label LABEL]
+    python -m benchmarks compare [--baseline -2] [--current -1] [--threshold 0.2]
+
+run times the benchmarks, checks the remote-call budgets and appends the results to the JSON history. compare flags
+the benchmarks of one history record that regressed from another; both commands exit with status 1 on failure.
+"""
+
+import argparse
+import sys
+
+from benchmarks.suite import (
+    DEFAULT_THRESHOLD,
+    HISTORY_PATH,
+    append_history,
+    compare,
+    history_record,
+    load_history,
+    run_benchmarks,
+)
+
+
+def _run(args) -> int:
+    results = run_benchmarks(args.patterns or ("*",), repeat=args.repeat)
+    width = max((len(result.name) for result in results), default=0)
+    for result in results:
+        line = f"{result.name:<{width}}  {result.seconds * 1e6:12.1f} µs"
+        if result.remote_calls is not None:
+            total = sum(result.remote_calls.values())
+            line += f"  {total:5d} remote calls (budget {result.budget})"
+            if result.over_budget:
+                line += "  OVER BUDGET " + str(dict(result.remote_calls))
+        print(line)
+    if not args.no_save:
+        append_history(history_record(results, args.label), args.history)
+    return 1 if any(result.over_budget for result in results) else 0
+
+
+def _compare(args) -> int:
+    history = load_history(args.history)
+    try:
+        baseline, current = history[args.baseline], history[args.current]
+    except IndexError:
+        print(f"{args.history} does not have the records to compare", file=sys.stderr)
+        return 1
+    regressions = compare(baseline, current, args.threshold)
+    print(
+        f"baseline {baseline['commit']} ({baseline['timestamp']}) -> "
+        f"current {current['commit']} ({current['timestamp']})"
+    )
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.name} {regression.measure}: "
+            f"{regression.baseline:.6g} -> {regression.current:.6g} "
+            f"({regression.change:+.0%})"
+        )
+    if not regressions:
+        print("no regressions")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--history", default=HISTORY_PATH, help="JSON history file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("patterns", nargs="*", help="glob patterns of names")
+    run_parser.add_argument("--label", help="note stored with the results")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument(
+        "--no-save", action="store_true", help="do not append to the history"
+    )
+    run_parser.set_defaults(handler=_run)
+
+    compare_parser = commands.add_parser("compare", help="flag regressions")
+    compare_parser.add_argument("--baseline", type=int, default=-2, help="index")
+    compare_parser.add_argument("--current", type=int, default=-1, help="index")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="fraction a timing may slow down by",
+    )
+    compare_parser.set_defaults(handler=_compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""timings of the hot paths that run locally, without Plaxis"""
+
+import numpy as np
+
+import plxhelper.duncan_selig as duncan_selig
+import plxhelper.linear_elastic_soil as linear_elastic_soil
+import plxhelper.live_load as live_load
+import plxhelper.plate as plate
+import plxhelper.plate_envelope as plate_envelope
+from plxhelper.geo import BoundingBox, Point, Vector
+from plxhelper.plaxis_protocol import floatify, floatify_many
+from plxhelper.spatial_index import SpatialIndex
+from plxhelper.stations import Resampler
+from plxhelper.task_chain import TaskChain
+
+from benchmarks.suite import timed
+
+_VECTOR = Vector(1.5, -2.0, 3.25)
+_OTHER = Vector(0.5, 4.0, -1.0)
+_POINT = Point(10.0, 20.0, 30.0)
+_BOX = BoundingBox(Point(1.0, 1.0, 1.0), Point(2.0, 3.0, 4.0))
+_BOXES = [
+    BoundingBox(Point(-idx, -2.0 * idx, -0.5), Point(idx, 3.0 * idx, 10.0 + idx))
+    for idx in range(100)
+]
+
+
+@timed("geo.Vector.add")
+def vector_add():
+    return _VECTOR + _OTHER
+
+
+@timed("geo.Vector.sub")
+def vector_sub():
+    return _VECTOR - _OTHER
+
+
+@timed("geo.Vector.mul")
+def vector_mul():
+    return _VECTOR * 2.5
+
+
+@timed("geo.Vector.truediv")
+def vector_truediv():
+    return _VECTOR / 2.5
+
+
+@timed("geo.Vector.magnitude")
+def vector_magnitude():
+    return _VECTOR.magnitude
+
+
+@timed("geo.Vector.rotate_z")
+def vector_rotate_z():
+    return _VECTOR.rotate_z(15)
+
+
+@timed("geo.Vector.rotate_z_90")
+def vector_rotate_z_90():
+    return _VECTOR.rotate_z(90)
+
+
+@timed("geo.Vector.add_unbound_tuples")
+def vector_add_unbound_tuples():
+    return Vector.__add__((1.5, -2.0, 3.25), (0.5, 4.0, -1.0))
+
+
+@timed("geo.Point.add_vector")
+def point_add_vector():
+    return _POINT + _OTHER
+
+
+@timed("geo.BoundingBox.points")
+def bounding_box_points():
+    return _BOX.points
+
+
+@timed("geo.BoundingBox.resized")
+def bounding_box_resized():
+    return _BOX.resized(2.0)
+
+
+@timed("geo.BoundingBox.rotated")
+def bounding_box_rotated():
+    return _BOX.rotated(15)
+
+
+@timed("geo.BoundingBox.find_min_max")
+def bounding_box_find_min_max():
+    return BoundingBox.find_min_max(_BOXES)
+
+
+_PLATE_RESULTS = plate_envelope.PlateResults(
+    cases=[f"Phase_{idx}" for idx in range(20)],
+    case=np.repeat(np.arange(20), 5000),
+    xyz=np.tile(
+        np.column_stack([np.arange(5000) % 50, np.arange(5000) // 50, np.zeros(5000)]),
+        (20, 1),
+    ),
+    n=np.sin(np.arange(100_000)) * -1000.0,
+    m=np.cos(np.arange(100_000)) * 100.0,
+)
+_PLATE_SECTION = plate_envelope.plate_section("GRPLinerPipe", "34mm", "Long")
+
+
+@timed("plate_envelope.node_envelope_100000")
+def plate_node_envelope():
+    return plate_envelope.envelope(_PLATE_RESULTS, _PLATE_SECTION)
+
+
+@timed("plate_envelope.station_envelope_100000")
+def plate_station_envelope():
+    station = plate_envelope.stations(_PLATE_RESULTS, (0, 0, 0), (0, 1, 0), 10.0)
+    return plate_envelope.envelope(_PLATE_RESULTS, _PLATE_SECTION, station=station)
+
+
+_RESAMPLER = Resampler(_PLATE_RESULTS.xyz[:5000], _PLATE_RESULTS.xyz[:5000] + 0.25)
+
+
+@timed("stations.resample_5000")
+def stations_resample():
+    return _RESAMPLER.resample(
+        np.column_stack([_PLATE_RESULTS.n, _PLATE_RESULTS.m])[:5000]
+    )
+
+
+_INDEX = SpatialIndex(
+    range(5000),
+    [
+        ((x, y, 0.0), (x + 10.0, y + 10.0, 5.0))
+        for x in range(0, 1000, 20)
+        for y in range(0, 2000, 20)
+    ],
+)
+
+
+@timed("spatial_index.intersecting_box_5000")
+def spatial_index_intersecting_box():
+    return _INDEX.intersecting_box(((95.0, 95.0, 1.0), (305.0, 305.0, 2.0)))
+
+
+@timed("spatial_index.intersecting_plane_5000")
+def spatial_index_intersecting_plane():
+    return _INDEX.intersecting_plane((500.0, 1000.0, 0.0), (1.0, 1.0, 0.0))
+
+
+_COORDINATE_STRINGS = [f"{idx * 0.125:.6f}" for idx in range(1000)]
+_COORDINATES = [idx * 0.125 for idx in range(1000)]
+
+
+@timed("plaxis_protocol.floatify_float")
+def floatify_float():
+    return floatify(1.25)
+
+
+@timed("plaxis_protocol.floatify_str")
+def floatify_str():
+    return floatify("1.25")
+
+
+@timed("plaxis_protocol.floatify_1000_str")
+def floatify_1000_str():
+    return [floatify(value) for value in _COORDINATE_STRINGS]
+
+
+@timed("plaxis_protocol.floatify_many_1000_str")
+def floatify_many_1000_str():
+    return floatify_many(_COORDINATE_STRINGS)
+
+
+@timed("plaxis_protocol.floatify_many_1000_float")
+def floatify_many_1000_float():
+    return floatify_many(_COORDINATES)
+
+
+@timed("duncan_selig.build_hardening_soil_parameters")
+def build_hardening_soil_parameters():
+    return duncan_selig.build_hardening_soil_parameters("SW", 1000, 10.0)
+
+
+_TRUCK_DATAFRAME = live_load.LIVE_LOAD_DATAFRAME.loc[["HL93 Truck Axle"]]
+
+
+@timed("live_load.build_patch_dataframe")
+def build_patch_dataframe():
+    return live_load.build_patch_dataframe((0, 0, 225), _TRUCK_DATAFRAME)
+
+
+@timed("catalogs.load")
+def load_catalogs():
+    duncan_selig.build_Ms_dataframe()
+    duncan_selig.build_duncan_selig_dataframe()
+    linear_elastic_soil.build_linear_elastic_soil_dataframe()
+    live_load.build_live_load_dataframe()
+    plate.build_plate_dataframe()
+
+
+def _chain(length) -> TaskChain:
+    chain = TaskChain()
+    for idx in range(length):
+
+        def step(idx=idx):
+            return idx
+
+        step.__name__ = f"step_{idx}"
+        chain.link(step)
+    return chain
+
+
+_CHAIN = _chain(100)
+
+
+@timed("task_chain.build_100")
+def task_chain_build():
+    return _chain(100)
+
+
+@timed("task_chain.run_100")
+def task_chain_run():
+    return tuple(_CHAIN())
+
+
+@timed("task_chain.prefix_lookup")
+def task_chain_prefix_lookup():
+    return _CHAIN.step_50
@@ -0,0 +1,220 @@
+"""remote-call budgets of the plaxis_helper geometry helpers and the single pipe reline chain
+
+The geometry helpers run against the in-process fake g_i (fake_plaxis) behind a counting proxy, and the reline chain
+runs against the local stand-in scripting server (mock_server), which records every request. A benchmark fails when
+it makes more remote calls than its budget; timings include building the model each operation needs.
+"""
+
+import contextlib
+import functools
+import io
+from unittest import mock
+
+import plxhelper.plaxis_helper as plaxis_helper
+import plxhelper.single_pipe_reline_task as single_pipe_reline
+from plxhelper.fake_plaxis import new_fake_server
+from plxhelper.mock_server import MockPlaxisServer
+from plxhelper.spatial_index import SpatialIndex
+
+from benchmarks.suite import remote
+
+R = 80  # in
+LENGTH = 500  # in
+
+PIPE_SHAPE_INFO_DICT = dict(
+    Offset1=R,
+    Offset2=-R,
+    footing=dict(span=2 * R, rise=R, width=86, height=30, outside=43, key=5),
+    select_backfill=dict(width=2 * R + 72, height=117, h_min=42),
+    segments=[
+        dict(SegmentType="Arc", RelativeStartAngle1=90, Radius=R, CentralAngle=180),
+    ],
+)
+
+
+class _Counting:
+    """Stands in front of the fake s_i or g_i and counts what plxscripting would send to Plaxis.
+
+    Each method call counts as one request (a "command" on g_i); each g_i list or property read counts as a "read".
+    Calls on the objects the methods return are not counted."""
+
+    def __init__(self, target, counts, kind):
+        self._target = target
+        self._counts = counts
+        self._kind = kind
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        if name.startswith("_"):
+            return value
+        if not callable(value):
+            if self._kind == "commands":
+                self._counts["reads"] += 1
+            return value
+
+        @functools.wraps(value)
+        def counted(*args, **kwargs):
+            self._counts[self._kind] += 1
+            return value(*args, **kwargs)
+
+        return counted
+
+
+def _connect_counting_fake(counts):
+    s_i, g_i = new_fake_server()
+    with mock.patch.object(
+        plaxis_helper,
+        "new_server",
+        lambda *args, **kwargs: (
+            _Counting(s_i, counts, "requests"),
+            _Counting(g_i, counts, "commands"),
+        ),
+    ):
+        plaxis_helper.connect_server()
+
+
+def _extruded_pipe_structure():
+    pipe_structures = plaxis_helper.add_pipe_structure(
+        (0, 0, 0), PIPE_SHAPE_INFO_DICT, (1, 0, 0)
+    ).values()
+    return plaxis_helper.extrude(
+        to_extrude=tuple(pipe_structures), length=LENGTH, vector=(0, 1, 0)
+    )
+
+
+def _cutter():
+    return plaxis_helper.g_i.surface(
+        (-2 * R, LENGTH / 2, -2 * R),
+        (2 * R, LENGTH / 2, -2 * R),
+        (2 * R, LENGTH / 2, 2 * R),
+        (-2 * R, LENGTH / 2, 2 * R),
+    )
+
+
+@remote("plaxis_helper.add_pipe_structure", budget=10)
+def add_pipe_structure(counts):
+    _connect_counting_fake(counts)
+    plaxis_helper.add_pipe_structure((0, 0, 0), PIPE_SHAPE_INFO_DICT, (1, 0, 0))
+
+
+@remote("plaxis_helper.extrude", budget=10)
+def extrude(counts):
+    _connect_counting_fake(counts)
+    pipe_structures = plaxis_helper.add_pipe_structure(
+        (0, 0, 0), PIPE_SHAPE_INFO_DICT, (1, 0, 0)
+    ).values()
+    counts.clear()
+    plaxis_helper.extrude(
+        to_extrude=tuple(pipe_structures), length=LENGTH, vector=(0, 1, 0)
+    )
+
+
+@remote("plaxis_helper.cut", budget=61)
+def cut(counts):
+    _connect_counting_fake(counts)
+    to_cut = plaxis_helper.g_i.group(_extruded_pipe_structure())
+    cutter = _cutter()
+    counts.clear()
+    plaxis_helper.cut(to_cut, cutter)
+
+
+@remote("plaxis_helper.skew_cut", budget=68)
+def skew_cut(counts):
+    _connect_counting_fake(counts)
+    to_cut = _extruded_pipe_structure()
+    cutter = _cutter()
+    counts.clear()
+    plaxis_helper.skew_cut(to_cut, cutter, 15, (0, 1))
+
+
+def _cut_row_of_boxes(counts, index):
+    """Cut the first of a row of 20 extruded boxes; the cutter misses the others."""
+    _connect_counting_fake(counts)
+    boxes = [
+        plaxis_helper.add_box(x, 0, 10, 20, 10, (1, 0, 0)) for x in range(0, 1000, 50)
+    ]
+    volumes = plaxis_helper.extrude(boxes, vector=(0, 100, 0), index=index)
+    to_cut = plaxis_helper.g_i.group(volumes)
+    cutter = plaxis_helper.g_i.surface(
+        (-20, 50, -20), (20, 50, -20), (20, 50, 20), (-20, 50, 20)
+    )
+    counts.clear()
+    plaxis_helper.cut(to_cut, cutter, index)
+
+
+@remote("plaxis_helper.cut_row_of_boxes", budget=223)
+def cut_row_of_boxes(counts):
+    _cut_row_of_boxes(counts, None)
+
+
+@remote("plaxis_helper.cut_row_of_boxes_indexed", budget=47)
+def cut_row_of_boxes_indexed(counts):
+    _cut_row_of_boxes(counts, SpatialIndex())
+
+
+# the example project of project_script.ipynb
+_T_IN = 1.339
+_H_AVG_IN = 44 + _T_IN
+_W_AVG_IN = 44 + 3 * _T_IN
+_H_COVER_IN = 15 * 12
+_GRADE_EL = _H_COVER_IN + _H_AVG_IN
+
+
+def _pipe_shape_info_dict(crown_radius, corner_radius, crown_angle, corner_angle):
+    return dict(
+        segments=[
+            dict(
+                SegmentType="Arc",
+                RelativeStartAngle1=180,
+                Radius=crown_radius,
+                CentralAngle=crown_angle,
+            ),
+            dict(SegmentType="Arc", Radius=corner_radius, CentralAngle=corner_angle),
+            dict(SegmentType="SymmetricExtend"),
+            dict(SegmentType="SymmetricClose"),
+        ]
+    )
+
+
+RELINE_CHAIN_INPUTS = dict(
+    xmin=-_W_AVG_IN * 3,
+    ymin=-180,
+    xmax=_W_AVG_IN * 3,
+    ymax=180,
+    grade_el=_GRADE_EL,
+    h_cover_in=_H_COVER_IN,
+    h_parent=61,
+    h_AVG_in=_H_AVG_IN,
+    xyz_live_load=(0, 0, _GRADE_EL),
+    lane_load="AASHTO Lane Load",
+    parent_shape_info_dict=_pipe_shape_info_dict(42.125, 17.625, 84.95, 78.70),
+    reline_shape_info_dict=_pipe_shape_info_dict(
+        33.5 + _T_IN / 2, 8.875 + _T_IN / 2, 85.2, 78.3
+    ),
+    boreholes_dict={
+        (0, 0): dict(
+            layers=[_H_COVER_IN + _H_AVG_IN + _H_COVER_IN / 3],
+            top_el=_GRADE_EL,
+            water_table_el=_GRADE_EL,
+        ),
+    },
+    annular_fill_type=("linear_elastic_soil", "Grout", 40),
+    soil_layer_materials_list=[("duncan_selig_interpolated", "SW", 1000, 10.0)],
+    short_term_reline_type=("plate", "GRPLinerPipe", "34mm", "Short"),
+    long_term_reline_type=("plate", "GRPLinerPipe", "34mm", "Long"),
+)
+
+
+@remote("single_pipe_reline.task_chain", budget=80)
+def reline_chain(counts):
+    """The reline chain up to and including meshing."""
+    with MockPlaxisServer() as server, mock.patch.object(
+        single_pipe_reline,
+        "connect_server",
+        functools.partial(plaxis_helper.connect_server, port=server.port),
+    ):
+        chain = single_pipe_reline.task_chain(**RELINE_CHAIN_INPUTS)
+        server.clear_requests()
+        with contextlib.redirect_stdout(io.StringIO()):
+            tuple(chain.mesh_project())
+        counts.update(server.request_counts())
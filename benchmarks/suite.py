@@ -0,0 +1,182 @@
+"""registry, runner and JSON history of the plxhelper benchmarks"""
+
+import datetime
+import fnmatch
+import json
+import pathlib
+import platform
+import subprocess
+import timeit
+from collections import Counter
+from typing import Callable, NamedTuple
+
+HISTORY_PATH = pathlib.Path(__file__).parent / "history.json"
+# timings slower than the baseline by more than this fraction are regressions
+DEFAULT_THRESHOLD = 0.2
+
+
+class Benchmark(NamedTuple):
+    name: str
+    func: Callable
+    # most remote calls the benchmark may make; None for benchmarks of local code
+    budget: int | None = None
+
+
+class Result(NamedTuple):
+    name: str
+    seconds: float
+    remote_calls: Counter | None = None
+    budget: int | None = None
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and sum(self.remote_calls.values()) > self.budget
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def timed(name):
+    """Register a benchmark timing func(); func takes no arguments."""
+
+    def register(func):
+        BENCHMARKS[name] = Benchmark(name, func)
+        return func
+
+    return register
+
+
+def remote(name, budget):
+    """Register a benchmark running func(counts) against a counting mock.
+
+    func adds the remote calls it makes to the counts Counter (by kind); their total must not exceed budget.
+    """
+
+    def register(func):
+        BENCHMARKS[name] = Benchmark(name, func, budget)
+        return func
+
+    return register
+
+
+def _time_local(func, repeat) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def _time_remote(func, repeat) -> tuple[float, Counter]:
+    best = float("inf")
+    for _ in range(repeat):
+        counts = Counter()
+        start = timeit.default_timer()
+        func(counts)
+        best = min(best, timeit.default_timer() - start)
+    return best, counts
+
+
+def run_benchmark(benchmark: Benchmark, repeat=5) -> Result:
+    if benchmark.budget is None:
+        return Result(benchmark.name, _time_local(benchmark.func, repeat))
+    seconds, counts = _time_remote(benchmark.func, repeat)
+    return Result(benchmark.name, seconds, counts, benchmark.budget)
+
+
+def run_benchmarks(patterns=("*",), repeat=5) -> list[Result]:
+    """Run the registered benchmarks whose names match any of the glob patterns."""
+    import benchmarks.local_paths  # noqa: F401 (registers the benchmarks)
+    import benchmarks.remote_calls  # noqa: F401
+
+    return [
+        run_benchmark(benchmark, repeat)
+        for name, benchmark in BENCHMARKS.items()
+        if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+    ]
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=pathlib.Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def history_record(results: list[Result], label=None) -> dict:
+    return dict(
+        timestamp=datetime.datetime.now().isoformat(timespec="seconds"),
+        commit=_git_commit(),
+        label=label,
+        python=platform.python_version(),
+        machine=platform.machine(),
+        results={
+            result.name: dict(
+                seconds=result.seconds,
+                remote_calls=(
+                    None
+                    if result.remote_calls is None
+                    else sum(result.remote_calls.values())
+                ),
+                budget=result.budget,
+            )
+            for result in results
+        },
+    )
+
+
+def load_history(path=HISTORY_PATH) -> list[dict]:
+    try:
+        with open(path) as history_file:
+            return json.load(history_file)
+    except FileNotFoundError:
+        return []
+
+
+def append_history(record: dict, path=HISTORY_PATH):
+    history = load_history(path)
+    history.append(record)
+    with open(path, "w") as history_file:
+        json.dump(history, history_file, indent=2)
+
+
+class Regression(NamedTuple):
+    name: str
+    measure: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1 if self.baseline else float("inf")
+
+
+def compare(
+    baseline: dict, current: dict, threshold=DEFAULT_THRESHOLD
+) -> list[Regression]:
+    """Benchmarks of the current history record that are slower than the baseline record by more than threshold, or
+    that make more remote calls. Benchmarks missing from either record are skipped."""
+    regressions = []
+    for name, result in current["results"].items():
+        if (baseline_result := baseline["results"].get(name)) is None:
+            continue
+        if result["seconds"] > baseline_result["seconds"] * (1 + threshold):
+            regressions.append(
+                Regression(
+                    name, "seconds", baseline_result["seconds"], result["seconds"]
+                )
+            )
+        if (result["remote_calls"] or 0) > (baseline_result["remote_calls"] or 0):
+            regressions.append(
+                Regression(
+                    name,
+                    "remote_calls",
+                    baseline_result["remote_calls"],
+                    result["remote_calls"],
+                )
+            )
+    return regressions
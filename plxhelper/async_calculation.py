@@ -0,0 +1,172 @@
+"""helpers for calculating a Plaxis project in the background while the caller carries on"""
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, NamedTuple, Sequence
+
+from plxscripting.easy import new_server
+
+import plxhelper.plaxis_helper as plaxis_helper
+from plxhelper.branch_calculation import ServerAddress
+from plxhelper.exceptions import PlaxisHelperError
+from plxhelper.plaxis_helper import PlxRef
+
+# CalculationResult of a successfully calculated phase
+CALCULATION_OK = "OK"
+
+
+class CalculationProgress(NamedTuple):
+    """Phase names by state; failed includes the phases that could not start because an earlier phase failed."""
+
+    calculated: tuple[str, ...] = ()
+    failed: tuple[str, ...] = ()
+    pending: tuple[str, ...] = ()
+
+    @property
+    def fraction(self) -> float:
+        total = len(self.calculated) + len(self.failed) + len(self.pending)
+        return (len(self.calculated) + len(self.failed)) / total if total else 1.0
+
+
+class CalculationCancelled(PlaxisHelperError):
+    def __init__(self, progress: CalculationProgress):
+        super().__init__(f"calculation cancelled with {progress.pending} pending")
+        self.progress = progress
+
+
+def connected_server_address() -> ServerAddress:
+    """The address of the Input server plaxis_helper is connected to."""
+    connection = plaxis_helper.s_i.connection
+    return ServerAddress(connection.host, connection.port, connection._password)
+
+
+class CalculationFuture:
+    """A calculation running in a background thread.
+
+    future is a concurrent.futures.Future whose result is the final CalculationProgress; progress is the latest one.
+    """
+
+    def __init__(self):
+        self.future = Future()
+        self.progress = CalculationProgress()
+        self._cancel_requested = threading.Event()
+
+    def cancel(self) -> bool:
+        """Stop before the next phase starts; the phase being calculated is finished first.
+
+        The future then raises CalculationCancelled. Returns False when the calculation is already over.
+        """
+        self._cancel_requested.set()
+        return self.future.cancel() or not self.future.done()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_requested.is_set()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout=None) -> CalculationProgress:
+        return self.future.result(timeout)
+
+    def add_done_callback(self, fn: Callable):
+        """fn(calculation_future) is called once the calculation is over."""
+        self.future.add_done_callback(lambda _: fn(self))
+
+
+def _guid(obj):
+    return None if obj is None else obj.get_cmd_line_repr()
+
+
+def _calculate(
+    calculation: CalculationFuture,
+    server: ServerAddress,
+    phases,
+    progress: Callable,
+    on_phase: Callable,
+):
+    s, g = new_server(server.address, port=server.port, password=server.password)
+    phase_objs = list(g.Phases)
+    names = [str(name) for name in s.get_objects_property(phase_objs, "Name")]
+    by_guid = dict(zip(map(_guid, phase_objs), names))
+    previous = dict(
+        zip(
+            names,
+            (
+                by_guid.get(_guid(previous_phase))
+                for previous_phase in s.get_objects_property(
+                    phase_objs, "PreviousPhase"
+                )
+            ),
+        )
+    )
+    if phases is None:
+        should_calculate = s.get_objects_property(phase_objs, "ShouldCalculate")
+        phases = [name for name, marked in zip(names, should_calculate) if marked]
+    phase_by_name = dict(zip(names, phase_objs))
+    pending = list(phases)
+    calculated, failed = [], []
+
+    def report():
+        calculation.progress = CalculationProgress(
+            tuple(calculated), tuple(failed), tuple(pending)
+        )
+        if progress is not None:
+            progress(calculation.progress)
+
+    report()
+    while pending:
+        if calculation.cancel_requested:
+            raise CalculationCancelled(calculation.progress)
+        phase = pending.pop(0)
+        if previous[phase] in failed:
+            failed.append(phase)
+            report()
+            continue
+        plaxis_helper.batch_commands(
+            *(
+                (PlxRef(f"{name}.ShouldCalculate"), "set", name == phase)
+                for name in names
+            ),
+            server=s,
+        )
+        g.calculate()
+        result = s.get_object_property(phase_by_name[phase], "CalculationResult")
+        (calculated if str(result) == CALCULATION_OK else failed).append(phase)
+        report()
+        if on_phase is not None and phase in calculated:
+            on_phase(phase)
+    return calculation.progress
+
+
+def start_calculation(
+    phases: Sequence[str] = None,
+    server: ServerAddress = None,
+    progress: Callable = None,
+    on_phase: Callable = None,
+) -> CalculationFuture:
+    """Start calculating the project of an Input server in a background thread and return at once.
+
+    phases are the names of the phases to calculate, parents before children; by default those marked with
+    ShouldCalculate (see PhaseNode.mark_changed_phases). Other phases are left unmarked. The calculation uses its own
+    connection to server (by default the one plaxis_helper is connected to), so the caller may meanwhile connect
+    plaxis_helper to another server and build the next model. The Input server does not answer while it calculates,
+    so phases are calculated one per calculate command: progress(CalculationProgress) is called after each, and
+    on_phase(phase_name) after each phase calculated successfully. Both are called from the background thread.
+    """
+    if server is None:
+        server = connected_server_address()
+    calculation = CalculationFuture()
+
+    def run():
+        if not calculation.future.set_running_or_notify_cancel():
+            return
+        try:
+            calculation.future.set_result(
+                _calculate(calculation, server, phases, progress, on_phase)
+            )
+        except BaseException as err:
+            calculation.future.set_exception(err)
+
+    threading.Thread(target=run, daemon=True).start()
+    return calculation
@@ -0,0 +1,241 @@
+"""helpers for reading large borehole files into the BoreholesDict used by process_boreholes"""
+
+import csv
+import itertools
+import json
+import pathlib
+from typing import Iterator
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from plxhelper.exceptions import BoreholeFileError
+from plxhelper.plaxis_helper import borehole_layer_boundaries
+
+# optional per-borehole values; all other properties of a borehole are ignored
+_OPTIONAL_KEYS = ("top_el", "water_table_el")
+_CSV_COLUMNS = ("id", "x", "y", "thickness")
+# characters read from a GeoJSON file at a time
+CHUNK_SIZE = 1 << 16
+# skipped between GeoJSON values, including the record separators of RFC 8142 sequences
+_GEOJSON_SEPARATORS = "\x1e \t\r\n"
+
+
+def _optional_float(value):
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def _borehole_info_dict(layers, properties) -> dict:
+    borehole_info_dict = dict(layers=[float(th) for th in layers])
+    for key in _OPTIONAL_KEYS:
+        value = _optional_float(properties.get(key))
+        if value is not None:
+            borehole_info_dict[key] = value
+    return borehole_info_dict
+
+
+def iter_csv_boreholes(path) -> Iterator[tuple[tuple[float, float], dict]]:
+    """Read boreholes from a CSV file one at a time.
+
+    The file has one row per layer with the columns id, x, y and thickness, and optionally top_el and
+    water_table_el. Rows of a borehole must be consecutive, in order from the top down; x, y, top_el and
+    water_table_el are read from its first row."""
+    with open(path, newline="") as csv_file:
+        reader = csv.DictReader(csv_file)
+        missing = [key for key in _CSV_COLUMNS if key not in (reader.fieldnames or ())]
+        if missing:
+            raise BoreholeFileError(f"{path} has no {', '.join(missing)} column")
+        for borehole_id, rows in itertools.groupby(reader, key=lambda row: row["id"]):
+            first_row, *other_rows = rows
+            try:
+                coords = float(first_row["x"]), float(first_row["y"])
+                borehole_info_dict = _borehole_info_dict(
+                    (row["thickness"] for row in (first_row, *other_rows)), first_row
+                )
+            except (KeyError, ValueError) as err:
+                raise BoreholeFileError(
+                    f"borehole {borehole_id!r} in {path}: {err}"
+                ) from err
+            yield coords, borehole_info_dict
+
+
+class _JsonStream:
+    """JSON values decoded one at a time from a text file read in chunks."""
+
+    def __init__(self, text_file):
+        self._file = text_file
+        self._buffer = ""
+        self._pos = 0
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        chunk = self._file.read(CHUNK_SIZE)
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return bool(chunk)
+
+    def peek(self) -> str:
+        """The next character that is not a separator, or "" at the end of the file."""
+        while True:
+            while (
+                self._pos < len(self._buffer)
+                and self._buffer[self._pos] in _GEOJSON_SEPARATORS
+            ):
+                self._pos += 1
+            if self._pos < len(self._buffer) or not self._fill():
+                return self._buffer[self._pos : self._pos + 1]
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", self._buffer, self._pos)
+        self._pos += 1
+
+    def buffered_value(self):
+        """The next value if it has been read whole already, else None."""
+        self.peek()
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            return None
+        if end == len(self._buffer):
+            # a number may go on in the next chunk
+            return None
+        self._pos = end
+        return value
+
+    def value(self):
+        while (value := self.buffered_value()) is None:
+            if not self._fill():
+                value, self._pos = self._decoder.raw_decode(self._buffer, self._pos)
+                return value
+        return value
+
+
+def _geojson_features(geojson_file):
+    """Features of FeatureCollections and of Feature sequences (one per line, RFC 8142 sequences too).
+
+    Features are decoded one at a time, including those in the features array of a FeatureCollection, so only one
+    feature is held in memory at a time."""
+    stream = _JsonStream(geojson_file)
+    while stream.peek():
+        # most objects are single features, decoded at once
+        obj = stream.buffered_value() if stream.peek() == "{" else None
+        if obj is not None:
+            if obj.get("type") == "FeatureCollection":
+                yield from obj["features"]
+            else:
+                yield obj
+            continue
+        # a FeatureCollection too long to have been read whole: decoded one member and one feature at a time
+        stream.expect("{")
+        members = {}
+        collection = False
+        while stream.peek() != "}":
+            if members or collection:
+                stream.expect(",")
+            key = stream.value()
+            stream.expect(":")
+            if key != "features" or stream.peek() != "[":
+                members[key] = stream.value()
+                continue
+            collection = True
+            stream.expect("[")
+            first = True
+            while stream.peek() != "]":
+                if not first:
+                    stream.expect(",")
+                first = False
+                yield stream.value()
+            stream.expect("]")
+        stream.expect("}")
+        if not collection:
+            yield members
+
+
+def iter_geojson_boreholes(path) -> Iterator[tuple[tuple[float, float], dict]]:
+    """Read boreholes from GeoJSON Point features one at a time.
+
+    Each feature has a layers property (list of layer thicknesses from the top down), and optionally top_el and
+    water_table_el properties. FeatureCollections are streamed too."""
+    with open(path) as geojson_file:
+        features = _geojson_features(geojson_file)
+        while True:
+            try:
+                feature = next(features)
+            except StopIteration:
+                return
+            except json.JSONDecodeError as err:
+                raise BoreholeFileError(f"{path}: {err}") from err
+            try:
+                x, y, *_ = feature["geometry"]["coordinates"]
+                properties = feature["properties"]
+                yield (float(x), float(y)), _borehole_info_dict(
+                    properties["layers"], properties
+                )
+            except (KeyError, TypeError, ValueError) as err:
+                raise BoreholeFileError(
+                    f"feature {feature.get('id')!r} in {path}: {err}"
+                ) from err
+
+
+def iter_boreholes(path) -> Iterator[tuple[tuple[float, float], dict]]:
+    """Read boreholes from a CSV or GeoJSON file one at a time, based on the file extension."""
+    suffix = pathlib.Path(path).suffix.lower()
+    if suffix == ".csv":
+        return iter_csv_boreholes(path)
+    if suffix in (".geojson", ".geojsonl", ".json"):
+        return iter_geojson_boreholes(path)
+    raise BoreholeFileError(f"unknown borehole file type: {path}")
+
+
+def within_extents(boreholes, xmin, ymin, xmax, ymax):
+    """Boreholes with coordinates inside the model extents."""
+    return (
+        (coords, borehole_info_dict)
+        for coords, borehole_info_dict in boreholes
+        if xmin <= coords[0] <= xmax and ymin <= coords[1] <= ymax
+    )
+
+
+def thin_boreholes(boreholes_dict, radius: float, tolerance: float) -> dict:
+    """Pick a representative subset of the boreholes.
+
+    Boreholes are visited in order; each one not yet represented is kept and represents every other borehole within
+    radius of it whose layer elevations are all within tolerance of its own. Every dropped borehole therefore has a
+    kept borehole nearby that describes its layers to within tolerance."""
+    coords = list(boreholes_dict)
+    if not coords:
+        return {}
+    boundaries = borehole_layer_boundaries(boreholes_dict)
+    tree = cKDTree(np.array(coords, dtype=float))
+    represented = np.zeros(len(coords), dtype=bool)
+    kept = []
+    for idx in range(len(coords)):
+        if represented[idx]:
+            continue
+        kept.append(idx)
+        neighbors = np.array(tree.query_ball_point(coords[idx], radius), dtype=int)
+        errors = np.abs(boundaries[neighbors] - boundaries[idx]).max(axis=1)
+        represented[neighbors[errors <= tolerance]] = True
+    return {coords[idx]: boreholes_dict[coords[idx]] for idx in kept}
+
+
+def read_boreholes(
+    path,
+    xmin,
+    ymin,
+    xmax,
+    ymax,
+    radius: float = None,
+    tolerance: float = 0.0,
+) -> dict:
+    """Build a BoreholesDict from a borehole file, keeping only the boreholes within the model extents.
+
+    The file is streamed, so only boreholes within the extents are held in memory. If radius is given, the
+    boreholes are thinned to a representative subset (see thin_boreholes)."""
+    boreholes_dict = dict(within_extents(iter_boreholes(path), xmin, ymin, xmax, ymax))
+    if radius is not None:
+        boreholes_dict = thin_boreholes(boreholes_dict, radius, tolerance)
+    return boreholes_dict
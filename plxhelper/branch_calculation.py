@@ -0,0 +1,101 @@
+"""helpers for calculating independent branches of a phase tree concurrently on separate Plaxis instances"""
+
+import pathlib
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Callable, Sequence
+
+from plxscripting.easy import new_server
+import plxhelper.plaxis_helper as plaxis_helper
+
+
+class ServerAddress(NamedTuple):
+    address: str
+    port: int
+    password: str = "python"
+
+
+def calculation_result(s, g, phase_name):
+    """Default branch result: the Plaxis calculation result of the phase."""
+    return str(getattr(g, phase_name).CalculationResult)
+
+
+def branch_project_path(project_path, branch) -> pathlib.Path:
+    project_path = pathlib.Path(project_path)
+    return project_path.with_stem(f"{project_path.stem}_{branch.name}")
+
+
+def _calculate_branch(
+    branch, root, project_path, servers: queue.Queue, extract: Callable
+) -> dict:
+    server_address = servers.get()
+    try:
+        s, g = new_server(
+            server_address.address,
+            port=server_address.port,
+            password=server_address.password,
+        )
+        s.open(str(branch_project_path(project_path, branch)))
+        branch_nodes = list(branch.traverse())
+        root.mark_phases(branch_nodes, server=s)
+        g.calculate()
+        g.save()
+        return {p.name: extract(s, g, p.phase_name) for p in branch_nodes}
+    finally:
+        servers.put(server_address)
+
+
+def calculate_branches(
+    root,
+    project_path,
+    servers: Sequence[ServerAddress],
+    extract: Callable = calculation_result,
+    phases: Sequence = None,
+) -> dict:
+    """Calculate a processed phase tree with its independent branches running concurrently.
+
+    The shared trunk of the tree is calculated once in the connected project, which is then saved and forked to one
+    project file per branch. Each branch is opened and calculated on one of the servers. Branches wait for a free
+    server when there are more branches than servers.
+
+    extract(s, g, phase_name) pulls the results of a calculated phase. Results of every phase are merged into one dict
+    keyed by phase function name.
+
+    phases limits the calculation to those phase nodes (e.g. the ones returned by mark_changed_phases); only their
+    results are extracted. A branch project is forked from the trunk project without the results of its own phases,
+    so a branch with any phase to calculate is calculated whole, and a branch with none is left as it was.
+    """
+    trunk = root.trunk()
+    if phases is None:
+        phases = list(root.traverse())
+    trunk_phases = [p for p in trunk if p in phases]
+    branches = [
+        branch
+        for branch in trunk[-1].children
+        if any(p in phases for p in branch.traverse())
+    ]
+    root.mark_phases(trunk_phases)
+    if trunk_phases:
+        plaxis_helper.g_i.calculate()
+    results = {
+        p.name: extract(plaxis_helper.s_i, plaxis_helper.g_i, p.phase_name)
+        for p in trunk_phases
+    }
+    for branch in branches:
+        plaxis_helper.g_i.save(str(branch_project_path(project_path, branch)))
+    # saved last so the connected project is the trunk project again
+    plaxis_helper.g_i.save(str(project_path))
+
+    available_servers = queue.Queue()
+    for server_address in servers:
+        available_servers.put(server_address)
+    with ThreadPoolExecutor(max_workers=len(servers)) as executor:
+        branch_results = executor.map(
+            lambda branch: _calculate_branch(
+                branch, root, project_path, available_servers, extract
+            ),
+            branches,
+        )
+        for branch_result in branch_results:
+            results.update(branch_result)
+    return results
@@ -0,0 +1,126 @@
+"""helpers for sharing the cores of a machine among Plaxis calculations running at the same time"""
+
+import heapq
+import os
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from typing import Callable, Sequence
+
+from plxhelper.branch_calculation import ServerAddress
+
+# share of a calculation's time that shrinks with the number of cores it uses (Amdahl's law)
+PARALLEL_FRACTION = 0.8
+
+
+def machine_cores() -> int:
+    return os.cpu_count() or 1
+
+
+def calculation_time(size, cores, parallel_fraction=PARALLEL_FRACTION) -> float:
+    """Predicted time of a calculation of a model of a size (its time on one core) on a number of cores."""
+    return size * (1 - parallel_fraction + parallel_fraction / cores)
+
+
+def allocate_cores(
+    sizes: Sequence[float],
+    total_cores,
+    parallel_fraction=PARALLEL_FRACTION,
+    max_cores=None,
+) -> list[int]:
+    """Cores for each of several calculations of models of sizes that run at the same time on total_cores.
+
+    Each calculation gets one core, then the rest are handed out one at a time to the calculation whose predicted time
+    they shorten most. A calculation gets at most max_cores; cores nobody can use are left unassigned.
+    """
+    if len(sizes) > total_cores:
+        raise ValueError(f"{len(sizes)} calculations cannot share {total_cores} cores")
+    cores = [1] * len(sizes)
+
+    def saving(idx):
+        return calculation_time(sizes[idx], cores[idx], parallel_fraction) - (
+            calculation_time(sizes[idx], cores[idx] + 1, parallel_fraction)
+        )
+
+    heap = [(-saving(idx), idx) for idx in range(len(sizes))]
+    heapq.heapify(heap)
+    spare = total_cores - len(sizes)
+    while spare and heap:
+        _, idx = heapq.heappop(heap)
+        if max_cores is not None and cores[idx] >= max_cores:
+            continue
+        cores[idx] += 1
+        spare -= 1
+        heapq.heappush(heap, (-saving(idx), idx))
+    return cores
+
+
+class CoreScheduler:
+    """Runs calculations on a pool of Plaxis servers without using more than total_cores cores at once.
+
+    total_cores defaults to the cores of the machine; max_cores is the most one calculation may use.
+    """
+
+    def __init__(
+        self, total_cores=None, parallel_fraction=PARALLEL_FRACTION, max_cores=None
+    ):
+        self.total_cores = machine_cores() if total_cores is None else total_cores
+        self.parallel_fraction = parallel_fraction
+        self.max_cores = max_cores
+
+    def allocate(self, sizes: Sequence[float], total_cores=None) -> list[int]:
+        return allocate_cores(
+            sizes,
+            self.total_cores if total_cores is None else total_cores,
+            self.parallel_fraction,
+            self.max_cores,
+        )
+
+    def map(
+        self,
+        run: Callable,
+        jobs: Sequence,
+        sizes: Sequence[float],
+        servers: Sequence[ServerAddress],
+        executor: Executor = None,
+        on_release: Callable = None,
+    ) -> list:
+        """run(job, cores, server) for every job, returning the results in job order.
+
+        Jobs start largest size first, each as soon as a server and a core are free. The free cores are split among the
+        jobs starting together with allocate, and returned when a job finishes. run is called in a thread per server
+        unless another executor (e.g. a ProcessPoolExecutor with a worker per server) is given. on_release(server) is
+        called as each job finishes, before its server is used again (see instance_manager.InstanceManager.release).
+        """
+        jobs, sizes = list(jobs), list(sizes)
+        waiting = sorted(range(len(jobs)), key=lambda idx: -sizes[idx])
+        free_servers = list(servers)
+        free_cores = self.total_cores
+        # future: (job index, cores, server)
+        running = {}
+        results = [None] * len(jobs)
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=len(free_servers))
+        try:
+            while waiting or running:
+                if count := min(len(waiting), len(free_servers), free_cores):
+                    starting, waiting = waiting[:count], waiting[count:]
+                    allocation = self.allocate(
+                        [sizes[idx] for idx in starting], free_cores
+                    )
+                    for idx, cores in zip(starting, allocation):
+                        server = free_servers.pop()
+                        free_cores -= cores
+                        future = executor.submit(run, jobs[idx], cores, server)
+                        running[future] = idx, cores, server
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx, cores, server = running.pop(future)
+                    if on_release is not None:
+                        on_release(server)
+                    free_cores += cores
+                    free_servers.append(server)
+                    results[idx] = future.result()
+        finally:
+            if own_executor:
+                executor.shutdown()
+        return results
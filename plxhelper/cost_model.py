@@ -0,0 +1,136 @@
+"""helpers for predicting the element count and link durations of a run from the timings of earlier runs"""
+
+import json
+import math
+import pathlib
+import threading
+from typing import Mapping, NamedTuple, Sequence
+
+import numpy as np
+
+# durations are fitted in log space, so shorter ones are counted as this long (seconds)
+MIN_DURATION = 1e-6
+
+
+class TimingHistory:
+    """Timings of earlier runs, kept as one JSON line per run so several workers can append to the same file.
+
+    Each run is recorded with the features of its model, the duration of each link in seconds and, when it is known,
+    the element count of its mesh.
+    """
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self._lock = threading.Lock()
+
+    def record(self, features: Mapping, durations: Mapping, elements=None):
+        line = json.dumps(
+            dict(features=dict(features), durations=dict(durations), elements=elements)
+        )
+        with self._lock, open(self.path, "a") as history_file:
+            # a single write, so lines appended by other processes are not interleaved
+            history_file.write(f"{line}\n")
+
+    def records(self) -> list[dict]:
+        try:
+            with open(self.path) as history_file:
+                return [json.loads(line) for line in history_file if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def __len__(self) -> int:
+        return len(self.records())
+
+    def __getstate__(self):
+        return dict(path=self.path)
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+
+class Prediction(NamedTuple):
+    # link name: seconds
+    durations: dict
+    elements: float | None = None
+
+    @property
+    def total(self) -> float:
+        return sum(self.durations.values())
+
+
+class _PowerLaw(NamedTuple):
+    # mean log features of the runs fitted to
+    means: np.ndarray
+    intercept: float
+    coefficients: np.ndarray
+
+
+class CostModel:
+    """Power laws fitted to a timing history, one per link duration and one for the element count.
+
+    log(target) is fitted as a linear function of the logs of the (positive) features by least squares, so a target
+    growing with, say, the area and the inverse cube of the mesh coarseness is captured without being told. Features
+    that never varied in the history get no weight.
+    """
+
+    def __init__(self, feature_names: Sequence[str]):
+        self.feature_names = tuple(feature_names)
+        self._durations = {}
+        self._elements = None
+
+    @classmethod
+    def from_history(cls, history: TimingHistory | Sequence[dict]):
+        records = history.records() if isinstance(history, TimingHistory) else history
+        if not records:
+            raise ValueError("a cost model needs at least one recorded run")
+        cost_model = cls(sorted(records[0]["features"]))
+        cost_model.fit(records)
+        return cost_model
+
+    def _log_features(self, features: Mapping) -> np.ndarray:
+        return np.log([float(features[name]) for name in self.feature_names])
+
+    @staticmethod
+    def _fit(log_features, values) -> _PowerLaw:
+        # fitted about the mean, so the minimum norm solution gives the features that never varied no weight
+        means = log_features.mean(axis=0)
+        design = np.column_stack([np.ones(len(log_features)), log_features - means])
+        solution, *_ = np.linalg.lstsq(design, np.log(values), rcond=None)
+        return _PowerLaw(means, solution[0], solution[1:])
+
+    def fit(self, records: Sequence[dict]):
+        log_features = np.array([self._log_features(r["features"]) for r in records])
+        links = dict.fromkeys(link for r in records for link in r["durations"])
+        self._durations = {}
+        for link in links:
+            rows = [idx for idx, r in enumerate(records) if link in r["durations"]]
+            self._durations[link] = self._fit(
+                log_features[rows],
+                [max(records[idx]["durations"][link], MIN_DURATION) for idx in rows],
+            )
+        rows = [idx for idx, r in enumerate(records) if r.get("elements")]
+        self._elements = (
+            self._fit(log_features[rows], [records[idx]["elements"] for idx in rows])
+            if rows
+            else None
+        )
+        return self
+
+    @staticmethod
+    def _predict(power_law: _PowerLaw, log_features) -> float:
+        centered = log_features - power_law.means
+        return math.exp(power_law.intercept + centered @ power_law.coefficients)
+
+    def predict(self, features: Mapping) -> Prediction:
+        log_features = self._log_features(features)
+        return Prediction(
+            {
+                link: self._predict(power_law, log_features)
+                for link, power_law in self._durations.items()
+            },
+            (
+                None
+                if self._elements is None
+                else self._predict(self._elements, log_features)
+            ),
+        )
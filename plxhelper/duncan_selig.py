@@ -97,17 +97,16 @@ def build_hardening_soil_parameters(duncan_selig_soil_type, Ms_psi, σ_z_psi):
         duncan_selig_soil_type + f"{ρ_rel:.1f}"
     )  # update model name
     # return duncan_selig_soil_type_dataframe.loc[ρ_rel, duncan_selig_soil_type_dataframe.select_dtypes(np.number).columns]
-    interpolation_dataframe.loc[
-        ρ_rel, interpolation_dataframe.select_dtypes(np.number).columns
-    ] = np.nan  # clear numerical values
-
-    interpolated_row = (
-        interpolation_dataframe.sort_index()  # sort
-        .interpolate(
-            method="piecewise_polynomial", order=1, axis=0
-        )  # interpolate numerical values
-        .loc[ρ_rel]  # grab interpolated row
-    )
+    numerical_columns = interpolation_dataframe.select_dtypes(np.number).columns
+    # clear numerical values
+    interpolation_dataframe.loc[ρ_rel, numerical_columns] = np.nan
+
+    interpolation_dataframe = interpolation_dataframe.sort_index()  # sort
+    # interpolate numerical values (text columns cannot be interpolated by newer pandas)
+    interpolation_dataframe[numerical_columns] = interpolation_dataframe[
+        numerical_columns
+    ].interpolate(method="piecewise_polynomial", order=1, axis=0)
+    interpolated_row = interpolation_dataframe.loc[ρ_rel]  # grab interpolated row
     return interpolated_row
 
 
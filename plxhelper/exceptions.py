@@ -3,3 +3,7 @@ from plxscripting.plx_scripting_exceptions import PlxScriptingLocalError
 
 class PlaxisHelperError(PlxScriptingLocalError):
     pass
+
+
+class BoreholeFileError(PlaxisHelperError):
+    pass
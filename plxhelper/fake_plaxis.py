@@ -0,0 +1,652 @@
+"""an in-process stand-in for the Plaxis global object g_i with real (convex) geometry
+
+Geometric objects are unions of convex pieces; each piece is the convex hull of its vertices. Polygons are the convex
+hull of their outline, extruded curves are a strip of planar quads and extruded surfaces are prisms. Intersecting
+with a planar object splits every piece by its plane. This is enough for the geometry helpers (add_box,
+add_pipe_structure, extrude, cut, skew_cut, BoundingBox.from_plx, ...) to run in milliseconds without Plaxis.
+
+Use it in place of plxscripting.easy.new_server:
+
+    s_i, g_i = new_fake_server()
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from itertools import count
+from typing import NamedTuple
+
+import numpy as np
+from plxscripting.server import InputProcessor
+from scipy.spatial import ConvexHull, QhullError
+
+from plxhelper.stations import outline_points
+
+# arcs are drawn with one straight segment per ARC_SEGMENT_DEG degrees
+ARC_SEGMENT_DEG = 5.0
+# coordinates closer than this are considered equal
+TOLERANCE = 1e-6
+
+NO_EQUIVALENT_MESSAGE = "No equivalent geometric objects found"
+# quoted strings, parentheses and bare words of a Plaxis command line
+COMMAND_TOKEN = re.compile(r'"[^"]*"|\'[^\']*\'|[()]|[^\s()]+')
+
+
+def _affine_basis(points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Centroid and orthonormal basis (rows) of the affine hull of the points."""
+    centroid = points.mean(axis=0)
+    if len(points) < 2:
+        return centroid, np.zeros((0, 3))
+    _, singular_values, basis = np.linalg.svd(points - centroid)
+    scale = max(singular_values[0], 1.0)
+    return centroid, basis[singular_values > TOLERANCE * scale]
+
+
+def _reduce(points) -> np.ndarray:
+    """The vertices of the convex hull of the points."""
+    points = np.unique(np.round(np.asarray(points, dtype=float), 9), axis=0)
+    centroid, basis = _affine_basis(points)
+    if len(basis) == 0:
+        return points[:1]
+    projected = (points - centroid) @ basis.T
+    if len(basis) == 1:
+        return points[[projected[:, 0].argmin(), projected[:, 0].argmax()]]
+    try:
+        return points[ConvexHull(projected).vertices]
+    except QhullError:
+        return points
+
+
+def _rank(points) -> int:
+    return len(_affine_basis(points)[1])
+
+
+def _measure_and_centroid(points) -> tuple[float, np.ndarray]:
+    """Length, area or volume of a convex piece and its centroid."""
+    centroid, basis = _affine_basis(points)
+    if len(basis) == 0:
+        return 0.0, centroid
+    projected = (points - centroid) @ basis.T
+    if len(basis) == 1:
+        return float(np.ptp(projected[:, 0])), centroid
+    hull = ConvexHull(projected)
+    # simplices of the hull coned from the centroid cover the piece
+    simplices = projected[hull.simplices]
+    if len(basis) == 2:
+        edge1, edge2 = simplices[:, 0], simplices[:, 1]
+        sizes = np.abs(edge1[:, 0] * edge2[:, 1] - edge1[:, 1] * edge2[:, 0]) / 2
+    else:
+        sizes = np.abs(np.linalg.det(simplices)) / 6
+    centroids = simplices.sum(axis=1) / (len(basis) + 1)
+    measure = sizes.sum()
+    return float(measure), centroid + (sizes @ centroids / measure) @ basis
+
+
+def _split(points, normal, offset) -> tuple[np.ndarray | None, np.ndarray | None]:
+    """The parts of a convex piece below and above the plane normal . x = offset."""
+    side = points @ normal - offset
+    below, above = side < -TOLERANCE, side > TOLERANCE
+    if not above.any():
+        return points, None
+    if not below.any():
+        return None, points
+    # every edge between a vertex below and one above crosses the plane; interior crossings fall inside the hull
+    t = side[below][:, None] / (side[below][:, None] - side[above][None, :])
+    crossings = points[below][:, None] + t[..., None] * (
+        points[above][None, :] - points[below][:, None]
+    )
+    crossings = crossings.reshape(-1, 3)
+    return (
+        _reduce(np.vstack([points[~above], crossings])),
+        _reduce(np.vstack([points[~below], crossings])),
+    )
+
+
+def _components(pieces) -> list[list[np.ndarray]]:
+    """Group pieces into connected objects; pieces are connected when they share a vertex."""
+    keys = [{tuple(p) for p in np.round(piece, 6)} for piece in pieces]
+    groups = []
+    for idx in range(len(pieces)):
+        touching = [
+            group for group in groups if any(keys[idx] & keys[j] for j in group)
+        ]
+        merged = [idx]
+        for group in touching:
+            groups.remove(group)
+            merged.extend(group)
+        groups.append(merged)
+    return [[pieces[j] for j in sorted(group)] for group in groups]
+
+
+class _Coordinates(NamedTuple):
+    x: float
+    y: float
+    z: float
+
+
+class _Box(NamedTuple):
+    xMin: float
+    yMin: float
+    zMin: float
+    xMax: float
+    yMax: float
+    zMax: float
+
+
+class FakeProperties:
+    """A bag of intrinsic properties, set one by one or with setproperties()."""
+
+    def __init__(self, **properties):
+        self.__dict__.update(properties)
+
+    def setproperties(self, *args):
+        if all(isinstance(arg, tuple) for arg in args):
+            pairs = args
+        else:
+            pairs = zip(args[::2], args[1::2])
+        for name, value in pairs:
+            setattr(self, name, value)
+        return "OK"
+
+
+class FakeObject(FakeProperties):
+    def __init__(self, g_i, type_name, **properties):
+        super().__init__(
+            Name=g_i._new_name(type_name), TypeName=type_name, **properties
+        )
+
+    def __repr__(self):
+        return f"<{self.TypeName} {self.Name}>"
+
+    def get_cmd_line_repr(self):
+        return self.Name
+
+
+class FakeGeometry(FakeObject):
+    """A geometric object made of convex pieces."""
+
+    def __init__(self, g_i, type_name, pieces):
+        super().__init__(g_i, type_name)
+        self._pieces = [np.asarray(piece, dtype=float) for piece in pieces]
+
+    @property
+    def pieces(self) -> list[np.ndarray]:
+        return self._pieces
+
+    def _points(self) -> np.ndarray:
+        return np.vstack(self.pieces)
+
+    @property
+    def BoundingBox(self) -> _Box:
+        points = self._points()
+        return _Box(*points.min(axis=0), *points.max(axis=0))
+
+    @property
+    def CenterOfGravity(self) -> _Coordinates:
+        measured = [_measure_and_centroid(piece) for piece in self.pieces]
+        rank = max(_rank(piece) for piece in self.pieces)
+        measured = [
+            (measure, centroid)
+            for (measure, centroid), piece in zip(measured, self.pieces)
+            if _rank(piece) == rank
+        ]
+        total = sum(measure for measure, _ in measured)
+        if total == 0:
+            return _Coordinates(*self._points().mean(axis=0))
+        return _Coordinates(
+            *sum(measure * centroid for measure, centroid in measured) / total
+        )
+
+    def plane(self) -> tuple[np.ndarray, float] | None:
+        """Unit normal and offset of the plane of a planar object."""
+        points = self._points()
+        centroid, basis = _affine_basis(points)
+        if len(basis) != 2:
+            return None
+        normal = np.cross(*basis)
+        return normal, float(normal @ centroid)
+
+    def transform(self, matrix, origin, translation):
+        self._pieces = [
+            (piece - origin) @ matrix.T + origin + translation for piece in self.pieces
+        ]
+
+
+class FakePoint(FakeGeometry):
+    def __init__(self, g_i, xyz):
+        super().__init__(g_i, "Point", [np.array([xyz], dtype=float)])
+
+    @property
+    def x(self):
+        return self.pieces[0][0, 0]
+
+    @property
+    def y(self):
+        return self.pieces[0][0, 1]
+
+    @property
+    def z(self):
+        return self.pieces[0][0, 2]
+
+
+class FakeSegment(FakeProperties):
+    def __init__(self, segment_type="Line"):
+        super().__init__(
+            SegmentType=segment_type,
+            LineProperties=FakeProperties(RelativeStartAngle1=0, Length=1),
+            ArcProperties=FakeProperties(
+                RelativeStartAngle1=0, Radius=1, CentralAngle=90
+            ),
+        )
+
+
+class FakePolycurve(FakeGeometry):
+    """A curve drawn in the plane of axis1 and axis2 starting from (Offset1, Offset2), one segment at a time.
+
+    Each segment starts turned RelativeStartAngle1 degrees (counterclockwise) from where the previous one ended; the
+    first starts along axis1. Arcs with a positive CentralAngle turn counterclockwise.
+    """
+
+    def __init__(self, g_i, xyz, axis1, axis2):
+        super().__init__(g_i, "Polycurve", [])
+        self._origin = np.array(xyz, dtype=float)
+        self._axes = np.array([axis1, axis2], dtype=float)
+        self._axes /= np.linalg.norm(self._axes, axis=1)[:, None]
+        self.Offset1 = 0
+        self.Offset2 = 0
+        self.segments = []
+
+    def add(self):
+        self.segments.append(segment := FakeSegment())
+        return segment
+
+    def extendtosymmetryaxis(self):
+        self.segments.append(FakeSegment("SymmetricExtend"))
+        return "OK"
+
+    def symmetricclose(self):
+        self.segments.append(FakeSegment("SymmetricClose"))
+        return "OK"
+
+    def local_points(self) -> np.ndarray:
+        segments = []
+        for segment in self.segments:
+            properties = dict(
+                Line=segment.LineProperties, Arc=segment.ArcProperties
+            ).get(segment.SegmentType)
+            segments.append(
+                dict(SegmentType=segment.SegmentType, **vars(properties or {}))
+            )
+        return outline_points(
+            segments, (float(self.Offset1), float(self.Offset2)), ARC_SEGMENT_DEG
+        )
+
+    @property
+    def pieces(self) -> list[np.ndarray]:
+        points = self._origin + self.local_points() @ self._axes
+        return [points[idx : idx + 2] for idx in range(len(points) - 1)] or [points]
+
+    def transform(self, matrix, origin, translation):
+        self._origin = (self._origin - origin) @ matrix.T + origin + translation
+        self._axes = self._axes @ matrix.T
+
+
+class FakeGroup(FakeObject, list):
+    def __init__(self, g_i, members):
+        list.__init__(self, members)
+        FakeObject.__init__(self, g_i, "Group")
+
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+
+def _flatten(args):
+    for arg in args:
+        if isinstance(arg, (list, tuple)) and not isinstance(arg, FakeGeometry):
+            yield from _flatten(arg)
+        else:
+            yield arg
+
+
+def _groups(args):
+    for arg in args:
+        if isinstance(arg, FakeGroup):
+            yield arg
+        elif isinstance(arg, (list, tuple)):
+            yield from _groups(arg)
+
+
+def _rotation_matrix(rx, ry, rz) -> np.ndarray:
+    cx, sx = math.cos(math.radians(rx)), math.sin(math.radians(rx))
+    cy, sy = math.cos(math.radians(ry)), math.sin(math.radians(ry))
+    cz, sz = math.cos(math.radians(rz)), math.sin(math.radians(rz))
+    about_x = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    about_y = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
+    about_z = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    return about_z @ about_y @ about_x
+
+
+class FakeGlobalObject:
+    """The fake g_i; object lists (Points, Surfaces, Geometry, ...) hold the objects that have not been deleted."""
+
+    def __init__(self):
+        self._counters = {}
+        self._objects = []
+
+    def _new_name(self, type_name):
+        self._counters.setdefault(type_name, count(1))
+        return f"{type_name}_{next(self._counters[type_name])}"
+
+    def _add(self, obj):
+        self._objects.append(obj)
+        return obj
+
+    def _of_type(self, *types):
+        return [obj for obj in self._objects if type(obj) in types]
+
+    @property
+    def Points(self):
+        return self._of_type(FakePoint)
+
+    @property
+    def Lines(self):
+        return [
+            obj for obj in self._objects if getattr(obj, "TypeName", None) == "Line"
+        ]
+
+    @property
+    def Polycurves(self):
+        return self._of_type(FakePolycurve)
+
+    @property
+    def Surfaces(self):
+        return [
+            obj
+            for obj in self._objects
+            if getattr(obj, "TypeName", None) in ("Polygon", "Surface")
+        ]
+
+    @property
+    def Volumes(self):
+        return [
+            obj for obj in self._objects if getattr(obj, "TypeName", None) == "Volume"
+        ]
+
+    @property
+    def Geometry(self):
+        return [obj for obj in self._objects if isinstance(obj, FakeGeometry)]
+
+    @property
+    def Groups(self):
+        return self._of_type(FakeGroup)
+
+    @property
+    def Soils(self):
+        return [
+            obj for obj in self._objects if getattr(obj, "TypeName", None) == "Soil"
+        ]
+
+    def _geometry(self, type_name, pieces):
+        return self._add(FakeGeometry(self, type_name, pieces))
+
+    def point(self, x, y, z):
+        return self._add(FakePoint(self, (x, y, z)))
+
+    def line(self, start, end):
+        points = [_as_xyz(start), _as_xyz(end)]
+        return self._geometry("Line", [np.array(points)])
+
+    def polycurve(self, xyz, axis1, axis2, *segment_args):
+        """Segments may be given as ("line", relative start angle, length) or
+        ("arc", relative start angle, radius, central angle) arguments; the curve is then returned in a list.
+        """
+        curve = self._add(FakePolycurve(self, xyz, axis1, axis2))
+        args = list(segment_args)
+        while args:
+            match args:
+                case ["line", angle, length, *args]:
+                    curve.add().LineProperties.setproperties(
+                        "RelativeStartAngle1", angle, "Length", length
+                    )
+                case ["arc", angle, radius, central_angle, *args]:
+                    segment = curve.add()
+                    segment.SegmentType = "Arc"
+                    segment.ArcProperties.setproperties(
+                        "RelativeStartAngle1",
+                        angle,
+                        "Radius",
+                        radius,
+                        "CentralAngle",
+                        central_angle,
+                    )
+                case _:
+                    raise ValueError(f"unsupported polycurve segment arguments: {args}")
+        return [curve] if segment_args else curve
+
+    def surface(self, *args):
+        if len(args) == 1 and isinstance(args[0], FakeGeometry):
+            outline = args[0]._points()
+        else:
+            outline = np.array([_as_xyz(arg) for arg in args])
+        return self._geometry("Polygon", [_reduce(outline)])
+
+    def extrude(self, objs, vector, *_):
+        vector = np.array(vector, dtype=float)
+        extruded = []
+        for obj in _flatten([objs]):
+            pieces = [
+                _reduce(np.vstack([piece, piece + vector])) for piece in obj.pieces
+            ]
+            rank = max(_rank(piece) for piece in pieces)
+            type_name = {1: "Line", 2: "Surface", 3: "Volume"}[rank]
+            extruded.append(self._geometry(type_name, pieces))
+            if type_name == "Volume":
+                extruded.append(self._add(FakeObject(self, "Soil")))
+        return extruded
+
+    def group(self, *objs):
+        return self._add(FakeGroup(self, list(_flatten(objs))))
+
+    def _remove(self, obj):
+        self._objects = [other for other in self._objects if other is not obj]
+
+    def ungroup(self, *groups):
+        members = []
+        for group in _groups(groups):
+            members.extend(group)
+            self._remove(group)
+        return members
+
+    def delete(self, *objs):
+        """Deletes objects; deleting a group deletes its members too."""
+        for obj in objs:
+            if isinstance(obj, (list, tuple)):
+                self.delete(*obj)
+            self._remove(obj)
+        return "OK"
+
+    def rotate(self, objs, point, rx=0, ry=0, rz=0):
+        matrix = _rotation_matrix(rx, ry, rz)
+        for obj in _flatten([objs]):
+            obj.transform(matrix, np.array(_as_xyz(point)), np.zeros(3))
+        return "OK"
+
+    def move(self, objs, vector):
+        for obj in _flatten([objs]):
+            obj.transform(np.eye(3), np.zeros(3), np.array(_as_xyz(vector)))
+        return "OK"
+
+    def _copy(self, obj, pieces=None):
+        return self._geometry(obj.TypeName, obj.pieces if pieces is None else pieces)
+
+    def _split(self, obj, plane) -> list:
+        """New objects for the connected pieces of obj on each side of the plane."""
+        below, above = [], []
+        for piece in obj.pieces:
+            piece_below, piece_above = _split(piece, *plane)
+            rank = _rank(piece)
+            below += [p for p in [piece_below] if p is not None and _rank(p) == rank]
+            above += [p for p in [piece_above] if p is not None and _rank(p) == rank]
+        return [
+            self._copy(obj, component)
+            for side in (below, above)
+            for component in _components(side)
+        ]
+
+    def intersect(self, obj1, obj2, keep_originals=False):
+        """Split each object by the plane of the other, if that one is planar.
+
+        Two coplanar objects merge into one. The originals are deleted unless keep_originals is True.
+        """
+        plane1, plane2 = obj1.plane(), obj2.plane()
+        if _coplanar(plane1, plane2):
+            results = [self._copy(obj1, obj1.pieces + obj2.pieces)]
+        else:
+            results = (
+                self._split(obj1, plane2) if plane2 is not None else [self._copy(obj1)]
+            ) + (
+                self._split(obj2, plane1) if plane1 is not None else [self._copy(obj2)]
+            )
+        if not keep_originals:
+            self.delete(obj1, obj2)
+        return results
+
+    def combine(self, *args):
+        *objs, keep_originals = args if isinstance(args[-1], bool) else (*args, False)
+        objs = list(_flatten(objs))
+        pieces = [piece for obj in objs for piece in obj.pieces]
+        combined = self._copy(
+            max(objs, key=lambda obj: max(map(_rank, obj.pieces))), pieces
+        )
+        if not keep_originals:
+            self.delete(*objs)
+        return combined
+
+    def mergeequivalents(self, *objs):
+        """Deletes the objects geometrically equivalent to an earlier one."""
+        objs = list(_flatten(objs))
+        merged = 0
+        for idx, obj in enumerate(objs):
+            if not any(obj is other for other in self._objects):
+                continue
+            for other in objs[:idx]:
+                if _equivalent(obj, other):
+                    self.delete(obj)
+                    merged += 1
+                    break
+        if not merged:
+            return NO_EQUIVALENT_MESSAGE
+        return f"Merged {merged} equivalent geometric objects"
+
+    def gotostructures(self):
+        return "OK"
+
+    def gotosoil(self):
+        return "OK"
+
+
+def _as_xyz(arg) -> tuple[float, float, float]:
+    if isinstance(arg, FakePoint):
+        return arg.x, arg.y, arg.z
+    return tuple(float(v) for v in arg)
+
+
+def _coplanar(plane1, plane2) -> bool:
+    if plane1 is None or plane2 is None:
+        return False
+    (normal1, offset1), (normal2, offset2) = plane1, plane2
+    sign = math.copysign(1, normal1 @ normal2)
+    return np.allclose(normal1, sign * normal2, atol=TOLERANCE) and math.isclose(
+        offset1, sign * offset2, abs_tol=TOLERANCE * max(1.0, abs(offset1))
+    )
+
+
+def _equivalent(obj1, obj2) -> bool:
+    def vertices(obj):
+        return np.unique(np.round(_reduce(obj._points()), 6), axis=0)
+
+    vertices1, vertices2 = vertices(obj1), vertices(obj2)
+    return vertices1.shape == vertices2.shape and np.allclose(vertices1, vertices2)
+
+
+class _Unresolved(str):
+    """A name on a command line that is not an object of the fake g_i."""
+
+
+class FakeServer:
+    """The fake s_i; supports the bulk property reads and the command lines (batch_commands) the helpers use.
+
+    Command lines are recorded in commands. Those the fake g_i can run (its methods, methods of its objects and
+    set/setproperties of their properties) are run; the others (phases, boreholes, materials, ...) are
+    acknowledged with "OK" like Plaxis would without changing anything."""
+
+    def __init__(self, g_i: FakeGlobalObject):
+        self.input_proc = InputProcessor()
+        self.g_i = g_i
+        self.commands = []
+
+    def get_objects_property(self, proxy_objects, prop_name, phase_object=None):
+        return [getattr(obj, prop_name) for obj in proxy_objects]
+
+    def call_and_handle_commands(self, *commands):
+        self.commands.extend(commands)
+        return [self._run(command) for command in commands]
+
+    def _run(self, command):
+        method_name, *args = self._parse(COMMAND_TOKEN.findall(command))
+        if any(isinstance(arg, _Unresolved) for arg in _flatten(args)):
+            return "OK"
+        if method_name == "set" and args and isinstance(args[0], tuple):
+            (obj, prop_name), value = args
+            setattr(obj, prop_name, value)
+            return "OK"
+        if args and callable(getattr(args[0], method_name, None)):
+            return getattr(args[0], method_name)(*args[1:])
+        if method_name.startswith("_") or not hasattr(self.g_i, method_name):
+            return "OK"
+        return getattr(self.g_i, method_name)(*args)
+
+    def _parse(self, tokens, depth=0) -> list:
+        values = []
+        while tokens:
+            token = tokens.pop(0)
+            if token == "(":
+                values.append(tuple(self._parse(tokens, depth + 1)))
+            elif token == ")" and depth:
+                return values
+            elif token[0] in "\"'":
+                values.append(token[1:-1])
+            elif token in ("True", "False"):
+                values.append(token == "True")
+            elif depth or values:
+                values.append(self._value(token))
+            else:
+                values.append(token)
+        return values
+
+    def _value(self, token):
+        try:
+            return float(token) if any(c in token for c in ".eE") else int(token)
+        except ValueError:
+            return self._reference(token)
+
+    def _reference(self, name):
+        """The object named name, or (object, property name) for a dotted property reference."""
+        *path, last = name.split(".")
+        objects = {obj.Name: obj for obj in self.g_i._objects}
+        obj = objects.get(path[0] if path else last)
+        try:
+            for prop_name in path[1:]:
+                obj = getattr(obj, prop_name)
+        except AttributeError:
+            obj = None
+        if obj is None:
+            return _Unresolved(name)
+        return (obj, last) if path else obj
+
+
+def new_fake_server(*args, **kwargs) -> tuple[FakeServer, FakeGlobalObject]:
+    """Drop-in replacement for plxscripting.easy.new_server; connection arguments are ignored."""
+    g_i = FakeGlobalObject()
+    return FakeServer(g_i), g_i
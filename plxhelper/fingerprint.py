@@ -0,0 +1,52 @@
+"""helpers for content hashing of model definitions"""
+
+import hashlib
+import json
+from types import CodeType
+
+import numpy as np
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, separators=(",", ":"), allow_nan=True)
+
+
+def canonical(obj):
+    """Convert obj into a JSON-serializable form that does not depend on dict or set ordering.
+
+    Tuples and lists are not distinguished from each other. Unsupported types raise TypeError rather than hashing an
+    unstable repr()."""
+    match obj:
+        case None | bool() | int() | float() | str():
+            return obj
+        case np.generic():
+            return obj.item()
+        case np.ndarray():
+            return canonical(obj.tolist())
+        case dict():
+            return dict(
+                dict=sorted(
+                    ([canonical(k), canonical(v)] for k, v in obj.items()), key=_dumps
+                )
+            )
+        case list() | tuple():
+            return [canonical(item) for item in obj]
+        case set() | frozenset():
+            return dict(set=sorted((canonical(item) for item in obj), key=_dumps))
+        case CodeType():
+            return dict(
+                code=obj.co_code.hex(),
+                consts=canonical(obj.co_consts),
+                names=obj.co_names,
+            )
+        case bytes():
+            return dict(bytes=obj.hex())
+        case _ if obj is Ellipsis:
+            return dict(ellipsis=True)
+        case _:
+            raise TypeError(f"cannot fingerprint {type(obj).__name__} object")
+
+
+def fingerprint(*objs) -> str:
+    """Hex digest identifying the content of objs."""
+    return hashlib.sha256(_dumps(canonical(objs)).encode()).hexdigest()
@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-from math import dist
+from functools import lru_cache
+from math import cos, dist, hypot, radians, sin
 from typing import NamedTuple, TypeVar, Generic, Iterable
 
-from scipy.special import cosdg, sindg
-
 from plxhelper.plaxis_protocol import PlxProtocol, floatify
 
 Coord_co = TypeVar("Coord_co", bound=float)
@@ -27,39 +26,59 @@ D2PointPair_co = TypeVar(
 )
 
 
+# cosine and sine of 0, 90, 180 and 270 degrees
+_QUARTER_TURN_COS_SIN = ((1.0, 0.0), (0.0, 1.0), (-1.0, 0.0), (0.0, -1.0))
+
+
+@lru_cache(maxsize=1024)
+def _cos_sin_deg(θ_deg: float) -> tuple[float, float]:
+    """Cosine and sine of an angle in degrees; exact for multiples of 90 degrees."""
+    quarter_turns, remainder = divmod(θ_deg, 90)
+    if remainder == 0:
+        return _QUARTER_TURN_COS_SIN[int(quarter_turns) % 4]
+    θ_rad = radians(θ_deg)
+    return cos(θ_rad), sin(θ_rad)
+
+
 class Vector(NamedTuple, Generic[Coord_co, Vector_co]):
+    """A 3D vector.
+
+    Sums and differences take the type of the other operand (e.g. a tuple or a Point), so the methods also work
+    unbound on plain 3-tuples, e.g. Vector.__add__(p_min, (1, 0, 0)).
+    """
+
     i: Coord_co
     j: Coord_co
     k: Coord_co
 
     def _coerce(self: Iterable[float], type_: type[Vector_co]) -> Vector_co:
-        try:
-            return type_(v for v, _ in zip(self, range(3), strict=True))
-        except TypeError:
-            return type_(*(v for v, _ in zip(self, range(3), strict=True)))
+        x, y, z = self
+        return _make(type_, x, y, z)
 
     def __add__(self, other: Vector_co) -> Vector_co:
-        return Vector._coerce(
-            (lhs + rhs for lhs, rhs in zip(self, other, strict=True)), type(other)
-        )
+        x, y, z = self
+        a, b, c = other
+        return _make(type(other), x + a, y + b, z + c)
 
     __radd__ = __add__
 
     def __sub__(self, other: Vector_co) -> Vector_co:
-        return Vector(
-            *(lhs - rhs for lhs, rhs in zip(self, other, strict=True))
-        )._coerce(type(other))
+        x, y, z = self
+        a, b, c = other
+        return _make(type(other), x - a, y - b, z - c)
 
     def __rsub__(self, other: Vector_co) -> Vector_co:
-        return Vector(
-            *(lhs - rhs for lhs, rhs in zip(other, self, strict=True))
-        )._coerce(type(other))
+        x, y, z = self
+        a, b, c = other
+        return _make(type(other), a - x, b - y, c - z)
 
     def __neg__(self) -> Vector:
-        return Vector(*(-coord for coord in self))
+        x, y, z = self
+        return _new_tuple(Vector, (-x, -y, -z))
 
     def __mul__(self, other: float) -> Vector:
-        return Vector(*(other * value for value in self))
+        x, y, z = self
+        return _new_tuple(Vector, (other * x, other * y, other * z))
 
     __rmul__ = __mul__
 
@@ -68,14 +87,12 @@ class Vector(NamedTuple, Generic[Coord_co, Vector_co]):
 
     @property
     def magnitude(self) -> float:
-        return dist(self, (0, 0, 0))
+        return hypot(*self)
 
     def rotate_z(self: Vector_co, θ_deg: float) -> Vector_co:
         x, y, z = self
-        i = x * cosdg(θ_deg) - y * sindg(θ_deg)
-        j = x * sindg(θ_deg) + y * cosdg(θ_deg)
-        k = z
-        return Vector._coerce((i, j, k), type(self))
+        cos_θ, sin_θ = _cos_sin_deg(θ_deg)
+        return _make(type(self), x * cos_θ - y * sin_θ, x * sin_θ + y * cos_θ, z)
 
 
 class Point(NamedTuple):
@@ -84,6 +101,20 @@ class Point(NamedTuple):
     z: Coord_co
 
 
+_new_tuple = tuple.__new__
+# 3-tuple types that are built straight from their values, without calling __new__
+_TUPLE_TYPES = frozenset((tuple, Vector, Point))
+
+
+def _make(type_, x, y, z):
+    """A 3-sequence of type_; named tuples are built with _make, other types from an iterable."""
+    if type_ in _TUPLE_TYPES:
+        return _new_tuple(type_, (x, y, z))
+    if (make := getattr(type_, "_make", None)) is not None:
+        return make((x, y, z))
+    return type_((x, y, z))
+
+
 class BoundingBox(NamedTuple, Generic[Point_co]):
     """
     A rectangle or box with one corner at p_min, and another corner at p_max.
@@ -0,0 +1,227 @@
+"""helpers for starting local Plaxis Input servers and recycling them before long sweeps wear them down"""
+
+import contextlib
+import queue
+import subprocess
+import sys
+import threading
+import time
+from typing import NamedTuple, Sequence
+
+import psutil
+from plxscripting.easy import new_server
+from plxscripting.plx_scripting_exceptions import PlxScriptingError
+
+from plxhelper.branch_calculation import ServerAddress
+from plxhelper.exceptions import PlaxisHelperError
+
+# starts the local stand-in server (mock_server) in place of Plaxis Input
+MOCK_SERVER_COMMAND = (
+    sys.executable,
+    "-m",
+    "plxhelper.mock_server",
+    "--port",
+    "{port}",
+    "--password",
+    "{password}",
+)
+# seconds between health checks while a server starts
+POLL_INTERVAL = 0.1
+# seconds a stopped server is given to exit before it is killed
+STOP_TIMEOUT = 10.0
+
+
+class InstanceError(PlaxisHelperError):
+    pass
+
+
+class Session(NamedTuple):
+    server: ServerAddress
+    s_i: object
+    g_i: object
+
+
+class _Instance:
+    def __init__(self, server: ServerAddress):
+        self.server = server
+        self.process = None
+        self.runs = 0
+
+
+class InstanceManager:
+    """A number of local Plaxis Input server processes, on consecutive ports from first_port.
+
+    command is the command line starting one server, with {port} and {password} filled in for each, e.g.
+
+        ("C:/Program Files/Bentley/Geotechnical/PLAXIS 3D CONNECT Edition V22/Plaxis3DInput.exe",
+         "--AppServerPort={port}", "--AppServerPassword={password}")
+
+    or MOCK_SERVER_COMMAND. A server is recycled (stopped with every process it started, such as the Output servers
+    left behind by view, and started again on the same port) once it has been released after max_runs runs, or when
+    its processes use more than max_memory bytes, or when it fails a health check.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        count=1,
+        first_port=10000,
+        address="localhost",
+        password="python",
+        max_runs=None,
+        max_memory=None,
+        startup_timeout=60.0,
+        cwd=None,
+    ):
+        self.command = tuple(command)
+        self.max_runs = max_runs
+        self.max_memory = max_memory
+        self.startup_timeout = startup_timeout
+        self.cwd = cwd
+        self._instances = {
+            server: _Instance(server)
+            for server in (
+                ServerAddress(address, first_port + idx, password)
+                for idx in range(count)
+            )
+        }
+        self._free = queue.Queue()
+        self._lock = threading.Lock()
+
+    @property
+    def servers(self) -> list[ServerAddress]:
+        return list(self._instances)
+
+    def runs(self, server: ServerAddress) -> int:
+        """Runs released since the server was last (re)started."""
+        return self._instances[server].runs
+
+    def pid(self, server: ServerAddress) -> int:
+        return self._instances[server].process.pid
+
+    def start(self):
+        for instance in self._instances.values():
+            self._start(instance)
+        for server in self._instances:
+            self._free.put(server)
+        return self
+
+    def stop(self):
+        for instance in self._instances.values():
+            self._stop(instance)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def healthy(self, server: ServerAddress) -> bool:
+        """Whether the server process is running and answers a request."""
+        process = self._instances[server].process
+        if process is None or process.poll() is not None:
+            return False
+        try:
+            _, g = new_server(
+                server.address, port=server.port, password=server.password
+            )
+            g.Project
+        except (PlxScriptingError, OSError):
+            return False
+        return True
+
+    def memory(self, server: ServerAddress) -> int:
+        """Resident memory in bytes of the server process and every process it started."""
+        process = psutil.Process(self._instances[server].process.pid)
+        total = 0
+        for proc in (process, *process.children(recursive=True)):
+            with contextlib.suppress(psutil.NoSuchProcess):
+                total += proc.memory_info().rss
+        return total
+
+    def needs_recycling(self, server: ServerAddress) -> bool:
+        instance = self._instances[server]
+        if self.max_runs is not None and instance.runs >= self.max_runs:
+            return True
+        if self.max_memory is not None and self.memory(server) > self.max_memory:
+            return True
+        return not self.healthy(server)
+
+    def recycle(self, server: ServerAddress):
+        instance = self._instances[server]
+        self._stop(instance)
+        self._start(instance)
+
+    def release(self, server: ServerAddress):
+        """Count a finished run on the server and recycle it if need be."""
+        with self._lock:
+            self._instances[server].runs += 1
+        if self.needs_recycling(server):
+            self.recycle(server)
+
+    @contextlib.contextmanager
+    def session(self):
+        """A connection to a free, healthy server, which is released once the session ends.
+
+        Waits for a server when all are in use. The connection is the session's own, so sessions may run in
+        different threads; the server address can also be passed on, e.g. as single_pipe_reline_task.run(server=...).
+        """
+        server = self._free.get()
+        try:
+            if not self.healthy(server):
+                self.recycle(server)
+            s_i, g_i = new_server(
+                server.address, port=server.port, password=server.password
+            )
+            yield Session(server, s_i, g_i)
+        finally:
+            try:
+                self.release(server)
+            finally:
+                self._free.put(server)
+
+    def _start(self, instance: _Instance):
+        server = instance.server
+        command = [
+            arg.format(port=server.port, password=server.password)
+            for arg in self.command
+        ]
+        instance.process = subprocess.Popen(
+            command,
+            cwd=self.cwd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        instance.runs = 0
+        deadline = time.monotonic() + self.startup_timeout
+        while not self.healthy(server):
+            if instance.process.poll() is not None:
+                raise InstanceError(
+                    f"{command} exited with code {instance.process.returncode}"
+                )
+            if time.monotonic() > deadline:
+                self._stop(instance)
+                raise InstanceError(
+                    f"{server} did not answer within {self.startup_timeout} s"
+                )
+            time.sleep(POLL_INTERVAL)
+
+    @staticmethod
+    def _stop(instance: _Instance):
+        if instance.process is None:
+            return
+        try:
+            process = psutil.Process(instance.process.pid)
+            processes = [process, *process.children(recursive=True)]
+        except psutil.NoSuchProcess:
+            processes = []
+        for proc in processes:
+            with contextlib.suppress(psutil.NoSuchProcess):
+                proc.terminate()
+        _, alive = psutil.wait_procs(processes, timeout=STOP_TIMEOUT)
+        for proc in alive:
+            with contextlib.suppress(psutil.NoSuchProcess):
+                proc.kill()
+        # reaps the process so it does not linger as a zombie
+        instance.process.wait()
+        instance.process = None
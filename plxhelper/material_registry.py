@@ -0,0 +1,80 @@
+"""helpers for creating each distinct Plaxis material of a project only once"""
+
+import plxhelper.plaxis_helper as plaxis_helper
+
+
+def material_key(type_name, *args, **kwargs) -> tuple:
+    """The registry key of a material_creator(type_name, *args, **kwargs) material."""
+    return type_name, args, tuple(sorted(kwargs.items()))
+
+
+class MaterialRegistry:
+    """The materials of the connected project, keyed by the material_creator arguments they are made with.
+
+    Asking for a material that was made before returns the existing Plaxis object. Materials can be requested ahead
+    and are then all created in one round-trip when the first of them is needed (or by create_pending()). A registry
+    belongs to one project; after another project is opened, rebuild it with from_names().
+    """
+
+    def __init__(self):
+        self._materials = {}
+        self._pending = {}
+
+    def __len__(self) -> int:
+        return len(self._materials)
+
+    def __contains__(self, key) -> bool:
+        return key in self._materials
+
+    def materials(self) -> dict:
+        """The created materials by key."""
+        return dict(self._materials)
+
+    def request(self, type_name, *args, **kwargs) -> tuple:
+        """Queue a material for creation, unless it exists already. Returns its key."""
+        key = material_key(type_name, *args, **kwargs)
+        if key not in self._materials:
+            self._pending.setdefault(key, (type_name, args, kwargs))
+        return key
+
+    def create_pending(self):
+        """Create all requested materials in a single batch."""
+        if not self._pending:
+            return
+        calls = []
+        for type_name, args, kwargs in self._pending.values():
+            xxxmat, _ = plaxis_helper.MATERIAL_TYPE_DICT[type_name]
+            properties = plaxis_helper.material_kwargs(type_name, *args, **kwargs)
+            calls.append((None, xxxmat.__name__, *properties.items()))
+        created = plaxis_helper.batch_commands(*calls)
+        self._materials.update(zip(self._pending, created))
+        self._pending.clear()
+
+    def get(self, type_name, *args, **kwargs):
+        """The material made with material_creator(type_name, *args, **kwargs), created if needed."""
+        key = self.request(type_name, *args, **kwargs)
+        self.create_pending()
+        return self._materials[key]
+
+    def creator(self, type_name, *args, **kwargs):
+        """A deduplicating stand-in for material_creator(type_name, *args, **kwargs)."""
+
+        def create_material():
+            return self.get(type_name, *args, **kwargs)
+
+        return create_material
+
+    def names(self) -> dict:
+        """Names of the created materials by key, read in one round-trip."""
+        return dict(
+            zip(self._materials, plaxis_helper.plx_names(self._materials.values()))
+        )
+
+    @classmethod
+    def from_names(cls, names: dict):
+        """Registry of the same-named materials of the project opened since names() was read."""
+        registry = cls()
+        registry._materials = {
+            key: getattr(plaxis_helper.g_i, name) for key, name in names.items()
+        }
+        return registry
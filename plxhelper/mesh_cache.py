@@ -0,0 +1,113 @@
+"""helpers for reusing the mesh of a saved project when the model geometry has not changed"""
+
+import json
+import os
+import pathlib
+import re
+import shutil
+import uuid
+from itertools import chain
+from typing import Callable
+
+import plxhelper.plaxis_helper as plaxis_helper
+from plxhelper.fingerprint import fingerprint
+
+# coordinates read from Plaxis are rounded so numerical noise does not change the fingerprint
+DUMP_DECIMALS = 6
+
+PROJECT_FILE_NAME = "mesh.p3d"
+MESH_INFO_FILE_NAME = "mesh.json"
+
+# feedback of the Plaxis mesh command, e.g. "Generated 12345 elements, 23456 nodes"
+_ELEMENTS_RE = re.compile(r"(\d+) elements")
+
+
+def geometry_dump(objs=None) -> list:
+    """Names and bounding boxes of the model geometry, read in bulk from Plaxis."""
+    if objs is None:
+        objs = plaxis_helper.g_i.Geometry
+    objs = list(objs)
+    return sorted(
+        [name, [round(coord, DUMP_DECIMALS) for point in box for coord in point]]
+        for name, box in zip(
+            plaxis_helper.plx_names(objs), plaxis_helper.bounding_boxes(objs)
+        )
+    )
+
+
+def geometry_fingerprint(geometry, mesh_settings: dict) -> str:
+    """Fingerprint of a mesh.
+
+    geometry is either the plan the model geometry is built from (e.g. a dict of the extents and shape dicts) or a
+    geometry_dump() of the built model."""
+    return fingerprint("mesh", geometry, mesh_settings)
+
+
+def mesh(mesh_settings: dict) -> int | None:
+    """Mesh the connected project. Returns the element count Plaxis reports, if any."""
+    plaxis_helper.g_i.gotomesh()
+    feedback = plaxis_helper.g_i.mesh(*chain.from_iterable(mesh_settings.items()))
+    match = _ELEMENTS_RE.search(str(feedback))
+    return None if match is None else int(match.group(1))
+
+
+class MeshCache:
+    """A directory of meshed projects keyed by geometry fingerprint.
+
+    Projects are saved into a private temporary directory and renamed into place, so workers sharing the directory
+    never open a partly saved project.
+    """
+
+    def __init__(self, directory):
+        self.directory = pathlib.Path(directory)
+        (self.directory / "tmp").mkdir(parents=True, exist_ok=True)
+
+    def project_path(self, mesh_fingerprint) -> pathlib.Path:
+        return self.directory / mesh_fingerprint / PROJECT_FILE_NAME
+
+    def __contains__(self, mesh_fingerprint) -> bool:
+        return (self.directory / mesh_fingerprint).exists()
+
+    def elements(self, mesh_fingerprint) -> int | None:
+        """The element count of a saved mesh, if Plaxis reported it."""
+        with open(self.directory / mesh_fingerprint / MESH_INFO_FILE_NAME) as info_file:
+            return json.load(info_file)["elements"]
+
+    def _save(self, mesh_fingerprint, elements):
+        tmp_path = self.directory / "tmp" / f"{mesh_fingerprint}-{uuid.uuid4().hex}"
+        tmp_path.mkdir()
+        try:
+            plaxis_helper.g_i.save(str(tmp_path / PROJECT_FILE_NAME))
+            with open(tmp_path / MESH_INFO_FILE_NAME, "w") as info_file:
+                json.dump(dict(elements=elements), info_file)
+            try:
+                os.rename(tmp_path, self.directory / mesh_fingerprint)
+            except OSError:
+                # another worker saved the same mesh first
+                if mesh_fingerprint not in self:
+                    raise
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    def mesh(
+        self,
+        mesh_fingerprint,
+        mesh_settings: dict,
+        working_path,
+        restore: Callable = None,
+    ) -> bool:
+        """Mesh the connected project, or open the project saved with the same mesh fingerprint instead.
+
+        An opened project still has the materials and other non-geometric settings it was saved with; restore() is
+        called afterwards to reapply those of the current model. Either way the connected project continues as
+        working_path so the cached project is never modified. Returns True when the mesh was reused.
+        """
+        reused = mesh_fingerprint in self
+        if reused:
+            plaxis_helper.s_i.open(str(self.project_path(mesh_fingerprint)))
+            if restore is not None:
+                restore()
+        else:
+            self._save(mesh_fingerprint, mesh(mesh_settings))
+        plaxis_helper.g_i.save(str(working_path))
+        return reused
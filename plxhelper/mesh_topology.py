@@ -0,0 +1,99 @@
+"""helpers for fetching the node coordinates of a mesh once and reusing them for every phase and run sharing it"""
+
+import os
+import pathlib
+import uuid
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+from plxhelper.fingerprint import fingerprint
+from plxhelper.output_results import LazyResults
+
+COORDINATE_COLUMNS = ("x", "y", "z")
+
+
+class MeshTopologyCache:
+    """Node coordinates of Plaxis objects by mesh fingerprint (see mesh_cache.geometry_fingerprint).
+
+    getresults returns the nodes of an object in the same order for every phase of a mesh, so results are joined to
+    the cached coordinates by position. Coordinates are kept in memory and, when a directory is given, saved there as
+    .npy files so runs in other processes that share the mesh can reuse them.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = None if directory is None else pathlib.Path(directory)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self._coordinates = {}
+
+    @staticmethod
+    def key(mesh_fingerprint, obj_name, location="node") -> str:
+        return fingerprint("mesh_topology", mesh_fingerprint, obj_name, location)
+
+    def _path(self, key) -> pathlib.Path:
+        return self.directory / f"{key}.npy"
+
+    def get(self, mesh_fingerprint, obj_name, location="node") -> np.ndarray | None:
+        """The (number of nodes, 3) coordinates of an object, or None when they are not cached."""
+        key = self.key(mesh_fingerprint, obj_name, location)
+        if key not in self._coordinates and self.directory is not None:
+            try:
+                xyz = np.load(self._path(key))
+            except FileNotFoundError:
+                return None
+            xyz.flags.writeable = False
+            self._coordinates[key] = xyz
+        return self._coordinates.get(key)
+
+    def put(self, mesh_fingerprint, obj_name, xyz, location="node"):
+        key = self.key(mesh_fingerprint, obj_name, location)
+        xyz = np.array(xyz, dtype=float).reshape(-1, 3)
+        xyz.flags.writeable = False
+        self._coordinates[key] = xyz
+        if self.directory is not None:
+            # renamed into place so other processes never load a partly written file
+            tmp_path = self.directory / f"{key}-{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "wb") as tmp_file:
+                np.save(tmp_file, xyz)
+            os.replace(tmp_path, self._path(key))
+
+    def frame(
+        self,
+        results: LazyResults,
+        mesh_fingerprint,
+        phase,
+        obj_name,
+        columns: Mapping,
+        category=None,
+    ) -> pd.DataFrame:
+        """results.frame(phase, obj_name, columns) with x, y and z columns of the node coordinates added in front.
+
+        columns maps column names to result type names such as "Plate.N22"; category ("Plate", "Soil", ...) defaults
+        to that of the first of them. Coordinates are only fetched, along with the results, when they are not cached.
+        """
+        if category is None:
+            category, _ = next(iter(columns.values())).split(".")
+        xyz = self.get(mesh_fingerprint, obj_name, results.location)
+        if xyz is None:
+            coordinate_columns = {
+                name: f"{category}.{name.upper()}" for name in COORDINATE_COLUMNS
+            }
+            fetched = results.frame(phase, obj_name, {**coordinate_columns, **columns})
+            self.put(
+                mesh_fingerprint,
+                obj_name,
+                fetched[list(COORDINATE_COLUMNS)].to_numpy(),
+                results.location,
+            )
+            return fetched
+        values = results.frame(phase, obj_name, columns)
+        if len(values) != len(xyz):
+            raise ValueError(
+                f"{obj_name} has {len(values)} result nodes but {len(xyz)} cached nodes;"
+                " is the mesh fingerprint right?"
+            )
+        return pd.concat(
+            [pd.DataFrame(xyz, columns=list(COORDINATE_COLUMNS)), values], axis=1
+        )
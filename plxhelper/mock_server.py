@@ -0,0 +1,976 @@
+"""a local stand-in for the Plaxis scripting server, for running helpers and task chains without Plaxis
+
+Speaks the HTTP protocol plxscripting uses (including encrypted payloads when a password is set) and keeps a simple
+object model: named objects with properties, the lists they are collected in (Points, Boreholes, Phases, ...) and
+groups. Geometry is not modeled, except that meshing cuts each volume in two; commands it does not know succeed
+without doing anything. Every request is recorded and a latency can be added to each one, so round-trips and
+latency-bound wall time can be measured.
+
+Run it from the command line with:
+
+    python -m plxhelper.mock_server --port 10000 --password python --latency 0.01
+"""
+
+import argparse
+import json
+import pickle
+import re
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple, Callable
+
+import encryption
+from plxscripting.const import NULL_GUID
+
+SERVER_NAME = "PLAXIS 3D Input 2023.2.0.0"
+
+# command name: (type name of the created object, list the object is collected in)
+_CREATORS = {
+    "point": ("Point", "Points"),
+    "line": ("Line", "Lines"),
+    "surface": ("Polygon", "Surfaces"),
+    "polycurve": ("Polycurve", "Polycurves"),
+    "borehole": ("Borehole", "Boreholes"),
+    "soilmat": ("SoilMat", "Materials"),
+    "platemat": ("PlateMat", "Materials"),
+    "beammat": ("BeamMat", "Materials"),
+    "embeddedbeammat": ("EmbeddedBeamMat", "Materials"),
+    "geogridmat": ("GeogridMat", "Materials"),
+    "anchormat": ("AnchorMat", "Materials"),
+    "plate": ("Plate", "Plates"),
+    "beam": ("Beam", "Beams"),
+    "surfload": ("SurfaceLoad", "SurfaceLoads"),
+    "lineload": ("LineLoad", "LineLoads"),
+    "pointload": ("PointLoad", "PointLoads"),
+    "surfdispl": ("SurfaceDisplacement", "SurfaceDisplacements"),
+    "posinterface": ("PositiveInterface", "Interfaces"),
+    "neginterface": ("NegativeInterface", "Interfaces"),
+}
+
+# features that create the Polygon they are assigned to when drawn from coordinates
+_SURFACE_FEATURES = ("plate", "surfload", "surfdispl", "posinterface", "neginterface")
+
+# result types of the Output ResultTypes object (g_o.ResultTypes.Plate.N22, ...) by category
+_RESULT_TYPES = dict(
+    Plate=("X", "Y", "Z", "Ux", "Uy", "Uz", "Utot", "N11", "N22", "Q12", "Q13")
+    + ("Q23", "M11", "M22", "M12"),
+    Soil=("X", "Y", "Z", "Ux", "Uy", "Uz", "Utot", "SigxxE", "SigyyE", "SigzzE"),
+)
+
+# parts each volume is cut into when the geometry is intersected
+CUT_PARTS = 2
+# elements a mesh has per unit of soil contour area
+ELEMENTS_PER_AREA = 0.01
+
+# lists collecting the model geometry
+_GEOMETRY_LISTS = ("Points", "Lines", "Surfaces", "Polycurves", "Volumes")
+
+# commands that succeed without changing the model, listed so proxies expose them
+_NO_OP_COMMANDS = (
+    "gotosoil",
+    "gotostructures",
+    "gotoflow",
+    "gotostages",
+    "extendtosymmetryaxis",
+    "symmetricclose",
+    "move",
+    "rotate",
+    "intersect",
+    "combine",
+    "mergeequivalents",
+    "info",
+    "echo",
+)
+
+
+class PlxObject:
+    """An object in the stand-in model; properties holds its intrinsic property values."""
+
+    def __init__(self, type_name, name=None, **properties):
+        self.guid = "{" + str(uuid.uuid4()).upper() + "}"
+        self.type_name = type_name
+        self.properties = dict(Name=name, TypeName=type_name, **properties)
+        # property name: {phase guid: value}
+        self.staged = defaultdict(dict)
+
+    @property
+    def name(self):
+        return self.properties["Name"]
+
+    def describe(self) -> dict:
+        return dict(type=self.type_name, guid=self.guid, islistable=False)
+
+
+class PlxList(PlxObject):
+    def __init__(self, type_name, name=None, items=None):
+        super().__init__(type_name, name)
+        self.items = [] if items is None else items
+
+    def describe(self) -> dict:
+        return dict(super().describe(), islistable=True)
+
+
+class Values(list):
+    """A command result of plain values rather than of objects."""
+
+
+class PropertyRef(NamedTuple):
+    owner: PlxObject
+    name: str
+
+
+class Ref(str):
+    """An unquoted command line token that does not refer to a known object."""
+
+
+class Model:
+    """The objects of one stand-in project."""
+
+    def __init__(self):
+        self.objects = {}
+        self.names = {}
+        # property guid: PropertyRef
+        self.property_refs = {}
+        self._property_guids = {}
+        self._counters = Counter()
+        self.lists = {}
+        initial_phase = self.add(PlxObject("Phase", "InitialPhase"), "Phases")
+        initial_phase.properties.update(
+            Identification="Initial phase",
+            PreviousPhase=None,
+            ShouldCalculate=True,
+            CalculationResult="None",
+        )
+        self.add(PlxObject("Project", "Project", UnitForce="kN", UnitLength="m"))
+        self.add(PlxObject("SoilContour", "SoilContour"))
+        # (object name or None, phase name, result type name such as "Plate.N22"): values
+        self.results = {}
+        categories = {}
+        for category, result_type_names in _RESULT_TYPES.items():
+            categories[category] = self.add(PlxObject(f"{category}ResultTypes"))
+            for name in result_type_names:
+                categories[category].properties[name] = self.add(
+                    PlxObject("ResultType", Identification=f"{category}.{name}")
+                )
+        self.add(PlxObject("ResultTypes", "ResultTypes", **categories))
+
+    def get_list(self, list_name) -> PlxList:
+        if list_name not in self.lists:
+            self.lists[list_name] = self.add(PlxList(list_name, list_name))
+        return self.lists[list_name]
+
+    def add(self, obj, list_name=None, prefix=None):
+        if obj.name is None and prefix is not None:
+            self._counters[prefix] += 1
+            obj.properties["Name"] = f"{prefix}_{self._counters[prefix]}"
+        self.objects[obj.guid] = obj
+        if obj.name is not None:
+            self.names[obj.name] = obj
+        if list_name is not None:
+            self.get_list(list_name).items.append(obj)
+        return obj
+
+    def remove(self, obj):
+        self.objects.pop(obj.guid, None)
+        if self.names.get(obj.name) is obj:
+            del self.names[obj.name]
+        for plx_list in self.lists.values():
+            if obj in plx_list.items:
+                plx_list.items.remove(obj)
+
+    def list_items(self, plx_list) -> list:
+        if plx_list.name == "Geometry":
+            return [
+                obj
+                for list_name in _GEOMETRY_LISTS
+                for obj in self.get_list(list_name).items
+            ]
+        return plx_list.items
+
+    def named_object(self, name):
+        if name == "Geometry" or name in _GEOMETRY_LISTS or name in _CREATORS_LISTS:
+            return self.get_list(name)
+        return self.names.get(name) or self.lists.get(name)
+
+    def property_guid(self, owner, name) -> str:
+        key = owner.guid, name
+        if key not in self._property_guids:
+            guid = "{" + str(uuid.uuid4()).upper() + "}"
+            self._property_guids[key] = guid
+            self.property_refs[guid] = PropertyRef(owner, name)
+        return self._property_guids[key]
+
+    def resolve(self, token):
+        """The object or property a command line token refers to, or the token itself."""
+        if token in self.objects:
+            return self.objects[token]
+        if token in self.property_refs:
+            return self.property_refs[token]
+        head, *attributes = token.split(".")
+        target = self.objects.get(head) or self.named_object(head)
+        if target is None:
+            return Ref(token)
+        for attribute in attributes:
+            if isinstance(target, PropertyRef):
+                target = target.owner.properties.get(target.name)
+            if not isinstance(target, PlxObject):
+                return Ref(token)
+            target = PropertyRef(target, attribute)
+        return target
+
+    def value(self, owner, name, phase=None):
+        if phase is not None and phase.guid in owner.staged.get(name, {}):
+            return owner.staged[name][phase.guid]
+        if isinstance(owner, PlxList) and name == "Count":
+            return len(self.list_items(owner))
+        return owner.properties.get(name)
+
+
+_CREATORS_LISTS = {list_name for _, list_name in _CREATORS.values()} | {
+    "Phases",
+    "Soillayers",
+    "Soils",
+    "Groups",
+}
+
+_TOKEN_RE = re.compile(
+    r'"""(.*?)"""|\'\'\'(.*?)\'\'\'|"([^"]*)"|\'([^\']*)\'|(\()|(\))|([^\s()]+)',
+    re.S,
+)
+
+
+def _atom(token):
+    if token in ("True", "False"):
+        return token == "True"
+    for convert in (int, float):
+        try:
+            return convert(token)
+        except ValueError:
+            pass
+    return Ref(token)
+
+
+def parse_command(command) -> tuple[str, list]:
+    """Split a command line into its method name and arguments; parenthesized arguments become tuples."""
+    stack = [[]]
+    for match in _TOKEN_RE.finditer(command):
+        *strings, open_paren, close_paren, token = match.groups()
+        if open_paren:
+            stack.append([])
+        elif close_paren:
+            group = tuple(stack.pop())
+            stack[-1].append(group)
+        elif token is not None:
+            stack[-1].append(_atom(token))
+        else:
+            stack[-1].append(next(s for s in strings if s is not None))
+    method_name, *args = stack[0]
+    return str(method_name), args
+
+
+class CommandError(Exception):
+    pass
+
+
+_COMMANDS: dict[str, Callable] = {}
+
+
+def _command(*names):
+    def register(func):
+        for name in names:
+            _COMMANDS[name] = func
+        return func
+
+    return register
+
+
+def _objects(args):
+    """Objects among the arguments, with tuples and lists flattened."""
+    for arg in args:
+        if isinstance(arg, tuple):
+            yield from _objects(arg)
+        elif isinstance(arg, PlxObject):
+            yield arg
+
+
+def _property_pairs(args):
+    """(name, value) pairs given either as tuples or as a flat sequence of names and values."""
+    if all(isinstance(arg, tuple) and len(arg) == 2 for arg in args):
+        return list(args)
+    if len(args) % 2:
+        raise CommandError("property names and values must come in pairs")
+    return list(zip(args[::2], args[1::2]))
+
+
+def _create(model, method_name, args):
+    type_name, list_name = _CREATORS[method_name]
+    obj = model.add(PlxObject(type_name), list_name, prefix=type_name)
+    if method_name.endswith("mat"):
+        for name, value in _property_pairs(args):
+            obj.properties[str(name)] = value
+    elif method_name == "borehole":
+        obj.properties.update(x=args[0], y=args[1], Head=0.0, Top=0.0)
+        for soil_layer in model.get_list("Soillayers").items:
+            _add_zone(model, soil_layer, obj)
+    elif method_name == "polycurve":
+        obj.properties["Segments"] = model.add(PlxList("Segments"))
+    elif method_name in _SURFACE_FEATURES and not isinstance(args[0], PlxObject):
+        polygon = model.add(PlxObject("Polygon"), "Surfaces", prefix="Polygon")
+        obj.properties["Parent"] = polygon
+        return [polygon, obj]
+    return [obj]
+
+
+for _method_name in _CREATORS:
+    _COMMANDS[_method_name] = lambda model, args, _m=_method_name: _create(
+        model, _m, args
+    )
+
+
+def _add_zone(model, soil_layer, borehole):
+    zones = soil_layer.properties["Zones"]
+    top = borehole.properties["Top"]
+    for other_layer in model.get_list("Soillayers").items:
+        if other_layer is soil_layer:
+            break
+        for zone in other_layer.properties["Zones"].items:
+            if zone.properties["Borehole"] is borehole:
+                top = zone.properties["Bottom"]
+    zone = model.add(
+        PlxObject(
+            "SoilLayerZone",
+            Borehole=borehole,
+            Top=top,
+            Bottom=top - soil_layer.properties["Thickness"],
+        ),
+        prefix="BoreholeLayerZone",
+    )
+    zones.items.append(zone)
+
+
+def _soil(model):
+    water_conditions = model.add(PlxObject("WaterConditions", Conditions="None"))
+    return model.add(
+        PlxObject("Soil", Material=None, WaterConditions=water_conditions),
+        "Soils",
+        prefix="Soil",
+    )
+
+
+@_command("soillayer")
+def _soillayer(model, args):
+    *_, thickness = args
+    soil_layer = model.add(PlxObject("Soillayer"), "Soillayers", prefix="Soillayer")
+    soil = _soil(model)
+    soil_layer.properties.update(
+        Thickness=thickness, Soil=soil, Zones=model.add(PlxList("Zones"))
+    )
+    for borehole in model.get_list("Boreholes").items:
+        _add_zone(model, soil_layer, borehole)
+    return [soil_layer]
+
+
+@_command("add")
+def _add(model, args):
+    polycurve = args[0]
+    segment = model.add(
+        PlxObject(
+            "Segment",
+            LineProperties=model.add(PlxObject("LineProperties")),
+            ArcProperties=model.add(PlxObject("ArcProperties")),
+        ),
+        prefix="Segment",
+    )
+    polycurve.properties["Segments"].items.append(segment)
+    return [segment]
+
+
+@_command("extrude")
+def _extrude(model, args):
+    """Curves extrude to surfaces and surfaces to volumes, each with its Soil."""
+    extruded = []
+    for obj in _objects(args[:1]):
+        if obj.type_name in ("Line", "Polycurve"):
+            extruded.append(
+                model.add(PlxObject("Surface"), "Surfaces", prefix="Surface")
+            )
+        else:
+            extruded.append(model.add(PlxObject("Volume"), "Volumes", prefix="Volume"))
+            extruded.append(_soil(model))
+    return extruded
+
+
+@_command("initializerectangular")
+def _initializerectangular(model, args):
+    soil_contour, *extents = args
+    soil_contour.properties["Extents"] = tuple(extents)
+    return "OK"
+
+
+@_command("mesh")
+def _mesh(model, args):
+    """Reports an element count in proportion to the soil contour area, like Plaxis does."""
+    xmin, ymin, xmax, ymax = model.named_object("SoilContour").properties.get(
+        "Extents", (0, 0, 0, 0)
+    )
+    elements = round((xmax - xmin) * (ymax - ymin) * ELEMENTS_PER_AREA)
+    return f"Generated {elements} elements"
+
+
+@_command("gotomesh")
+def _gotomesh(model, args):
+    """Intersecting the geometry cuts each volume in CUT_PARTS parts, each with its Soil. The name of a cut volume
+    then refers to the group of its parts."""
+    for volume in list(model.get_list("Volumes").items):
+        if volume.properties.get("Cut"):
+            continue
+        parts = [
+            model.add(
+                PlxObject(
+                    "Volume",
+                    f"{volume.name}_{idx}",
+                    Cut=True,
+                    Soil=_soil(model),
+                ),
+                "Volumes",
+            )
+            for idx in range(1, CUT_PARTS + 1)
+        ]
+        model.remove(volume)
+        # still known to the proxies made before
+        model.objects[volume.guid] = volume
+        model.add(PlxList("Volume", volume.name, items=parts))
+    return "OK"
+
+
+@_command("phase")
+def _phase(model, args):
+    (previous_phase,) = args
+    obj = model.add(PlxObject("Phase"), "Phases", prefix="Phase")
+    obj.properties.update(
+        Identification=obj.name,
+        PreviousPhase=previous_phase,
+        ShouldCalculate=True,
+        CalculationResult="None",
+    )
+    return [obj]
+
+
+@_command("group")
+def _group(model, args):
+    group = PlxList("Group", items=list(_objects(args)))
+    return [model.add(group, "Groups", prefix="Group")]
+
+
+@_command("ungroup")
+def _ungroup(model, args):
+    members = []
+    for group in _objects(args):
+        members.extend(group.items)
+        model.remove(group)
+    return members
+
+
+@_command("delete")
+def _delete(model, args):
+    for obj in _objects(args):
+        model.remove(obj)
+    return "OK"
+
+
+@_command("rename")
+def _rename(model, args):
+    obj, name = args
+    model.names.pop(obj.name, None)
+    obj.properties["Name"] = name
+    model.names[name] = obj
+    return "OK"
+
+
+def _set_property(model, target, value, phase=None):
+    if not isinstance(target, PropertyRef):
+        raise CommandError(f"{target} is not a property")
+    if target.name == "Name":
+        return _rename(model, [target.owner, value])
+    if isinstance(value, PropertyRef):
+        value = model.value(value.owner, value.name)
+    if phase is None:
+        target.owner.properties[target.name] = value
+    else:
+        target.owner.staged[target.name][phase.guid] = value
+    return "OK"
+
+
+@_command("set")
+def _set(model, args):
+    if len(args) == 3:
+        target, phase, value = args
+        return _set_property(model, target, value, phase)
+    target, value = args
+    return _set_property(model, target, value)
+
+
+@_command("setproperties")
+def _setproperties(model, args):
+    target, *pairs = args
+    if isinstance(target, PropertyRef):
+        target = model.value(*target)
+    phase = None
+    if pairs and isinstance(pairs[0], PlxObject):
+        phase, *pairs = pairs
+    for name, value in _property_pairs(pairs):
+        _set_property(model, PropertyRef(target, str(name)), value, phase)
+    return "OK"
+
+
+@_command("setmaterial")
+def _setmaterial(model, args):
+    target, material = args
+    target.properties["Material"] = material
+    return "OK"
+
+
+def _set_active(model, args, active):
+    *targets, phase = args
+    for obj in _objects(targets):
+        obj.staged["Active"][phase.guid] = active
+    return "OK"
+
+
+@_command("activate")
+def _activate(model, args):
+    return _set_active(model, args, True)
+
+
+@_command("deactivate")
+def _deactivate(model, args):
+    return _set_active(model, args, False)
+
+
+@_command("getresults")
+def _getresults(model, args):
+    """getresults [obj] phase result_type location, from the results set with MockPlaxisServer.set_results."""
+    args = [model.value(*arg) if isinstance(arg, PropertyRef) else arg for arg in args]
+    *objs, phase, result_type, _ = args
+    if not all(isinstance(arg, PlxObject) for arg in (*objs, phase, result_type)):
+        raise CommandError("getresults needs objects of this project")
+    key = (
+        objs[0].name if objs else None,
+        phase.name,
+        result_type.properties["Identification"],
+    )
+    if key not in model.results:
+        raise CommandError(f"no results of {key}")
+    return Values(model.results[key])
+
+
+class RecordedRequest(NamedTuple):
+    endpoint: str
+    action: dict
+    start: float
+    duration: float
+
+
+class MockPlaxisServer:
+    """A local HTTP server standing in for a Plaxis Input scripting server.
+
+    latency is added to every request, either as a number of seconds or as a function of the endpoint name.
+    calculate takes calculation_time seconds per phase marked with ShouldCalculate, during which the server does not
+    answer, and marks them OK, or Failed for those in failing_phases, and no longer to be calculated. view returns
+    output_port, the port of a server standing in for Output. requests records every request; port 0 picks a
+    free port.
+    """
+
+    def __init__(
+        self,
+        address="localhost",
+        port=0,
+        password="python",
+        latency: float | Callable[[str], float] = 0.0,
+        calculation_time=0.0,
+        failing_phases=(),
+        output_port=None,
+    ):
+        self.password = password
+        self.latency = latency
+        self.calculation_time = calculation_time
+        self.failing_phases = set(failing_phases)
+        self.output_port = output_port
+        self.model = Model()
+        self.filename = None
+        self.requests: list[RecordedRequest] = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((address, port), _handler_class(self))
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._httpd.server_address[0]
+
+    @property
+    def port(self):
+        return self._httpd.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def request_counts(self) -> Counter:
+        """Number of requests made per endpoint."""
+        return Counter(request.endpoint for request in self.requests)
+
+    def command_count(self) -> int:
+        """Number of commands sent, counting each command in a batch."""
+        return sum(
+            len(request.action.get("commands", ()))
+            for request in self.requests
+            if request.endpoint == "commands"
+        )
+
+    def clear_requests(self):
+        self.requests.clear()
+
+    def set_results(self, obj_name, phase_name, result_type, values):
+        """The values getresults returns for an object (None for soil results), a phase and a result type name such
+        as "Plate.N22"."""
+        with self._lock:
+            self.model.results[obj_name, phase_name, result_type] = [
+                float(value) for value in values
+            ]
+
+    def delay(self, endpoint):
+        latency = self.latency(endpoint) if callable(self.latency) else self.latency
+        if latency:
+            time.sleep(latency)
+
+    def handle(self, endpoint, action) -> tuple[int, dict]:
+        handler = getattr(self, f"_handle_{endpoint}", None)
+        if handler is None:
+            return 404, {}
+        with self._lock:
+            try:
+                return 200, handler(action)
+            except OSError:
+                # e.g. opening a project that was never saved
+                return 400, {}
+
+    def _handle_environment(self, action):
+        match action["name"]:
+            case "new" | "close":
+                self.model = Model()
+                self.filename = None
+            case "open" | "recover":
+                with open(action["filename"], "rb") as project_file:
+                    self.model = pickle.load(project_file)
+                self.filename = action["filename"]
+        return {}
+
+    def _save(self, args):
+        if args:
+            self.filename = str(args[0])
+        if self.filename is None:
+            raise CommandError("the project has no file name")
+        with open(self.filename, "wb") as project_file:
+            pickle.dump(self.model, project_file)
+        return "OK"
+
+    def _calculate(self):
+        phases = [
+            phase
+            for phase in self.model.get_list("Phases").items
+            if self.model.value(phase, "ShouldCalculate")
+        ]
+        time.sleep(self.calculation_time * len(phases))
+        for phase in phases:
+            failed = phase.name in self.failing_phases
+            phase.properties["CalculationResult"] = "Failed" if failed else "OK"
+            phase.properties["ShouldCalculate"] = False
+        return "OK"
+
+    def _command_feedback(self, command) -> dict:
+        try:
+            method_name, args = parse_command(command)
+            args = [_resolve_arg(self.model, arg) for arg in args]
+            if method_name == "save":
+                result = self._save(args)
+            elif method_name == "calculate":
+                result = self._calculate()
+            elif method_name == "view":
+                if self.output_port is None:
+                    raise CommandError("no Output server")
+                result = str(self.output_port)
+            elif method_name in _COMMANDS:
+                result = _COMMANDS[method_name](self.model, args)
+            else:
+                result = "OK"
+        except (CommandError, LookupError, TypeError, ValueError, OSError) as err:
+            return dict(
+                success=False,
+                extrainfo=f"{command}: {err}",
+                returnedobjects=[],
+                returnedvalues=[],
+            )
+        if isinstance(result, Values):
+            return dict(
+                success=True,
+                extrainfo="",
+                returnedobjects=[],
+                returnedvalues=list(result),
+            )
+        if isinstance(result, list):
+            names = ", ".join(str(obj.name) for obj in result)
+            return dict(
+                success=True,
+                extrainfo=f"Added {names}",
+                returnedobjects=[obj.describe() for obj in result],
+                returnedvalues=[],
+            )
+        return dict(
+            success=True, extrainfo=result, returnedobjects=[], returnedvalues=[]
+        )
+
+    def _handle_commands(self, action):
+        return dict(
+            commands=[
+                dict(feedback=self._command_feedback(command))
+                for command in action["commands"]
+            ]
+        )
+
+    def _members(self, guid) -> dict:
+        if guid == NULL_GUID:
+            return {}
+        commands = sorted({*_COMMANDS, *_NO_OP_COMMANDS, "save", "calculate", "view"})
+        if guid == "" or guid in self.model.property_refs:
+            return dict(commands=commands, properties={})
+        obj = self.model.objects.get(guid)
+        if obj is None:
+            return {}
+        properties = {}
+        for name, value in obj.properties.items():
+            properties[name] = dict(
+                type=_property_type(value),
+                guid=self.model.property_guid(obj, name),
+                islistable=isinstance(value, PlxList),
+            )
+        return dict(commands=commands, properties=properties)
+
+    def _handle_members(self, action):
+        return dict(queries={guid: self._members(guid) for guid in action["members"]})
+
+    def _handle_namedobjects(self, action):
+        named_objects = {}
+        for name in action["namedobjects"]:
+            obj = self.model.named_object(name)
+            if obj is None:
+                named_objects[name] = dict(
+                    success=False, extrainfo=f"Object {name} not found"
+                )
+            else:
+                named_objects[name] = dict(
+                    success=True, extrainfo="", returnedobject=obj.describe()
+                )
+        return dict(namedobjects=named_objects)
+
+    def _property_values(self, query) -> dict:
+        owner = self.model.objects.get(query["owner"])
+        if owner is None:
+            return {}
+        phase = self.model.objects.get(query.get("phaseguid") or "")
+        name = query["propertyname"]
+        if name not in owner.properties and not (
+            isinstance(owner, PlxList) and name == "Count"
+        ):
+            return {}
+        return dict(
+            properties={name: _value_json(self.model.value(owner, name, phase))}
+        )
+
+    def _handle_propertyvalues(self, action):
+        queries = action["propertyvalues"]
+        if isinstance(queries, dict):
+            return dict(queries={queries["owner"]: self._property_values(queries)})
+        return dict(
+            queries=[
+                {query["owner"]: self._property_values(query)} for query in queries
+            ]
+        )
+
+    def _list_query(self, query) -> dict:
+        plx_list = self.model.objects.get(query["guid"])
+        if plx_list is None and query["guid"] in self.model.property_refs:
+            plx_list = self.model.value(*self.model.property_refs[query["guid"]])
+        method_name = query["method"]
+        response = dict(success=True, methodname=method_name, extrainfo="")
+        if not isinstance(plx_list, PlxList):
+            return dict(response, success=False, extrainfo="Object is not a list")
+        items = self.model.list_items(plx_list)
+        start, stop = query.get("startindex"), query.get("stopindex")
+        match method_name:
+            case "count":
+                response["outputdata"] = len(items)
+            case "sublist":
+                response["outputdata"] = [obj.describe() for obj in items[start:stop]]
+            case "index":
+                response["outputdata"] = items[start].describe()
+            case "membersublist" | "memberindex":
+                response["membernames"] = member_names = query["membernames"]
+                selected = (
+                    items[start:stop]
+                    if method_name == "membersublist"
+                    else [items[start]]
+                )
+                output = {
+                    member: [
+                        _value_json(self.model.value(obj, member)) for obj in selected
+                    ]
+                    for member in member_names
+                }
+                if method_name == "memberindex":
+                    output = {member: values[0] for member, values in output.items()}
+                response["outputdata"] = output
+            case _:
+                return dict(response, success=False, extrainfo="Unknown list method")
+        return response
+
+    def _handle_list(self, action):
+        return dict(
+            listqueries=[self._list_query(query) for query in action["listqueries"]]
+        )
+
+    def _handle_enumeration(self, action):
+        return dict(
+            queries={
+                guid: dict(success=False, extrainfo="No enumerations")
+                for guid in action["enumeration"]
+            }
+        )
+
+    def _handle_selection(self, action):
+        return dict(selection=[])
+
+    def _handle_exceptions(self, action):
+        return dict(exceptions=[""])
+
+    def _handle_tokenizer(self, action):
+        return dict(tokenize=[])
+
+
+def _resolve_arg(model, arg):
+    if isinstance(arg, tuple):
+        return tuple(_resolve_arg(model, item) for item in arg)
+    if isinstance(arg, Ref):
+        return model.resolve(arg)
+    return arg
+
+
+def _property_type(value) -> str:
+    match value:
+        case bool():
+            return "Boolean"
+        case int():
+            return "Integer"
+        case float():
+            return "Number"
+        case str():
+            return "Text"
+        case _:
+            return "Object"
+
+
+def _value_json(value):
+    if isinstance(value, PlxObject):
+        return value.describe()
+    if value is None:
+        return NULL_GUID
+    if isinstance(value, tuple):
+        return [_value_json(item) for item in value]
+    return value
+
+
+def _handler_class(mock_server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # headers and body are written separately; without this every response waits on a delayed ACK
+        disable_nagle_algorithm = True
+
+        def version_string(self):
+            return SERVER_NAME
+
+        def log_message(self, format, *args): ...
+
+        def do_POST(self):
+            start = time.monotonic()
+            endpoint = self.path.strip("/")
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            encryption_handler = encryption.EncryptionHandlerServer(
+                mock_server.password
+            )
+            request = json.loads(body or b"{}")
+            if mock_server.password:
+                ok, _ = encryption_handler.interpret_request(
+                    request.get(encryption.CODE), request.get(encryption.REQUEST_DATA)
+                )
+            else:
+                ok, _ = encryption_handler.interpret_request(None, body.decode())
+            if not ok:
+                self._reply(403, "{}")
+                return
+            action = encryption_handler.data["action"]
+            mock_server.delay(endpoint)
+            status, response = mock_server.handle(endpoint, action)
+            mock_server.requests.append(
+                RecordedRequest(endpoint, action, start, time.monotonic() - start)
+            )
+            self._reply(status, encryption_handler.build_response(response))
+
+        def _reply(self, status, text):
+            data = text.encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--address", default="localhost")
+    parser.add_argument("--port", type=int, default=10000)
+    parser.add_argument("--password", default="python")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds added to every request"
+    )
+    args = parser.parse_args(argv)
+    server = MockPlaxisServer(args.address, args.port, args.password, args.latency)
+    print(f"serving on {server.address}:{server.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""helpers for extracting many Plaxis Output results at once over several Output connections"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, NamedTuple, Sequence
+
+import numpy as np
+from plxscripting.easy import new_server
+from plxscripting.plx_scripting_exceptions import PlxScriptingError
+
+import plxhelper.plaxis_helper as plaxis_helper
+from plxhelper.branch_calculation import ServerAddress
+from plxhelper.exceptions import PlaxisHelperError
+from plxhelper.output_results import output_proxy
+
+# getresults commands sent together in one round-trip
+DEFAULT_CHUNK_SIZE = 8
+# times a failed chunk is tried again, each time on the next free connection
+DEFAULT_RETRIES = 2
+# errors of a chunk that are worth retrying; connection failures are OSErrors
+RETRY_ERRORS = (PlxScriptingError, OSError)
+
+
+class OutputExtractionError(PlaxisHelperError):
+    pass
+
+
+class ResultRequest(NamedTuple):
+    """One getresults call, by name: obj None gets soil results and result_type is e.g. "Plate.N22"."""
+
+    phase: str
+    obj: str | None
+    result_type: str
+
+
+class _Connection:
+    """One Output connection, opened on first use and reopened after a failure."""
+
+    def __init__(self, server_address: ServerAddress):
+        self.server_address = server_address
+        self.s_o = self.g_o = None
+        self._proxies = {}
+
+    def _proxy(self, name):
+        if name is None:
+            return None
+        if name not in self._proxies:
+            self._proxies[name] = output_proxy(self.g_o, name)
+        return self._proxies[name]
+
+    def fetch(self, chunk, location) -> list[np.ndarray]:
+        if self.s_o is None:
+            self.s_o, self.g_o = new_server(
+                self.server_address.address,
+                port=self.server_address.port,
+                password=self.server_address.password,
+            )
+        calls = []
+        for request in chunk:
+            obj = self._proxy(request.obj)
+            calls.append(
+                (
+                    None,
+                    "getresults",
+                    *(() if obj is None else (obj,)),
+                    self._proxy(request.phase),
+                    self._proxy(request.result_type),
+                    location,
+                )
+            )
+        return [
+            np.array(values if isinstance(values, list) else [], dtype=float)
+            for values in plaxis_helper.batch_commands(*calls, server=self.s_o)
+        ]
+
+    def reset(self):
+        self.s_o = self.g_o = None
+        self._proxies.clear()
+
+
+def _fetch_chunk(chunk, connections: queue.Queue, location, retries):
+    for _ in range(retries + 1):
+        connection = connections.get()
+        try:
+            return connection.fetch(chunk, location)
+        except RETRY_ERRORS as err:
+            error = err
+            connection.reset()
+        finally:
+            connections.put(connection)
+    raise OutputExtractionError(
+        f"getresults of {chunk} failed {retries + 1} times"
+    ) from error
+
+
+def extract_results(
+    requests: Iterable[ResultRequest],
+    servers: Sequence[ServerAddress],
+    connections_per_server=1,
+    location="node",
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    retries=DEFAULT_RETRIES,
+) -> list[np.ndarray]:
+    """The results of (phase, obj, result_type) requests, in request order, fetched concurrently.
+
+    The requests are split into chunks of chunk_size, each sent in one round-trip. Chunks are spread over
+    connections_per_server connections to each of the Output servers (Output serves several readers), one thread per
+    connection. A chunk that fails is retried on the next free connection, and OutputExtractionError is raised once it
+    has failed retries + 1 times.
+    """
+    requests = [ResultRequest(*request) for request in requests]
+    chunks = [
+        requests[start : start + chunk_size]
+        for start in range(0, len(requests), chunk_size)
+    ]
+    connections = queue.Queue()
+    for server_address in servers:
+        for _ in range(connections_per_server):
+            connections.put(_Connection(server_address))
+    with ThreadPoolExecutor(max_workers=connections.qsize()) as executor:
+        chunk_results = executor.map(
+            lambda chunk: _fetch_chunk(chunk, connections, location, retries), chunks
+        )
+        return [values for chunk_values in chunk_results for values in chunk_values]
+
+
+def extract_array(requests: Iterable[ResultRequest], *args, **kwargs) -> np.ndarray:
+    """The results of extract_results(requests, ...) as the rows of one array; all results must be equally long."""
+    results = extract_results(requests, *args, **kwargs)
+    if len({len(values) for values in results}) > 1:
+        raise OutputExtractionError("the results are not all equally long")
+    return np.stack(results) if results else np.empty((0, 0))
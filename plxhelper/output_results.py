@@ -0,0 +1,181 @@
+"""helpers for browsing Plaxis Output results lazily, fetching each result once"""
+
+from collections import OrderedDict
+from typing import Mapping, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+import plxhelper.plaxis_helper as plaxis_helper
+
+# size of the cached result arrays above which the least recently used are evicted
+DEFAULT_MAX_BYTES = 256 * 2**20
+# most result types fetched along with a missing one
+DEFAULT_PREFETCH = 8
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    round_trips: int
+    nbytes: int
+
+
+def output_proxy(g_o, name):
+    """The Output proxy of an object or phase name, or of a result type name such as "Plate.N22"."""
+    if "." in name:
+        category, result_type = name.split(".")
+        return getattr(getattr(g_o.ResultTypes, category), result_type)
+    return getattr(g_o, name)
+
+
+def _guid(obj):
+    return obj.get_cmd_line_repr()
+
+
+def _obj_guid(obj):
+    return None if obj is None else _guid(obj)
+
+
+class LazyResults:
+    """The results of a Plaxis Output server, indexed like results[phase, obj, result_type].
+
+    phase, obj and result_type are Output proxies or their names: results["Phase_5", "Plate_2", "Plate.N22"] is
+    g_o.getresults(g_o.Phase_5, g_o.Plate_2, g_o.ResultTypes.Plate.N22, location); obj None gets soil results. Results
+    are fetched on first access and kept as read-only arrays in a least recently used cache of at most max_bytes.
+
+    The result types read for each object are remembered; when a result of that object is missing for another phase,
+    up to prefetch of them are fetched along with it in the same round-trip, since browsing one phase after another
+    tends to repeat the same result types.
+    """
+
+    def __init__(
+        self,
+        s_o,
+        g_o,
+        location="node",
+        max_bytes=DEFAULT_MAX_BYTES,
+        prefetch=DEFAULT_PREFETCH,
+    ):
+        self.s_o = s_o
+        self.g_o = g_o
+        self.location = location
+        self.max_bytes = max_bytes
+        self.prefetch_limit = prefetch
+        # (phase guid, obj guid, result type guid): array
+        self._cache = OrderedDict()
+        self._nbytes = 0
+        # obj guid: the result types read for it, most recent last
+        self._seen_types = {}
+        self._proxies = {}
+        self._hits = self._misses = self._evictions = self._round_trips = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __contains__(self, key) -> bool:
+        return self._key(*self._resolve_key(key)) in self._cache
+
+    def __getitem__(self, key) -> np.ndarray:
+        phase, obj, result_type = self._resolve_key(key)
+        cache_key = self._key(phase, obj, result_type)
+        if (values := self._cache.get(cache_key)) is not None:
+            self._hits += 1
+            self._cache.move_to_end(cache_key)
+            self._remember(obj, result_type)
+            return values
+        self._misses += 1
+        siblings = [
+            sibling
+            for guid, sibling in reversed(
+                self._seen_types.get(_obj_guid(obj), {}).items()
+            )
+            if guid != cache_key[2]
+            and self._key(phase, obj, sibling) not in self._cache
+        ]
+        # fetched last so it is the most recently used
+        self._fetch(phase, obj, [*siblings[: self.prefetch_limit], result_type])
+        self._remember(obj, result_type)
+        return self._cache[cache_key]
+
+    def prefetch(self, phase, obj, result_types):
+        """Fetch the missing results of several result types of one phase and object in a single round-trip."""
+        phase, obj = self._resolve(phase), self._resolve(obj)
+        result_types = [self._resolve(name) for name in result_types]
+        missing = [
+            result_type
+            for result_type in result_types
+            if self._key(phase, obj, result_type) not in self._cache
+        ]
+        if missing:
+            self._fetch(phase, obj, missing)
+        for result_type in result_types:
+            self._remember(obj, result_type)
+
+    def frame(self, phase, obj, columns: Mapping) -> pd.DataFrame:
+        """The results of one phase and object as DataFrame columns, from a {column name: result type} mapping."""
+        self.prefetch(phase, obj, columns.values())
+        return pd.DataFrame(
+            {
+                name: self[phase, obj, result_type]
+                for name, result_type in columns.items()
+            }
+        )
+
+    def clear(self):
+        self._cache.clear()
+        self._nbytes = 0
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(
+            self._hits, self._misses, self._evictions, self._round_trips, self._nbytes
+        )
+
+    def _resolve(self, obj):
+        """The proxy of a name; proxies and None are returned as they are."""
+        if not isinstance(obj, str):
+            return obj
+        if obj not in self._proxies:
+            self._proxies[obj] = output_proxy(self.g_o, obj)
+        return self._proxies[obj]
+
+    def _resolve_key(self, key):
+        phase, obj, result_type = key
+        return self._resolve(phase), self._resolve(obj), self._resolve(result_type)
+
+    @staticmethod
+    def _key(phase, obj, result_type) -> tuple:
+        return _guid(phase), _obj_guid(obj), _guid(result_type)
+
+    def _remember(self, obj, result_type):
+        seen = self._seen_types.setdefault(_obj_guid(obj), {})
+        seen.pop(_guid(result_type), None)
+        seen[_guid(result_type)] = result_type
+
+    def _fetch(self, phase, obj, result_types):
+        target = () if obj is None else (obj,)
+        fetched = plaxis_helper.batch_commands(
+            *(
+                (None, "getresults", *target, phase, result_type, self.location)
+                for result_type in result_types
+            ),
+            server=self.s_o,
+        )
+        self._round_trips += 1
+        for result_type, values in zip(result_types, fetched):
+            # commands returning no values return their feedback text instead
+            values = np.array(values if isinstance(values, list) else [], dtype=float)
+            values.flags.writeable = False
+            self._store(self._key(phase, obj, result_type), values)
+
+    def _store(self, cache_key, values):
+        if (old := self._cache.pop(cache_key, None)) is not None:
+            self._nbytes -= old.nbytes
+        self._cache[cache_key] = values
+        self._nbytes += values.nbytes
+        # the newest result is kept even when it alone is larger than max_bytes
+        while self._nbytes > self.max_bytes and len(self._cache) > 1:
+            _, evicted = self._cache.popitem(last=False)
+            self._nbytes -= evicted.nbytes
+            self._evictions += 1
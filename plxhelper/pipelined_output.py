@@ -0,0 +1,58 @@
+"""helpers for extracting the results of each phase while the later phases of the project are still calculating"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Sequence
+
+from plxscripting.easy import new_server
+
+from plxhelper.async_calculation import connected_server_address, start_calculation
+from plxhelper.branch_calculation import ServerAddress
+from plxhelper.output_results import LazyResults
+
+
+def calculate_pipelined(
+    extract: Callable,
+    sink: Callable = None,
+    phases: Sequence[str] = None,
+    server: ServerAddress = None,
+    progress: Callable = None,
+) -> dict:
+    """Calculate like async_calculation.start_calculation and extract the results of each phase as soon as it is done.
+
+    As each phase is calculated, Output is opened on it (the Input server is idle between phases) and
+    extract(results: LazyResults, phase_name) is run in another thread while the next phase calculates; its return
+    value is passed on to sink(phase_name, extracted) as it comes. Blocks until all phases are calculated and
+    extracted and returns {phase name: extracted} in calculation order. Errors of the calculation or of any
+    extraction are raised once the rest is done.
+    """
+    if server is None:
+        server = connected_server_address()
+    _, g_view = new_server(server.address, port=server.port, password=server.password)
+    # port: Output connection, only used from the extraction thread
+    output_servers = {}
+    extracted = {}
+
+    def extract_phase(phase_name, port):
+        if port not in output_servers:
+            output_servers[port] = new_server(
+                server.address, port=port, password=server.password
+            )
+        s_o, g_o = output_servers[port]
+        extracted[phase_name] = extract(LazyResults(s_o, g_o), phase_name)
+        if sink is not None:
+            sink(phase_name, extracted[phase_name])
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        extractions = []
+
+        def on_phase(phase_name):
+            port = int(g_view.view(getattr(g_view, phase_name)))
+            extractions.append(executor.submit(extract_phase, phase_name, port))
+
+        calculation = start_calculation(phases, server, progress, on_phase)
+        # waits for the calculation, after which no more extractions are submitted
+        calculation.future.exception()
+        for extraction in extractions:
+            extraction.result()
+        final = calculation.result()
+    return {phase_name: extracted[phase_name] for phase_name in final.calculated}
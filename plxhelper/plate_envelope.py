@@ -0,0 +1,171 @@
+"""helpers for enveloping plate thrust and moment results over many phases and runs and checking them against the
+plate material"""
+
+from typing import Mapping, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+import plxhelper.plate as plate
+
+# the columns of the plate results DataFrame of each phase (see single_pipe_reline_task analyze_output)
+RESULT_COLUMNS = ("x", "y", "z", "n", "m")
+# node coordinates equal to this many decimals are the same node
+DECIMALS = 6
+
+
+class PlateSection(NamedTuple):
+    """Plate material properties of the design check, per unit width; see plate.PLATE_DATAFRAME."""
+
+    d: float
+    W11: float
+    YieldStress11: float
+
+
+def plate_section(*plate_type_args) -> PlateSection:
+    """The section of a plate.PLATE_DATAFRAME plate type, e.g. plate_section("GRPLinerPipe", "34mm", "Long")."""
+    row = plate.PLATE_DATAFRAME.loc[plate_type_args]
+    return PlateSection(*(float(row[name]) for name in PlateSection._fields))
+
+
+class PlateResults(NamedTuple):
+    """Plate node results of many cases (e.g. phases, or (run, phase) pairs) as flat arrays, one row per node result."""
+
+    cases: list
+    # index into cases of each row
+    case: np.ndarray
+    xyz: np.ndarray
+    n: np.ndarray
+    m: np.ndarray
+
+    @classmethod
+    def from_frames(cls, frames: Mapping):
+        """Stack the plate results DataFrames (columns x, y, z, n, m) of each case, keyed by case."""
+        cases = list(frames)
+        arrays = [
+            frames[case][list(RESULT_COLUMNS)].to_numpy(dtype=float) for case in cases
+        ]
+        values = np.concatenate(arrays) if arrays else np.empty((0, 5))
+        case = np.repeat(np.arange(len(cases)), [len(array) for array in arrays])
+        return cls(cases, case, values[:, :3], values[:, 3], values[:, 4])
+
+    def __len__(self) -> int:
+        return len(self.case)
+
+
+def stations(results: PlateResults, origin, axis, spacing) -> np.ndarray:
+    """The station of every row: its distance from origin along axis, rounded to the nearest multiple of spacing."""
+    axis = np.asarray(axis, dtype=float)
+    distance = (results.xyz - np.asarray(origin, dtype=float)) @ (
+        axis / np.linalg.norm(axis)
+    )
+    return np.round(distance / spacing) * spacing
+
+
+def _case_sections(sections, cases) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Arrays of d, W11 and YieldStress11 by case index; sections is one PlateSection or a mapping of them by case."""
+    if isinstance(sections, PlateSection):
+        sections = dict.fromkeys(cases, sections)
+    by_case = np.array([sections[case] for case in cases], dtype=float).reshape(-1, 3)
+    return by_case[:, 0], by_case[:, 1], by_case[:, 2]
+
+
+def combined_stress(
+    results: PlateResults, sections
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Extreme fiber stresses N/d + |M|/W11 and N/d - |M|/W11 of every row and their utilization of YieldStress11.
+
+    sections is one PlateSection for all cases or a mapping of PlateSections by case (e.g. short and long term).
+    """
+    d, w11, yield_stress = _case_sections(sections, results.cases)
+    axial = results.n / d[results.case]
+    bending = np.abs(results.m) / w11[results.case]
+    utilization = (np.abs(axial) + bending) / yield_stress[results.case]
+    return axial + bending, axial - bending, utilization
+
+
+class _Groups(NamedTuple):
+    # rows sorted by group, and where each group starts in that order
+    order: np.ndarray
+    starts: np.ndarray
+    sorted_groups: np.ndarray
+
+    @classmethod
+    def of(cls, groups: np.ndarray, count: int):
+        order = np.argsort(groups, kind="stable")
+        sorted_groups = groups[order]
+        starts = np.searchsorted(sorted_groups, np.arange(count))
+        return cls(order, starts, sorted_groups)
+
+    def extreme_rows(self, values: np.ndarray, ufunc) -> tuple[np.ndarray, np.ndarray]:
+        """Greatest (np.maximum) or least (np.minimum) value per group, and the first row having it."""
+        sorted_values = values[self.order]
+        extremes = ufunc.reduceat(sorted_values, self.starts)
+        hits = np.flatnonzero(sorted_values == extremes[self.sorted_groups])
+        first = np.r_[
+            True, self.sorted_groups[hits[1:]] != self.sorted_groups[hits[:-1]]
+        ]
+        return extremes, self.order[hits[first]]
+
+
+def _nodes(xyz: np.ndarray, decimals) -> tuple[np.ndarray, np.ndarray]:
+    """Distinct rounded coordinates, and the node index of every row."""
+    rounded = np.round(xyz, decimals)
+    # each coordinate is numbered on its own and the numbers are combined into one integer per node, which sorts much
+    # faster than the coordinate rows themselves
+    axes = [np.unique(column, return_inverse=True) for column in rounded.T]
+    if np.prod([float(len(distinct)) for distinct, _ in axes]) >= 2**63:
+        return np.unique(rounded, axis=0, return_inverse=True)
+    key = np.zeros(len(rounded), dtype=np.int64)
+    for distinct, inverse in axes:
+        key = key * len(distinct) + inverse
+    _, first, nodes = np.unique(key, return_index=True, return_inverse=True)
+    return rounded[first], nodes
+
+
+def _case_keys(cases) -> np.ndarray:
+    keys = np.empty(len(cases), dtype=object)
+    for idx, case in enumerate(cases):
+        keys[idx] = case
+    return keys
+
+
+def envelope(
+    results: PlateResults, sections, station=None, decimals=DECIMALS
+) -> pd.DataFrame:
+    """Greatest and least thrust, moment and combined stress over all cases, with the case governing each.
+
+    Without station, there is one row per node (nodes are matched by their coordinates rounded to decimals). With
+    an array giving the station of every row (see stations()), there is one row per station. utilization is the
+    greatest combined stress utilization and exceeds flags utilizations over 1.
+    """
+    if station is None:
+        keys, groups = _nodes(results.xyz, decimals)
+        envelope_df = pd.DataFrame(keys, columns=["x", "y", "z"])
+        envelope_df.index.name = "node"
+    else:
+        keys, groups = np.unique(np.asarray(station), return_inverse=True)
+        envelope_df = pd.DataFrame(index=pd.Index(keys, name="station"))
+    grouped = _Groups.of(groups.ravel(), len(keys))
+    case_keys = _case_keys(results.cases)
+    stress_max, stress_min, utilization = combined_stress(results, sections)
+
+    for name, values in (
+        ("n", results.n),
+        ("m", results.m),
+        ("stress", (stress_max, stress_min)),
+    ):
+        greatest, least = values if isinstance(values, tuple) else (values, values)
+        for suffix, ufunc, column in (
+            ("max", np.maximum, greatest),
+            ("min", np.minimum, least),
+        ):
+            extremes, rows = grouped.extreme_rows(column, ufunc)
+            envelope_df[f"{name}_{suffix}"] = extremes
+            envelope_df[f"{name}_{suffix}_case"] = case_keys[results.case[rows]]
+
+    extremes, rows = grouped.extreme_rows(utilization, np.maximum)
+    envelope_df["utilization"] = extremes
+    envelope_df["utilization_case"] = case_keys[results.case[rows]]
+    envelope_df["exceeds"] = extremes > 1
+    return envelope_df
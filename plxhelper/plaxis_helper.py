@@ -1,7 +1,8 @@
 """helpers for creating Plaxis 3D projects"""
 from contextlib import contextmanager
+from functools import lru_cache
 from math import radians, cos
-from typing import TypedDict, Required, NotRequired, Sequence
+from typing import TypedDict, Required, NotRequired, Sequence, Iterable
 import numpy as np
 
 from plxscripting.easy import new_server
@@ -16,12 +17,53 @@ from plxhelper.geo import (
     Vector_co,
     Point, Point_co,
 )
-from plxhelper.plaxis_protocol import floatify, FloatifyError
+from plxhelper.plaxis_protocol import floatify, floatify_many, FloatifyError
+from plxhelper.fingerprint import fingerprint
 
 
-def connect_server():
+def connect_server(address="localhost", port=10000, password="python"):
     global s_i, g_i
-    s_i, g_i = new_server(address="localhost", port=10000, password="python")
+    s_i, g_i = new_server(address=address, port=port, password=password)
+
+
+class PlxRef(str):
+    """A Plaxis command line reference (e.g. "Soil_1.WaterConditions.Conditions") used in place of a proxy object.
+
+    Passed to Plaxis unquoted, so no round-trip is needed to look the object up first."""
+
+    def get_cmd_line_repr(self):
+        return str(self)
+
+
+# most commands sent to Plaxis in one request by batch_commands
+BATCH_SIZE = 1000
+
+
+def batch_commands(*calls, server=None):
+    """Send several Plaxis commands to the server in a single round-trip (one per BATCH_SIZE commands).
+
+    Each call is a (target, method_name, *params) tuple. A target of None calls the method on g_i. The server
+    defaults to s_i. Returns the result of each command."""
+    if server is None:
+        server = s_i
+    commands = [
+        server.input_proc.create_method_call_cmd(target, method_name, params)
+        for target, method_name, *params in calls
+    ]
+    results = []
+    for start in range(0, len(commands), BATCH_SIZE):
+        results.extend(
+            server.call_and_handle_commands(*commands[start : start + BATCH_SIZE])
+        )
+    return results
+
+
+def plx_names(objs) -> list[str]:
+    """Names of Plaxis objects, read in one round-trip. Strings are assumed to be names already."""
+    objs = list(objs)
+    proxies = [obj for obj in objs if not isinstance(obj, str)]
+    names = iter(s_i.get_objects_property(proxies, "Name") if proxies else ())
+    return [obj if isinstance(obj, str) else str(next(names)) for obj in objs]
 
 
 def add_soil_layer_materials(soil_materials_list):
@@ -33,6 +75,25 @@ def add_soil_layer_materials(soil_materials_list):
         layer.Soil.Material = soil_material_obj
 
 
+def borehole_layer_boundaries(boreholes_dict) -> np.ndarray:
+    """Elevations of the layer boundaries of every borehole, from the top of the first layer down.
+
+    Returns an array of shape (number of boreholes, number of layers + 1). Layers are given as thicknesses and
+    boreholes with fewer layers get zero thickness layers at the bottom. The top defaults to elevation 0."""
+    n_layers = max(
+        (len(info["layers"]) for info in boreholes_dict.values()), default=0
+    )
+    thicknesses = np.zeros((len(boreholes_dict), n_layers))
+    tops = np.zeros(len(boreholes_dict))
+    for borehole_idx, borehole_info_dict in enumerate(boreholes_dict.values()):
+        layers = borehole_info_dict["layers"]
+        thicknesses[borehole_idx, : len(layers)] = layers
+        tops[borehole_idx] = borehole_info_dict.get("top_el") or 0
+    return tops[:, np.newaxis] - np.concatenate(
+        (np.zeros((len(tops), 1)), np.cumsum(thicknesses, axis=1)), axis=1
+    )
+
+
 def process_boreholes(boreholes_dict, layer_soilmat_obj_list):
     """The BoreholesDict is of the form:
 
@@ -41,28 +102,53 @@ def process_boreholes(boreholes_dict, layer_soilmat_obj_list):
     ...where BoreholeInfoDict is of the form:
 
     class BoreholeInfoDict(TypedDict)
-        layers: Required[list[depth_i]]
+        layers: Required[list[thickness_i]]
         top_el: NotRequired[float]
-        water_table_el: NotRequired[float]"""
-
-    # only add the soil materials ONCE
-    iter_soil_layer_materials_list = iter(layer_soilmat_obj_list)
-
-    for borehole_idx, (coords, borehole_info_dict) in enumerate(boreholes_dict.items()):
-        borehole_g = g_i.borehole(*coords)
-        for layer_th in borehole_info_dict["layers"]:
-            g_i.soillayer(borehole_g, layer_th)
-        # materials are only iterated over once here
-        add_soil_layer_materials(iter_soil_layer_materials_list)
-        borehole_g.Head = borehole_info_dict.get("water_table_el", 0)
-        if top_el := borehole_info_dict.get("top_el"):
-            for bv_layer_zone_obj in (
-                getattr(g_i, f"BVLayerZone_{n + 1}")
-                for n in range(len(layer_soilmat_obj_list))
-            ):
-                bv_layer_zone_obj.Top = top_el
-                for layer_th in borehole_info_dict["layers"]:
-                    bv_layer_zone_obj.Bottom = top_el - layer_th
+        water_table_el: NotRequired[float]
+
+    Layer boundaries are computed locally and boreholes, layers and zone elevations are sent in batches, so the
+    number of round-trips grows with the number of layers only."""
+
+    boundaries = borehole_layer_boundaries(boreholes_dict)
+    n_layers = boundaries.shape[1] - 1
+    boreholes = batch_commands(
+        *((None, "borehole", *coords) for coords in boreholes_dict)
+    )
+    batch_commands(*((None, "soillayer", 0) for _ in range(n_layers)))
+    soil_layers = list(g_i.Soillayers)[-n_layers:] if n_layers else []
+    # zones of each layer are listed in borehole order
+    zone_names = [plx_names(soil_layer.Zones) for soil_layer in soil_layers]
+
+    calls = [
+        (PlxRef(f"{soil_layer_name}.Soil.Material"), "set", soil_material_obj)
+        for soil_layer_name, soil_material_obj in zip(
+            plx_names(soil_layers), layer_soilmat_obj_list
+        )
+    ]
+    for borehole_name, borehole_info_dict in zip(
+        plx_names(boreholes), boreholes_dict.values()
+    ):
+        calls.append(
+            (
+                PlxRef(f"{borehole_name}.Head"),
+                "set",
+                borehole_info_dict.get("water_table_el", 0),
+            )
+        )
+    for borehole_idx, borehole_boundaries in enumerate(boundaries):
+        for layer_idx in range(n_layers):
+            zone_name = zone_names[layer_idx][borehole_idx]
+            calls.append(
+                (PlxRef(f"{zone_name}.Top"), "set", borehole_boundaries[layer_idx])
+            )
+            calls.append(
+                (
+                    PlxRef(f"{zone_name}.Bottom"),
+                    "set",
+                    borehole_boundaries[layer_idx + 1],
+                )
+            )
+    batch_commands(*calls)
 
 
 def add_box(
@@ -227,6 +313,78 @@ def add_select_backfill(
     return add_box(x, y, zi, width, height, axis1, axis2)
 
 
+class PhaseState(TypedDict, total=False):
+    """Declarative state of a phase, optionally returned by a phase function.
+
+    Objects may be Plaxis objects or their names. Anything not declared is inherited from the parent phase."""
+
+    active: Iterable
+    inactive: Iterable
+    materials: dict  # object -> material
+    water_conditions: dict  # soil -> water condition, e.g. "dry"
+
+
+_PHASE_STATE_KEYS = ("active", "materials", "water_conditions")
+
+
+def _resolve_phase_state(declared_state: PhaseState) -> dict:
+    """Key the declared state by object name."""
+    active = dict.fromkeys(plx_names(declared_state.get("active", ())), True)
+    active.update(dict.fromkeys(plx_names(declared_state.get("inactive", ())), False))
+    resolved = dict(active=active)
+    materials = declared_state.get("materials", {})
+    resolved["materials"] = dict(
+        zip(plx_names(materials), map(PlxRef, plx_names(materials.values())))
+    )
+    water_conditions = declared_state.get("water_conditions", {})
+    resolved["water_conditions"] = dict(
+        zip(plx_names(water_conditions), water_conditions.values())
+    )
+    return resolved
+
+
+def _merge_phase_state(parent_state: dict, resolved_state: dict) -> dict:
+    return {key: {**parent_state[key], **resolved_state[key]} for key in _PHASE_STATE_KEYS}
+
+
+def _phase_state_delta(parent_state: dict, state: dict) -> dict:
+    """The part of state that differs from parent_state."""
+    return {
+        key: {
+            name: value
+            for name, value in state[key].items()
+            if parent_state[key].get(name) != value
+        }
+        for key in _PHASE_STATE_KEYS
+    }
+
+
+def _phase_state_removed(previous_state: dict, state: dict) -> bool:
+    """Whether anything in previous_state is missing from state, so that state cannot be reached by a delta."""
+    return any(
+        name not in state[key]
+        for key in _PHASE_STATE_KEYS
+        for name in previous_state[key]
+    )
+
+
+def _apply_phase_state_delta(delta: dict, phase_obj):
+    """Apply a phase state delta with one command per (de)activated group, all in a single round-trip."""
+    calls = []
+    for is_active, method_name in ((True, "activate"), (False, "deactivate")):
+        if names := [name for name, active in delta["active"].items() if active is is_active]:
+            calls.append((None, method_name, [PlxRef(name) for name in names], phase_obj))
+    calls.extend(
+        (PlxRef(f"{name}.Material"), "set", phase_obj, material)
+        for name, material in delta["materials"].items()
+    )
+    calls.extend(
+        (PlxRef(f"{name}.WaterConditions.Conditions"), "set", phase_obj, condition)
+        for name, condition in delta["water_conditions"].items()
+    )
+    batch_commands(*calls)
+
+
 class phase:
     """Phase function decorator that returns tree node leading to subsequent phase nodes.
 
@@ -237,10 +395,13 @@ class phase:
         '''Initial Phase'''
         ...
 
-    @phase(phase_1)
+    @phase(phase_0)
     def phase_1(phase_obj):
         '''Phase 1'''
-        ...
+        return PhaseState(active=[...], water_conditions={...})
+
+    A phase function may set up the phase itself, or return a PhaseState. A returned state is compared with the
+    state inherited from the parent phase and only the difference is sent to Plaxis.
     """
 
     def __init__(self, parentphase=None):
@@ -260,18 +421,147 @@ class phase:
         self.func = func
         return self
 
-    def process_phase_tree(self):
+    def trunk(self) -> list:
+        """The nodes from self down to the first node that does not have exactly one child."""
+        nodes = [self]
+        while len(nodes[-1].children) == 1:
+            nodes.append(nodes[-1].children[0])
+        return nodes
+
+    @property
+    def name(self) -> str:
+        return self.func.__name__
+
+    @property
+    def parent_name(self) -> str | None:
+        return None if self.parentphase is None else self.parentphase.name
+
+    def process_phase_tree(self, previous=None):
+        """Add the phase tree to Plaxis.
+
+        If previous is the root of a tree processed earlier in the same project, its Plaxis phases are reused by
+        phase function name. Only phases whose definition changed are set up again, and declarations removed since
+        are reverted to the parent phase state. A phase is added anew, along with its child phases, when its parent
+        phase changed or when a removed declaration is not in the parent phase state (so there is nothing to revert
+        it to). Phases that no longer exist are deleted first.
+        """
         if self.parentphase is not None:
             raise phase.PhaseException("Can only process starting with initial phase.")
+        previous_nodes = (
+            {} if previous is None else {p.name: p for p in previous.traverse()}
+        )
+        parent_names = {p.name: p.parent_name for p in self.traverse()}
+        # previous phases that cannot be reused: gone, moved under another parent, or below one of those
+        dropped = set()
+        for p in previous_nodes.values():
+            if p.parentphase is not None and (
+                parent_names.get(p.name) != p.parent_name or p.parent_name in dropped
+            ):
+                dropped.add(p.name)
+        # deleting a phase deletes its child phases too
+        if dropped_phase_objs := [
+            previous_nodes[name].phase_obj
+            for name in dropped
+            if previous_nodes[name].parent_name not in dropped
+        ]:
+            g_i.delete(dropped_phase_objs)
+        # phases added anew, whose previous child phases were deleted with them
+        renewed = set(dropped)
         for p in self.traverse():
+            if p.parentphase is None:
+                # the initial phase is always the first Plaxis phase
+                previous_node = previous
+            elif p.name in renewed or p.parent_name in renewed:
+                renewed.add(p.name)
+                previous_node = None
+            else:
+                previous_node = previous_nodes.get(p.name)
             # add phase to plaxis
-            p.phase_obj = (
-                g_i.Phases[0]
+            if previous_node is not None:
+                p.phase_obj = previous_node.phase_obj
+            elif p.parentphase is None:
+                p.phase_obj = g_i.Phases[0]
+            else:
+                p.phase_obj = g_i.phase(p.parentphase.phase_obj)
+            # run phase setup
+            declared_state = p.func(p.phase_obj)
+            parent_state = (
+                dict.fromkeys(_PHASE_STATE_KEYS, {})
                 if p.parentphase is None
-                else g_i.phase(p.parentphase.phase_obj)
+                else p.parentphase.state
             )
-            # run phase setup
+            resolved_state = (
+                None if declared_state is None else _resolve_phase_state(declared_state)
+            )
+            p.state = (
+                parent_state
+                if resolved_state is None
+                else _merge_phase_state(parent_state, resolved_state)
+            )
+            p.definition_hash = fingerprint(
+                None if p.parentphase is None else p.parentphase.definition_hash,
+                p.func.__code__,
+                resolved_state,
+            )
+            if resolved_state is None:
+                continue
+            if previous_node is None:
+                _apply_phase_state_delta(
+                    _phase_state_delta(parent_state, p.state), p.phase_obj
+                )
+                continue
+            if previous_node.definition_hash == p.definition_hash:
+                continue
+            if not _phase_state_removed(previous_node.state, p.state):
+                _apply_phase_state_delta(
+                    _phase_state_delta(previous_node.state, p.state), p.phase_obj
+                )
+                continue
+            if p.parentphase is None:
+                raise phase.PhaseException(
+                    "Cannot revert declarations removed from the initial phase."
+                )
+            # start over from the parent phase; the previous child phases go with the deleted phase
+            g_i.delete([p.phase_obj])
+            renewed.add(p.name)
+            p.phase_obj = g_i.phase(p.parentphase.phase_obj)
             p.func(p.phase_obj)
+            _apply_phase_state_delta(
+                _phase_state_delta(parent_state, p.state), p.phase_obj
+            )
+        for p, phase_name in zip(
+            nodes := list(self.traverse()), plx_names(p.phase_obj for p in nodes)
+        ):
+            p.phase_name = phase_name
+
+    def mark_changed_phases(self, calculated=None) -> list:
+        """Mark for calculation only the phases whose definition changed since the tree calculated was processed.
+
+        A phase's definition hash includes its ancestors, so descendants of a changed phase are marked too. Results of
+        unmarked phases are kept by Plaxis. Returns the marked phase nodes.
+        """
+        calculated_hashes = (
+            {}
+            if calculated is None
+            else {p.name: p.definition_hash for p in calculated.traverse()}
+        )
+        marked = [
+            p
+            for p in self.traverse()
+            if calculated_hashes.get(p.name) != p.definition_hash
+        ]
+        self.mark_phases(marked)
+        return marked
+
+    def mark_phases(self, marked, server=None):
+        """Set ShouldCalculate on every phase of the tree: True for the marked phase nodes, False for the others."""
+        batch_commands(
+            *(
+                (PlxRef(f"{p.phase_name}.ShouldCalculate"), "set", p in marked)
+                for p in self.traverse()
+            ),
+            server=server,
+        )
 
     class PhaseException(Exception):
         ...
@@ -283,6 +573,7 @@ def _g_i_method(method_name):
     def wrapped(*args, **kwargs):
         return getattr(g_i, method_name)(*args, **kwargs)
 
+    wrapped.__name__ = method_name
     return wrapped
 
 
@@ -303,13 +594,32 @@ def material_creator(type_name, *args, **kwargs):
     """
 
     def create_material():
-        xxxmat, get_xxxmat_kwargs = MATERIAL_TYPE_DICT[type_name]
-        soilmat_kwargs = get_xxxmat_kwargs(*args, **kwargs)
+        xxxmat, _ = MATERIAL_TYPE_DICT[type_name]
+        soilmat_kwargs = material_kwargs(type_name, *args, **kwargs)
         return xxxmat(*soilmat_kwargs.items())
 
     return create_material
 
 
+def material_kwargs(type_name, *args, **kwargs) -> dict:
+    """The Plaxis material properties a material_creator(type_name, *args, **kwargs) material is created with.
+
+    The catalog lookups are memoized per distinct (hashable) arguments; a fresh dict is returned each time."""
+    try:
+        return dict(_memoized_material_kwargs(type_name, args, tuple(kwargs.items())))
+    except TypeError:
+        # unhashable arguments are looked up every time
+        return _material_kwargs(type_name, args, tuple(kwargs.items()))
+
+
+def _material_kwargs(type_name, args, kwargs_items) -> dict:
+    _, get_xxxmat_kwargs = MATERIAL_TYPE_DICT[type_name]
+    return get_xxxmat_kwargs(*args, **dict(kwargs_items))
+
+
+_memoized_material_kwargs = lru_cache(maxsize=None)(_material_kwargs)
+
+
 def skew_extrude(cross_section_obj, skew, lengths=None, xyz_vectors=None):
     """The cross_section_obj needs to be carefully supplied because this function assumes it is oriented in a
     "positive" direction, and is a "regular", symmetrical type of object - no weird shapes.
@@ -322,13 +632,15 @@ def skew_extrude(cross_section_obj, skew, lengths=None, xyz_vectors=None):
     """
 
 
-def extrude(to_extrude, length=None, vector: Vector_co = None):
+def extrude(to_extrude, length=None, vector: Vector_co = None, index=None):
     """Plaxis-extrude valid Plaxis objects (individual or lists/groups).
 
     Supply either:
     1) a vector direction and extrude length
     2) just a vector representing the direction and length
     3) just a length and derive the direction from the Plaxis objects (not yet supported)
+
+    The extruded objects are added to the spatial_index.SpatialIndex index, if supplied.
     """
 
     xyz_vector = Vector(*vector)
@@ -344,13 +656,19 @@ def extrude(to_extrude, length=None, vector: Vector_co = None):
     )
     g_i.ungroup(grp)
     # exclude non-Geometry entities (e.g., Soil)
-    return [obj for obj in extruded_obj if obj in g_i.Geometry]
+    extruded_geometry = [obj for obj in extruded_obj if obj in g_i.Geometry]
+    if index is not None:
+        index.add(extruded_geometry)
+    return extruded_geometry
 
 
-def cut(to_cut_obj, cutter_obj) -> list:
+def cut(to_cut_obj, cutter_obj, index=None) -> list:
     """Used to "cut" an object or group of objects using a "cutter" object.
 
     Returns just the pieces of to_cut_obj.
+
+    With a spatial_index.SpatialIndex, objects whose bounding boxes miss the cutter's are returned as they are instead
+    of being intersected remotely, and the index is updated with the pieces.
     """
     if cutter_obj not in g_i.Surfaces:
         raise TypeError("cutter_obj must be a Polygon or Surface")
@@ -358,8 +676,19 @@ def cut(to_cut_obj, cutter_obj) -> list:
     cut_list = []
     # use group() to handle the case of 1 or multiple objects
     group_to_cut = g_i.group(to_cut_obj)
+    objs_to_cut = list(group_to_cut)
+    missed = set()
+    if index is not None:
+        # the cutter is read again, as it may have been moved or rotated since it was indexed
+        index.add([cutter_obj, *(obj for obj in objs_to_cut if obj not in index)])
+        missed = set(objs_to_cut).difference(
+            index.intersecting_box(index.box(cutter_obj))
+        )
     # intersect with cutter_obj one item at a time (in case any items overlap)
-    for obj in group_to_cut:
+    for obj in objs_to_cut:
+        if obj in missed:
+            cut_list.append(obj)
+            continue
         intersect_result = g_i.intersect(obj, cutter_obj, True)
         cut_list.extend(intersect_result)
     # remove the group(); no longer needed
@@ -370,7 +699,7 @@ def cut(to_cut_obj, cutter_obj) -> list:
     # remove these undesired pieces:
     for intersect_result in cut_geometries[:]:
         # assume all undesired pieces are in Surfaces
-        if intersect_result in g_i.Surfaces:
+        if intersect_result not in missed and intersect_result in g_i.Surfaces:
             # intersect the piece with cutter_obj
             sub_intersect_result = g_i.group(
                 g_i.intersect(intersect_result, cutter_obj, True)
@@ -399,6 +728,8 @@ def cut(to_cut_obj, cutter_obj) -> list:
                 g_i.delete(intersect_result)
                 cut_geometries.remove(intersect_result)
                 g_i.delete(sub_intersect_result)
+    if index is not None:
+        index.add(obj for obj in cut_geometries if obj not in index)
     return cut_geometries
 
 
@@ -415,6 +746,21 @@ def point(obj):
     return Point(*(floatify(v) for v in (obj.x, obj.y, obj.z)))
 
 
+def bounding_boxes(objs) -> list[BoundingBox]:
+    """BoundingBoxes of several Plaxis objects, read with one round-trip per coordinate instead of per object."""
+    if not (objs := list(objs)):
+        return []
+    plx_bounding_boxes = s_i.get_objects_property(objs, "BoundingBox")
+    coords = [
+        floatify_many(s_i.get_objects_property(plx_bounding_boxes, attr)).tolist()
+        for attr in ("xMin", "yMin", "zMin", "xMax", "yMax", "zMax")
+    ]
+    return [
+        BoundingBox(Point(*box_coords[:3]), Point(*box_coords[3:]))
+        for box_coords in zip(*coords)
+    ]
+
+
 def rotate(obj, rot_point: Point_co, rx: float=0, ry: float=0, rz: float=0):
     g_i.rotate(obj, rot_point, rx, ry, rz)
     return obj
@@ -462,11 +808,13 @@ def skew_cut(
     cutter_obj,
     skew_deg: float,
     xy_direction: tuple[float, float],
+    index=None,
 ) -> list:
     """Used to "skew cut" an object or group of objects using a "cutter" object. The cutter is assumed to be a plane
     whose altitude is the z-axis.
 
-    The pieces "forward" of the cutter are deleted.
+    The pieces "forward" of the cutter are deleted. A spatial_index.SpatialIndex is passed on to cut() and kept up to
+    date.
     """
     if abs(skew_deg) >= 180:
         raise ValueError("Skew cutting is limited to 180 degrees")
@@ -474,7 +822,7 @@ def skew_cut(
     rotated_cutter = rotate(
         cutter_obj, (*cog_xy_cutter, 0), rz=skew_deg
     )
-    cut_results = cut(to_cut_obj, rotated_cutter)
+    cut_results = cut(to_cut_obj, rotated_cutter, index)
     # eliminate objects "forward" of cutter in xy_direction
     if len(cut_results) % 2 != 0:
         raise ValueError(
@@ -499,6 +847,8 @@ def skew_cut(
         if len(keep) == 1 and len(discard) == 1:
             keeps.append(keep[0])
             g_i.delete(discard[0])
+            if index is not None:
+                index.remove(discard)
         else:
             raise ValueError("the front piece to be removed could not be determined")
     fronts_grp = g_i.group(keeps)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import NewType, Protocol
+from typing import Iterable, NewType, Protocol
+
+import numpy as np
 
 PlxNumber = NewType("PlxFloat", str)
 
@@ -28,11 +30,51 @@ PlxProtocol = PlxObj | PlxListable
 
 
 class FloatifyError(ValueError):
-    pass
+    def __init__(self, *args, positions: Iterable[int] = ()):
+        super().__init__(*args)
+        # positions of the values floatify_many could not convert
+        self.positions = tuple(positions)
+
+
+# types numpy converts to floats that floatify rejects
+_NOT_NUMBERS = frozenset((bool, np.bool_, type(None)))
 
 
 def floatify(value) -> float:
+    # fast path for values that are already numbers (bool is excluded, as str(True) is not a number)
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
     try:
         return float(str(value))
     except Exception as exc:
         raise FloatifyError() from exc
+
+
+def floatify_many(values) -> np.ndarray:
+    """Convert a sequence of Plaxis numbers (proxies, strings or numbers) to a float array in one pass.
+
+    Raises FloatifyError listing the positions of all values that are not numbers."""
+    if not isinstance(values, np.ndarray):
+        values = list(values)
+    elif values.dtype.kind in "fiu":
+        return values.astype(float)
+    # numpy converts bools to numbers and None to nan, floatify does not
+    if _NOT_NUMBERS.isdisjoint(map(type, values)):
+        try:
+            return np.array(values, dtype=float)
+        except (TypeError, ValueError):
+            pass
+    result = np.empty(len(values))
+    positions = []
+    for idx, value in enumerate(values):
+        try:
+            result[idx] = floatify(value)
+        except FloatifyError:
+            positions.append(idx)
+    if positions:
+        raise FloatifyError(
+            f"values at positions {positions} are not numbers", positions=positions
+        )
+    return result
@@ -0,0 +1,57 @@
+"""helpers for saving partly built Plaxis projects as templates that later runs start from"""
+
+import os
+import pathlib
+import pickle
+import shutil
+import uuid
+
+import plxhelper.plaxis_helper as plaxis_helper
+
+PROJECT_FILE_NAME = "template.p3d"
+STATE_FILE_NAME = "state.pkl"
+
+
+class ProjectTemplates:
+    """A directory of saved template projects keyed by a fingerprint of the inputs that built them.
+
+    Each template is saved together with a picklable state (e.g. the names of objects the rest of a chain refers
+    to). Templates are saved into a private temporary directory and renamed into place, so workers sharing the
+    directory never open a partly saved template.
+    """
+
+    def __init__(self, directory):
+        self.directory = pathlib.Path(directory)
+        (self.directory / "tmp").mkdir(parents=True, exist_ok=True)
+
+    def template_path(self, template_fingerprint) -> pathlib.Path:
+        return self.directory / template_fingerprint
+
+    def __contains__(self, template_fingerprint) -> bool:
+        return self.template_path(template_fingerprint).exists()
+
+    def save(self, template_fingerprint, state, working_path):
+        """Save the connected project as a template; the project then continues as working_path."""
+        tmp_path = self.directory / "tmp" / f"{template_fingerprint}-{uuid.uuid4().hex}"
+        tmp_path.mkdir()
+        try:
+            plaxis_helper.g_i.save(str(tmp_path / PROJECT_FILE_NAME))
+            with open(tmp_path / STATE_FILE_NAME, "wb") as state_file:
+                pickle.dump(state, state_file)
+            plaxis_helper.g_i.save(str(working_path))
+            try:
+                os.rename(tmp_path, self.template_path(template_fingerprint))
+            except OSError:
+                # another worker saved the same template first
+                if template_fingerprint not in self:
+                    raise
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    def open(self, template_fingerprint, working_path):
+        """Open a template as working_path, so the template itself is never modified. Returns its saved state."""
+        template_path = self.template_path(template_fingerprint)
+        plaxis_helper.s_i.open(str(template_path / PROJECT_FILE_NAME))
+        plaxis_helper.g_i.save(str(working_path))
+        with open(template_path / STATE_FILE_NAME, "rb") as state_file:
+            return pickle.load(state_file)
@@ -0,0 +1,102 @@
+"""helpers for caching the saved project and results of a run, keyed by a fingerprint of its inputs"""
+
+import contextlib
+import os
+import pathlib
+import shutil
+import time
+import uuid
+from typing import Callable
+
+import pandas as pd
+
+import plxhelper
+from plxhelper.fingerprint import fingerprint
+
+RESULTS_FILE_NAME = "results.pkl"
+PROJECT_FILE_NAME = "project.p3d"
+
+
+class RunCacheTimeout(TimeoutError):
+    pass
+
+
+class RunCache:
+    """A content-addressed directory of runs that many workers can share.
+
+    An entry is assembled in a private temporary directory and then renamed into place, which is atomic, so other
+    workers only ever see complete entries. If two workers finish the same run, the first rename wins and the other
+    copy is discarded.
+    """
+
+    def __init__(self, directory, lock_timeout: float = 6 * 60 * 60):
+        self.directory = pathlib.Path(directory)
+        self.lock_timeout = lock_timeout
+        (self.directory / "tmp").mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(**chain_inputs) -> str:
+        return fingerprint("run", plxhelper.__version__, chain_inputs)
+
+    def entry_path(self, key) -> pathlib.Path:
+        return self.directory / key[:2] / key
+
+    def project_path(self, key) -> pathlib.Path:
+        return self.entry_path(key) / PROJECT_FILE_NAME
+
+    def __contains__(self, key) -> bool:
+        return self.entry_path(key).exists()
+
+    def get(self, key) -> pd.DataFrame | None:
+        try:
+            return pd.read_pickle(self.entry_path(key) / RESULTS_FILE_NAME)
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, results: pd.DataFrame, save_project: Callable = None) -> bool:
+        """Store the results of a run; save_project(path) saves the Plaxis project into the entry.
+
+        Returns False if another worker stored the same run first."""
+        tmp_path = self.directory / "tmp" / f"{key}-{uuid.uuid4().hex}"
+        tmp_path.mkdir()
+        try:
+            if save_project is not None:
+                save_project(tmp_path / PROJECT_FILE_NAME)
+            results.to_pickle(tmp_path / RESULTS_FILE_NAME)
+            self.entry_path(key).parent.mkdir(exist_ok=True)
+            try:
+                os.rename(tmp_path, self.entry_path(key))
+            except OSError:
+                if key not in self:
+                    raise
+                return False
+            return True
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    @contextlib.contextmanager
+    def claim(self, key, poll_interval: float = 5.0):
+        """Hold the lock for computing a run, so identical runs submitted at the same time are computed once.
+
+        Waits while another worker holds the lock; the caller should check the cache again once the lock is held.
+        A lock older than lock_timeout is assumed to belong to a dead worker and is taken over.
+        """
+        lock_path = self.directory / "tmp" / f"{key}.lock"
+        start = time.monotonic()
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                with contextlib.suppress(FileNotFoundError):
+                    if time.time() - lock_path.stat().st_mtime > self.lock_timeout:
+                        lock_path.unlink()
+                        continue
+                if time.monotonic() - start > self.lock_timeout:
+                    raise RunCacheTimeout(f"run {key} is still locked")
+                time.sleep(poll_interval)
+        try:
+            yield
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                lock_path.unlink()
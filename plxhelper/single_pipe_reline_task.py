@@ -1,24 +1,130 @@
 """standard routine for create a single pipe reline project"""
 
+import functools
+import inspect
+import pathlib
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Sequence
+
+import numpy as np
 import pandas as pd
 from plxhelper.plaxis_helper import (
     connect_server,
     add_pipe_structure,
     process_boreholes,
     phase,
+    PhaseState,
+    plx_names,
     new_server,
-    material_creator,
+    material_kwargs,
+    batch_commands,
+    PlxRef,
 )
+import plxhelper.mesh_cache as mesh_cache_module
+from plxhelper.branch_calculation import calculate_branches, ServerAddress
+from plxhelper.core_scheduler import CoreScheduler
+from plxhelper.cost_model import CostModel, TimingHistory
 from plxhelper.exceptions import PlaxisHelperError
+from plxhelper.fingerprint import fingerprint
+from plxhelper.instance_manager import InstanceManager
+from plxhelper.material_registry import MaterialRegistry, material_key
+from plxhelper.mesh_topology import MeshTopologyCache
+from plxhelper.output_results import LazyResults
+from plxhelper.pipelined_output import calculate_pipelined
+from plxhelper.run_cache import RunCache
+from plxhelper.stations import outline_points
 import plxhelper.live_load as live_load
 from plxhelper.task_chain import TaskChain
 from types import SimpleNamespace
 
+from plxscripting.plxproxy import PlxProxyObject
+
 
 class SinglePipeRelineError(PlaxisHelperError):
     ...
 
 
+# the task_chain inputs each link adds to the project, in link order
+_LINK_INPUTS = dict(
+    new_project=("xmin", "ymin", "xmax", "ymax"),
+    soil_materials_setup=(
+        "boreholes_dict",
+        "soil_layer_materials_list",
+        "annular_fill_type",
+    ),
+    live_load_setup=("grade_el", "xyz_live_load", "lane_load"),
+    host_pipe_setup=("h_cover_in", "h_parent", "h_AVG_in", "parent_shape_info_dict"),
+    reline_pipe_setup=(
+        "reline_shape_info_dict",
+        "short_term_reline_type",
+        "long_term_reline_type",
+    ),
+)
+# the task_chain inputs the project depends on after each link that can be saved as a template
+_TEMPLATE_LINK_INPUTS = {
+    link: sum(list(_LINK_INPUTS.values())[: idx + 1], ())
+    for idx, link in enumerate(_LINK_INPUTS)
+}
+
+MESH_SETTINGS = dict(
+    Coarseness=0.05,
+    UseEnhancedRefinements=True,
+    EMRGlobalScale=1.2,
+    EMRMinElementSize=0.005,
+    UseSweptMeshing=False,
+)
+# phases added by the project_phases link
+PHASE_COUNT = 8
+
+
+# namespace attributes that are restored separately (or not at all) when a saved project is reopened
+_NAMESPACE_OWN_STATE = (
+    "materials",
+    "material_kwargs",
+    "phase_tree",
+    "calculated_phase_tree",
+    "phase_frames",
+)
+
+
+def _namespace_state(ns) -> dict:
+    """The names of the Plaxis objects held in a task chain namespace and its other values (e.g. coordinates)."""
+    plx_attrs = {
+        attr: value
+        for attr, value in vars(ns).items()
+        if isinstance(value, PlxProxyObject)
+    }
+    return dict(
+        names=dict(zip(plx_attrs, plx_names(plx_attrs.values()))),
+        values={
+            attr: value
+            for attr, value in vars(ns).items()
+            if attr not in plx_attrs and attr not in _NAMESPACE_OWN_STATE
+        },
+    )
+
+
+def _restore_namespace(ns, state: dict):
+    """Point a task chain namespace at the same-named objects of the project opened since, and restore its values."""
+    from plxhelper.plaxis_helper import g_i
+
+    for attr, name in state["names"].items():
+        setattr(ns, attr, getattr(g_i, name))
+    for attr, value in state["values"].items():
+        setattr(ns, attr, value)
+
+
+def _material_roles(*material_types) -> list:
+    """The type of each material role and the first role sharing its material, for roles in order of creation.
+
+    Projects built with the same roles have the same-named materials on the same objects, whatever their
+    properties."""
+    keys = [material_key(*material_type) for material_type in material_types]
+    return [(key[0], keys.index(key)) for key in keys]
+
+
 def task_chain(
     xmin,
     ymin,
@@ -37,30 +143,113 @@ def task_chain(
     soil_layer_materials_list,
     short_term_reline_type,
     long_term_reline_type,
+    *,
+    server: ServerAddress = None,
+    max_cores=None,
+    branch_servers=None,
+    project_path=None,
+    mesh_cache=None,
+    mesh_topology=None,
+    results_sink=None,
+    templates=None,
+    template_link="soil_materials_setup",
 ):
-    connect_server()
+    """Build the single pipe reline task chain.
+
+    The chain connects to the Input server at server (localhost:10000 by default). max_cores sets the most cores
+    Plaxis may use to calculate each phase.
+
+    When a mesh_cache.MeshCache is supplied, a model whose geometry and mesh settings match an earlier run reuses the
+    mesh of that run's saved project; the connected project then continues as project_path (or as a temporary
+    file without one). When a
+    mesh_topology.MeshTopologyCache is supplied, the plate node coordinates are fetched once per mesh and later runs
+    sharing the mesh only fetch the thrust and moment results.
+
+    When a results_sink is supplied, the plate results of each calculated phase are extracted while the later phases
+    are still calculating and passed on as results_sink(phase function name, DataFrame) as soon as they are ready.
+
+    When project_template.ProjectTemplates are supplied, the chain up to template_link is run once per distinct set of
+    inputs it depends on and saved as a template. Later chains with the same inputs open the template instead and
+    only run the remaining links.
+
+    When branch_servers are supplied, the independent branches of the phase tree are calculated concurrently on those
+    servers, forked from the trunk project saved at project_path. The plate results of each phase are extracted on
+    the server that calculated it and kept in the chain namespace as phase_frames."""
+    chain_inputs = dict(locals())
+    if branch_servers and results_sink is not None:
+        raise SinglePipeRelineError(
+            "results are only streamed when calculating on a single server"
+        )
+    if branch_servers and project_path is None:
+        raise SinglePipeRelineError(
+            "branch_servers need a project_path to fork the branch projects from"
+        )
+    if templates is not None and template_link not in _TEMPLATE_LINK_INPUTS:
+        raise SinglePipeRelineError(
+            f"templates can be saved after one of {list(_TEMPLATE_LINK_INPUTS)}, not {template_link!r}"
+        )
+    # the file the connected project continues as after opening a cached mesh or a template
+    working_path = project_path
+    if working_path is None and (mesh_cache is not None or templates is not None):
+        working_path = pathlib.Path(tempfile.mkdtemp()) / "project.p3d"
+
+    if server is None:
+        connect_server()
+    else:
+        connect_server(*server)
 
     from plxhelper.plaxis_helper import s_i, g_i
 
     single_pipe_reline = TaskChain()
-    ns = SimpleNamespace()
+    # phase_frames: plate results by Plaxis phase name, of the phases calculated since
+    ns = SimpleNamespace(phase_frames={})
+    topology = MeshTopologyCache() if mesh_topology is None else mesh_topology
+
+    def plate_frame(results, phase_name):
+        return topology.frame(
+            results,
+            ns.mesh_fingerprint,
+            phase_name,
+            "Plate_2",
+            dict(n="Plate.N22", m="Plate.M22"),
+        )
+
+    def output_plate_frame(s, g, phase_name):
+        # opens Output on the project calculated on the server of s, g (the trunk project or a branch project)
+        port = int(g.view(getattr(g, phase_name)))
+        s_o, g_o = new_server(
+            s.connection.host, port=port, password=s.connection._password
+        )
+        return plate_frame(LazyResults(s_o, g_o), phase_name)
+
+    def create_material(*material_type):
+        # repeated material types share one Plaxis material
+        material_obj = ns.materials.get(*material_type)
+        # kept so the material can be updated in a project reopened from a cache
+        ns.material_kwargs[material_obj] = material_kwargs(*material_type)
+        return material_obj
 
     @single_pipe_reline.link
     def new_project():
         s_i.new()
+        ns.phase_tree = ns.calculated_phase_tree = None
+        ns.materials = MaterialRegistry()
+        ns.material_kwargs = {}
         g_i.Project.setproperties("UnitForce", "lbf", "UnitLength", "in")
         g_i.SoilContour.initializerectangular(xmin, ymin, xmax, ymax)
 
     @single_pipe_reline.link
     def soil_materials_setup():
+        # created in one batch when the first is needed
+        for material_type in (*soil_layer_materials_list, annular_fill_type):
+            ns.materials.request(*material_type)
         layer_soilmat_obj_list = [
-            material_creator(*soil_layer_material_type)()
+            create_material(*soil_layer_material_type)
             for soil_layer_material_type in soil_layer_materials_list
         ]
         process_boreholes(boreholes_dict, layer_soilmat_obj_list)
 
-        ns.annular_fill_soilmat_creator = material_creator(*annular_fill_type)
-        ns.annular_fill_soilmat_obj = ns.annular_fill_soilmat_creator()
+        ns.annular_fill_soilmat_obj = create_material(*annular_fill_type)
 
     @single_pipe_reline.link
     def live_load_setup():
@@ -91,7 +280,7 @@ def task_chain(
                 grade_el,
             )
 
-            ns.lane_load_elastic_platemat_obj = material_creator("plate", lane_load)()
+            ns.lane_load_elastic_platemat_obj = create_material("plate", lane_load)
 
             ns.lane_load_elastic_plate_obj = g_i.plate(ns.lane_load_surface)
             ns.lane_load_elastic_plate_obj.setmaterial(
@@ -108,13 +297,14 @@ def task_chain(
 
         parent_pipe_curve = add_pipe_structure(
             xyz=(0, ymin, ns.z_parent_crown),
-            xyz_direction=((1, 0, 0), (0, 0, 1)),
+            axis1=(1, 0, 0),
+            axis2=(0, 0, 1),
             shape_info_dict=parent_shape_info_dict,
-        )
+        )["poly_curve_obj"]
 
         parent_pipe_x_section = g_i.surface(parent_pipe_curve)
 
-        parent_pipe_surface, parent_pipe_volume, _ = g_i.extrude(
+        parent_pipe_surface, ns.parent_pipe_volume, _ = g_i.extrude(
             [parent_pipe_curve, parent_pipe_x_section], 0, ns.l_parent, 0
         )
 
@@ -132,46 +322,81 @@ def task_chain(
     def reline_pipe_setup():
         z_reline_crown = grade_el - h_cover_in
 
-        print(f"z_parent_crown = {ns.z_parent_crown}")
-        print(f"z_reline_crown) = {z_reline_crown}")
-
         reline_pipe_curve = add_pipe_structure(
             xyz=(0, ymin, z_reline_crown),
             axis1=(1, 0, 0),
             axis2=(0, 0, 1),
             shape_info_dict=reline_shape_info_dict,
-        )
+        )["poly_curve_obj"]
 
         reline_pipe_surface = g_i.extrude(reline_pipe_curve, 0, ns.l_parent, 0)
 
-        reline_pipe_friction = g_i.neginterface(reline_pipe_surface)
-
-        g_i.setmaterial(reline_pipe_friction, ns.annular_fill_soilmat_obj)
+        ns.reline_pipe_friction = g_i.neginterface(reline_pipe_surface)
 
-        short_term_platemat_creator = material_creator(*short_term_reline_type)
-        long_term_platemat_creator = material_creator(*long_term_reline_type)
+        g_i.setmaterial(ns.reline_pipe_friction, ns.annular_fill_soilmat_obj)
 
-        short_term_platemat_obj = short_term_platemat_creator()
-        long_term_platemat_obj = long_term_platemat_creator()
+        ns.materials.request(*short_term_reline_type)
+        ns.materials.request(*long_term_reline_type)
+        short_term_platemat_obj = create_material(*short_term_reline_type)
+        ns.long_term_platemat_obj = create_material(*long_term_reline_type)
 
-        reline_pipe_plate_obj = g_i.plate(reline_pipe_surface)
-        reline_pipe_plate_obj.setmaterial(short_term_platemat_obj)
+        ns.reline_pipe_plate_obj = g_i.plate(reline_pipe_surface)
+        ns.reline_pipe_plate_obj.setmaterial(short_term_platemat_obj)
 
     @single_pipe_reline.link
     def mesh_project():
-        g_i.gotomesh()
-        g_i.mesh(
-            "Coarseness",
-            0.05,
-            "UseEnhancedRefinements",
-            True,
-            "EMRGlobalScale",
-            1.2,
-            "EMRMinElementSize",
-            0.005,
-            "UseSweptMeshing",
-            False,
+        geometry_plan = dict(
+            extents=(xmin, ymin, xmax, ymax),
+            grade_el=grade_el,
+            h_cover_in=h_cover_in,
+            h_parent=h_parent,
+            h_AVG_in=h_AVG_in,
+            xyz_live_load=xyz_live_load,
+            lane_load=lane_load,
+            parent_shape_info_dict=parent_shape_info_dict,
+            reline_shape_info_dict=reline_shape_info_dict,
+            boreholes_dict=boreholes_dict,
+            # a reused project keeps its materials on its objects, only their properties are restored by name
+            material_roles=_material_roles(
+                *soil_layer_materials_list,
+                annular_fill_type,
+                ("plate", lane_load),
+                short_term_reline_type,
+                long_term_reline_type,
+            ),
         )
+        ns.mesh_fingerprint = mesh_cache_module.geometry_fingerprint(
+            geometry_plan, MESH_SETTINGS
+        )
+        # the element count of the mesh is the link's result
+        if mesh_cache is None:
+            return mesh_cache_module.mesh(MESH_SETTINGS)
+        ns_state = _namespace_state(ns)
+        material_names = dict(
+            zip(plx_names(ns.material_kwargs), ns.material_kwargs.values())
+        )
+        registry_names = ns.materials.names()
+
+        def restore():
+            batch_commands(
+                *(
+                    (PlxRef(name), "setproperties", *kwargs.items())
+                    for name, kwargs in material_names.items()
+                )
+            )
+            _restore_namespace(ns, ns_state)
+            ns.materials = MaterialRegistry.from_names(registry_names)
+            ns.material_kwargs = {
+                getattr(g_i, name): kwargs for name, kwargs in material_names.items()
+            }
+
+        mesh_cache.mesh(
+            ns.mesh_fingerprint,
+            MESH_SETTINGS,
+            working_path,
+            restore,
+        )
+        return mesh_cache.elements(ns.mesh_fingerprint)
 
     @single_pipe_reline.link
     def project_phases():
@@ -184,97 +409,329 @@ def task_chain(
         @phase()
         def initial_dry(phase_obj):
             """Initial Phase"""
-            for cut_soil in g_i.Soils:
-                cut_soil.WaterConditions.Conditions[phase_obj] = "dry"
+            return PhaseState(
+                water_conditions=dict.fromkeys(plx_names(g_i.Soils), "dry")
+            )
 
         @phase(initial_dry)
         def phase_1(phase_obj):
             """Phase 1 - Excavate, Apply Lane Load and Void Fixities"""
-            # deactivate parent pipe volumes
-            for cut_parent_pipe_volume in cut_parent_pipe_volumes:
-                cut_parent_pipe_volume.deactivate(phase_obj)
-            # apply fixity
-            getattr(g_i, str(ns.parent_pipe_fixity.Name)).activate(phase_obj)
-            getattr(g_i, str(ns.lane_load_elastic_plate_obj.Name)).activate(phase_obj)
+            return PhaseState(
+                # deactivate parent pipe volumes
+                inactive=cut_parent_pipe_volumes,
+                # apply fixity
+                active=[ns.parent_pipe_fixity, ns.lane_load_elastic_plate_obj],
+            )
 
         @phase(phase_1)
         def phase_2(phase_obj):
             """Phase 2 - Install Pipe, Friction, Grout"""
             # activate reline pipe, friction, grout soil
-            for obj in (
-                ns.reline_pipe_plate_obj,
-                ns.reline_pipe_friction,
-                grout_cut_volume,
-            ):
-                getattr(g_i, str(obj.Name)).activate(phase_obj)
-            getattr(g_i, str(grout_cut_volume.Name)).Soil.Material[
-                phase_obj
-            ] = ns.annular_fill_soilmat_obj
+            return PhaseState(
+                active=[
+                    ns.reline_pipe_plate_obj,
+                    ns.reline_pipe_friction,
+                    grout_cut_volume,
+                ],
+                materials={
+                    f"{grout_cut_volume.Name!s}.Soil": ns.annular_fill_soilmat_obj
+                },
+            )
 
         @phase(phase_2)
         def phase_3(phase_obj):
             """Phase 3 - Remove Parent Pipe Fixity"""
             # deactivate fixity
-            getattr(g_i, str(ns.parent_pipe_fixity.Name)).deactivate(phase_obj)
+            return PhaseState(inactive=[ns.parent_pipe_fixity])
 
         @phase(phase_3)
         def phase_4a(phase_obj):
             """Phase 4a - Long Term Dead Load"""
-            getattr(g_i, str(ns.reline_pipe_plate_obj.Name)).Material[phase_obj][
-                0
-            ] = ns.long_term_platemat_obj
+            return PhaseState(
+                materials={ns.reline_pipe_plate_obj: ns.long_term_platemat_obj}
+            )
 
         @phase(phase_4a)
         def phase_5a(phase_obj):
             """Phase 5a - Truck Live Load"""
-            for obj in getattr(g_i, str(ns.hl93_truck_patch_group.Name)):
-                obj.activate(phase_obj)
+            return PhaseState(active=[ns.hl93_truck_patch_group])
 
         @phase(phase_4a)
         def phase_5b(phase_obj):
             """Phase 5b - Tandem Live Load"""
-            for obj in getattr(g_i, str(ns.hl93_tandem_patch_group.Name)):
-                obj.activate(phase_obj)
+            return PhaseState(active=[ns.hl93_tandem_patch_group])
 
         @phase(phase_3)
         def phase_4b(phase_obj):
             """Phase 4b - Short Term Flood Load"""
-            for cut_soil in g_i.Soils:
-                if str(void_cut_volume.Name) not in str(cut_soil.Name):
-                    cut_soil.WaterConditions.Conditions[phase_obj] = "globallevel"
+            void_cut_volume_name = str(void_cut_volume.Name)
+            return PhaseState(
+                water_conditions={
+                    cut_soil_name: "globallevel"
+                    for cut_soil_name in plx_names(g_i.Soils)
+                    if void_cut_volume_name not in cut_soil_name
+                }
+            )
 
-        initial_dry.process_phase_tree()
+        # reuse the phases of an earlier run of this link in the same project
+        initial_dry.process_phase_tree(previous=ns.phase_tree)
+        ns.phase_tree = initial_dry
+        # the phase analyze_output reads the reline plate results of
+        ns.phase_5b = phase_5b
 
     @single_pipe_reline.link
     def calculate_project():
-        g_i.calculate()
+        if max_cores is not None:
+            batch_commands(
+                *(
+                    (PlxRef(f"{p.phase_name}.MaxCores"), "set", max_cores)
+                    for p in ns.phase_tree.traverse()
+                )
+            )
+        # only phases changed since the last calculation (and their descendants) are recalculated
+        marked = ns.phase_tree.mark_changed_phases(calculated=ns.calculated_phase_tree)
+        # the plate results of the other phases are still current
+        for p in marked:
+            ns.phase_frames.pop(p.phase_name, None)
+        if branch_servers:
+            phase_names = {p.name: p.phase_name for p in ns.phase_tree.traverse()}
+            branch_frames = calculate_branches(
+                ns.phase_tree,
+                project_path,
+                branch_servers,
+                output_plate_frame,
+                phases=marked,
+            )
+            ns.phase_frames.update(
+                (phase_names[name], frame) for name, frame in branch_frames.items()
+            )
+        elif results_sink is None:
+            g_i.calculate()
+        else:
+            node_names = {p.phase_name: p.name for p in marked}
+            ns.phase_frames.update(
+                calculate_pipelined(
+                    plate_frame,
+                    lambda phase_name, frame: results_sink(
+                        node_names[phase_name], frame
+                    ),
+                    phases=[p.phase_name for p in marked],
+                )
+            )
+        ns.calculated_phase_tree = ns.phase_tree
 
     @single_pipe_reline.link
     def project_output():
-        ns.output_port = g_i.view(ns.phase_5b.phase_obj)
+        # with branch_servers, phase 5b is calculated in its branch project, not in the connected one
+        ns.output_port = None if branch_servers else g_i.view(ns.phase_5b.phase_obj)
 
     @single_pipe_reline.link
     def analyze_output():
-        s_o, g_o = new_server(
-            "localhost", port=ns.output_port, password=s_i.connection._password
+        ns.output_results = None
+        if ns.output_port is not None:
+            s_o, g_o = new_server(
+                "localhost", port=ns.output_port, password=s_i.connection._password
+            )
+            # kept for browsing other results of the calculated project
+            ns.output_results = LazyResults(s_o, g_o)
+        if (frame := ns.phase_frames.get(ns.phase_5b.phase_name)) is not None:
+            return frame
+        return plate_frame(ns.output_results, ns.phase_5b.phase_name)
+
+    if templates is None:
+        return single_pipe_reline
+
+    template_fingerprint = fingerprint(
+        template_link,
+        {name: chain_inputs[name] for name in _TEMPLATE_LINK_INPUTS[template_link]},
+    )
+
+    def save_template():
+        template_state = dict(
+            namespace=_namespace_state(ns),
+            material_kwargs=dict(
+                zip(plx_names(ns.material_kwargs), ns.material_kwargs.values())
+            ),
+            materials=ns.materials.names(),
         )
+        templates.save(template_fingerprint, template_state, working_path)
+
+    def open_template():
+        template_state = templates.open(template_fingerprint, working_path)
+        ns.phase_tree = ns.calculated_phase_tree = None
+        _restore_namespace(ns, template_state["namespace"])
+        ns.material_kwargs = {
+            getattr(g_i, name): kwargs
+            for name, kwargs in template_state["material_kwargs"].items()
+        }
+        ns.materials = MaterialRegistry.from_names(template_state["materials"])
+
+    return single_pipe_reline.from_template(
+        template_link,
+        template_exists=lambda: template_fingerprint in templates,
+        save_template=save_template,
+        open_template=open_template,
+    )
+
+
+# task_chain arguments that change how a run is computed, not its results
+_RUN_OPTIONS = (
+    "server",
+    "max_cores",
+    "branch_servers",
+    "project_path",
+    "mesh_cache",
+    "mesh_topology",
+    "results_sink",
+    "templates",
+    "template_link",
+)
 
-        result_columns = dict(
-            x=g_o.ResultTypes.Plate.X,
-            y=g_o.ResultTypes.Plate.Y,
-            z=g_o.ResultTypes.Plate.Z,
-            n=g_o.ResultTypes.Plate.N22,
-            m=g_o.ResultTypes.Plate.M22,
-        )
 
-        results = pd.DataFrame.from_dict(
-            {
-                col_name: g_o.getresults(
-                    g_o.Plate_2, ns.phase_5b.phase_obj, result_type, "node"
-                )
-                for col_name, result_type in result_columns.items()
-            }
-        )
+def _run_chain(chain: TaskChain, timing_history: TimingHistory = None, features=None):
+    """The results of the last link of a chain, recording how long each link took in timing_history along with the
+    element count mesh_project returned."""
+    durations = {}
+    elements = None
+    for step in chain:
+        start = time.perf_counter()
+        results = step()
+        durations[step.__name__] = time.perf_counter() - start
+        if step.__name__ == "mesh_project":
+            elements = results
+    if timing_history is not None:
+        timing_history.record(features, durations, elements=elements)
+    return results
+
+
+def run(
+    *args,
+    run_cache: RunCache = None,
+    timing_history: TimingHistory = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """Build, calculate and analyze a single pipe reline model and return the analyze_output results.
+
+    Arguments are those of task_chain. With a run_cache, inputs that were run before return the cached results without
+    connecting to Plaxis, and the saved project of a new run is stored alongside its results. With a timing_history,
+    the model_features, link durations and element count of every run that is not cached are recorded.
+    """
+    chain_inputs = inspect.signature(task_chain).bind(*args, **kwargs).arguments
+    features = None if timing_history is None else model_features(chain_inputs)
+    if run_cache is None:
+        return _run_chain(task_chain(*args, **kwargs), timing_history, features)
+    key = run_cache.key(
+        **{
+            name: value
+            for name, value in chain_inputs.items()
+            if name not in _RUN_OPTIONS
+        }
+    )
+    if (results := run_cache.get(key)) is not None:
         return results
-
-    return single_pipe_reline
+    with run_cache.claim(key):
+        # another worker may have finished the same run while this one waited
+        if (results := run_cache.get(key)) is not None:
+            return results
+        results = _run_chain(task_chain(*args, **kwargs), timing_history, features)
+
+        from plxhelper.plaxis_helper import s_i, g_i
+
+        def save_project(path):
+            g_i.save(str(path))
+            s_i.close()
+
+        run_cache.put(key, results, save_project)
+    return results
+
+
+def _outline_length(shape_info_dict) -> float:
+    outline = outline_points(shape_info_dict["segments"])
+    return float(np.linalg.norm(np.diff(outline, axis=0), axis=1).sum())
+
+
+def model_features(case: dict, mesh_settings=MESH_SETTINGS) -> dict:
+    """The features of the model of a case of task_chain keyword arguments that its element count and link durations
+    depend on (see cost_model.CostModel); all are positive."""
+    shape_info_dicts = (case["parent_shape_info_dict"], case["reline_shape_info_dict"])
+    return dict(
+        area=(case["xmax"] - case["xmin"]) * (case["ymax"] - case["ymin"]),
+        depth=max(sum(info["layers"]) for info in case["boreholes_dict"].values()),
+        boreholes=len(case["boreholes_dict"]),
+        layers=len(case["soil_layer_materials_list"]),
+        outline_length=sum(map(_outline_length, shape_info_dicts)),
+        segments=sum(len(info["segments"]) for info in shape_info_dicts),
+        coarseness=mesh_settings["Coarseness"],
+        emr_global_scale=mesh_settings["EMRGlobalScale"],
+        phases=PHASE_COUNT,
+    )
+
+
+def model_size(case: dict) -> float:
+    """The predicted size of the model of a case of task_chain keyword arguments, relative to other cases: its plan
+    area."""
+    return (case["xmax"] - case["xmin"]) * (case["ymax"] - case["ymin"])
+
+
+def _run_case(case, cores, server, run_cache=None, timing_history=None):
+    return run(
+        **case,
+        server=server,
+        max_cores=cores,
+        run_cache=run_cache,
+        timing_history=timing_history,
+    )
+
+
+def run_sweep(
+    cases: Sequence[dict],
+    servers: Sequence[ServerAddress] | InstanceManager,
+    scheduler: CoreScheduler = None,
+    run_cache: RunCache = None,
+    size=None,
+    cost_model: CostModel = None,
+    budget=None,
+    timing_history: TimingHistory = None,
+) -> list[pd.DataFrame]:
+    """Run each case of task_chain keyword arguments and return their results in case order.
+
+    Runs are spread over the Input servers, one worker process per server; servers started by an InstanceManager are
+    recycled between runs as it is configured to. The scheduler (by default one sharing all the cores of the machine)
+    sets the cores each calculation uses from the predicted size(case) of the models calculating at the same time; the
+    largest start first. size defaults to the run time the cost_model predicts, or to model_size without one.
+
+    When a budget (seconds) is given, no case is run if the cost_model predicts any to take longer. timing_history
+    records the link durations of the runs, to fit later cost models from.
+    """
+    if size is None:
+        size = (
+            model_size
+            if cost_model is None
+            else lambda case: cost_model.predict(model_features(case)).total
+        )
+    if budget is not None:
+        if cost_model is None:
+            raise SinglePipeRelineError("a run time budget needs a cost model")
+        if over_budget := [
+            idx
+            for idx, case in enumerate(cases)
+            if cost_model.predict(model_features(case)).total > budget
+        ]:
+            raise SinglePipeRelineError(
+                f"cases {over_budget} are predicted to take longer than {budget} s"
+            )
+    scheduler = CoreScheduler() if scheduler is None else scheduler
+    on_release = None
+    if isinstance(servers, InstanceManager):
+        servers, on_release = servers.servers, servers.release
+    with ProcessPoolExecutor(max_workers=len(servers)) as executor:
+        return scheduler.map(
+            functools.partial(
+                _run_case, run_cache=run_cache, timing_history=timing_history
+            ),
+            cases,
+            [size(case) for case in cases],
+            servers,
+            executor,
+            on_release,
+        )
@@ -0,0 +1,109 @@
+"""helpers for finding the Plaxis objects near a box, plane or half-space locally, from their bounding boxes"""
+
+from typing import Iterable
+
+import numpy as np
+
+import plxhelper.plaxis_helper as plaxis_helper
+from plxhelper.geo import BoundingBox, Point
+
+# distances closer than this count as touching
+TOLERANCE = 1e-9
+
+
+class SpatialIndex:
+    """Bounding boxes of Plaxis objects kept locally, so box, plane and half-space queries need no round-trips.
+
+    The box coordinates are kept as the rows (xMin, yMin, zMin, xMax, yMax, zMax) of a numpy array with a column per
+    object, so every query is a few vectorized comparisons and queries over thousands of objects take microseconds.
+    Boxes not supplied are read in bulk with plaxis_helper.bounding_boxes. Queries are conservative: an object is
+    returned when its bounding box meets the region, even if the object itself does not.
+    """
+
+    def __init__(self, objs: Iterable = (), boxes: Iterable[BoundingBox] = None):
+        self._objs = []
+        self._rows = {}
+        self._boxes = np.empty((6, 0))
+        self.add(objs, boxes)
+
+    def __len__(self) -> int:
+        return len(self._objs)
+
+    def __iter__(self):
+        return iter(list(self._objs))
+
+    def __contains__(self, obj) -> bool:
+        return obj in self._rows
+
+    def add(self, objs: Iterable, boxes: Iterable[BoundingBox] = None):
+        """Index objects, or update the boxes of objects already indexed (e.g. after moving them)."""
+        objs = list(objs)
+        if boxes is None:
+            boxes = plaxis_helper.bounding_boxes(objs)
+        rows = np.array([[*box[0], *box[1]] for box in boxes], dtype=float)
+        if len(rows) != len(objs):
+            raise ValueError("one bounding box is needed per object")
+        new_rows = []
+        for obj, row in dict(zip(objs, rows)).items():
+            if (idx := self._rows.get(obj)) is not None:
+                self._boxes[:, idx] = row
+            else:
+                self._rows[obj] = len(self._objs)
+                self._objs.append(obj)
+                new_rows.append(row)
+        if new_rows:
+            self._boxes = np.hstack([self._boxes, np.transpose(new_rows)])
+
+    def remove(self, objs: Iterable):
+        """Forget objects (e.g. deleted ones); objects that are not indexed are ignored."""
+        drop = [idx for obj in objs if (idx := self._rows.pop(obj, None)) is not None]
+        if not drop:
+            return
+        keep = np.ones(len(self._objs), dtype=bool)
+        keep[drop] = False
+        self._objs = [obj for obj, kept in zip(self._objs, keep) if kept]
+        self._boxes = self._boxes[:, keep]
+        self._rows = {obj: idx for idx, obj in enumerate(self._objs)}
+
+    def box(self, obj) -> BoundingBox:
+        row = self._boxes[:, self._rows[obj]].tolist()
+        return BoundingBox(Point(*row[:3]), Point(*row[3:]))
+
+    def _select(self, mask) -> list:
+        return [self._objs[idx] for idx in np.flatnonzero(mask)]
+
+    def intersecting_box(self, box: BoundingBox, tolerance=TOLERANCE) -> list:
+        """Objects whose bounding boxes overlap or touch box."""
+        (x_min, y_min, z_min), (x_max, y_max, z_max) = box
+        boxes = self._boxes
+        mask = boxes[0] <= x_max + tolerance
+        mask &= boxes[1] <= y_max + tolerance
+        mask &= boxes[2] <= z_max + tolerance
+        mask &= boxes[3] >= x_min - tolerance
+        mask &= boxes[4] >= y_min - tolerance
+        mask &= boxes[5] >= z_min - tolerance
+        return self._select(mask)
+
+    def _signed_distance_range(self, point, normal) -> tuple[np.ndarray, np.ndarray]:
+        """Least and greatest signed distance of each box corner from the plane through point."""
+        normal = np.asarray(normal, dtype=float)
+        normal = normal / np.linalg.norm(normal)
+        p_min, p_max = self._boxes[:3], self._boxes[3:]
+        center_distances = normal @ (p_min + p_max) / 2 - normal @ np.asarray(point)
+        reach = np.abs(normal) @ (p_max - p_min) / 2
+        return center_distances - reach, center_distances + reach
+
+    def intersecting_plane(self, point, normal, tolerance=TOLERANCE) -> list:
+        """Objects whose bounding boxes meet the plane through point with the given normal."""
+        least, greatest = self._signed_distance_range(point, normal)
+        return self._select((least <= tolerance) & (greatest >= -tolerance))
+
+    def intersecting_half_space(self, point, normal, tolerance=TOLERANCE) -> list:
+        """Objects whose bounding boxes reach into the side of the plane the normal points to."""
+        _, greatest = self._signed_distance_range(point, normal)
+        return self._select(greatest > tolerance)
+
+    def within_half_space(self, point, normal, tolerance=TOLERANCE) -> list:
+        """Objects whose bounding boxes lie entirely on the side of the plane the normal points to."""
+        least, _ = self._signed_distance_range(point, normal)
+        return self._select(least >= -tolerance)
@@ -0,0 +1,167 @@
+"""helpers for resampling results at the scattered nodes of a mesh onto a regular grid of stations along and around a
+pipe"""
+
+import math
+from typing import Sequence, NamedTuple
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+# arcs of outlines are drawn with one straight segment per ARC_SEGMENT_DEG degrees
+ARC_SEGMENT_DEG = 1.0
+# outlines whose ends are closer than this are closed
+TOLERANCE = 1e-6
+# nearest nodes each station is interpolated from
+DEFAULT_NEIGHBORS = 6
+# directions the neighbors of a station barely spread in are left out of its linear fit
+RCOND = 1e-6
+
+
+def outline_points(
+    segments: Sequence[dict], offset=(0.0, 0.0), arc_segment_deg=ARC_SEGMENT_DEG
+) -> np.ndarray:
+    """Points (u, v) along a polycurve drawn from offset in its own plane, one row per point.
+
+    segments are dicts like those of a shape_info_dict (see plaxis_helper.add_pipe_structure). Each segment starts
+    turned RelativeStartAngle1 degrees (counterclockwise) from where the previous one ended; the first starts along
+    the u axis. Arcs with a positive CentralAngle turn counterclockwise.
+    """
+    u, v = (float(coord) for coord in offset)
+    heading = 0.0
+    points = [(u, v)]
+    for segment in segments:
+        match segment["SegmentType"]:
+            case "Line":
+                heading += math.radians(segment.get("RelativeStartAngle1", 0))
+                u += segment["Length"] * math.cos(heading)
+                v += segment["Length"] * math.sin(heading)
+                points.append((u, v))
+            case "Arc":
+                heading += math.radians(segment.get("RelativeStartAngle1", 0))
+                central_angle = math.radians(segment["CentralAngle"])
+                turn = math.copysign(1, central_angle)
+                radius = segment["Radius"]
+                center_u = u - turn * radius * math.sin(heading)
+                center_v = v + turn * radius * math.cos(heading)
+                start_angle = heading - turn * math.pi / 2
+                n = max(1, math.ceil(abs(segment["CentralAngle"]) / arc_segment_deg))
+                for k in range(1, n + 1):
+                    angle = start_angle + central_angle * k / n
+                    u = center_u + radius * math.cos(angle)
+                    v = center_v + radius * math.sin(angle)
+                    points.append((u, v))
+                heading += central_angle
+            case "SymmetricExtend":
+                if abs(math.cos(heading)) > TOLERANCE and -u / math.cos(heading) > 0:
+                    v += -u * math.tan(heading)
+                u = 0.0
+                points.append((u, v))
+            case "SymmetricClose":
+                points += [(-pu, pv) for pu, pv in reversed(points)]
+    return np.array(points)
+
+
+class StationGrid(NamedTuple):
+    # distances of the stations along the pipe from the drawn cross-section
+    along: np.ndarray
+    # distances of the stations around the outline from its first point
+    around: np.ndarray
+    # coordinates, shape (len(along), len(around), 3)
+    xyz: np.ndarray
+
+
+def station_grid(
+    xyz, axis1, axis2, shape_info_dict, extrusion, along_count, around_count
+) -> StationGrid:
+    """A grid of stations on a pipe drawn like plaxis_helper.add_pipe_structure(xyz, shape_info_dict, axis1, axis2)
+    and extruded by the extrusion vector.
+
+    Stations are evenly spaced: along_count of them from one end of the pipe to the other, and around_count around
+    the outline (a closed outline does not repeat its first station at the end).
+    """
+    axes = np.array([axis1, axis2], dtype=float)
+    axes /= np.linalg.norm(axes, axis=1)[:, None]
+    outline = outline_points(
+        shape_info_dict["segments"],
+        (shape_info_dict.get("Offset1", 0.0), shape_info_dict.get("Offset2", 0.0)),
+    )
+    lengths = np.r_[0.0, np.cumsum(np.linalg.norm(np.diff(outline, axis=0), axis=1))]
+    closed = np.linalg.norm(outline[-1] - outline[0]) < TOLERANCE
+    around = np.linspace(0.0, lengths[-1], around_count, endpoint=not closed)
+    local = np.column_stack(
+        [
+            np.interp(around, lengths, outline[:, 0]),
+            np.interp(around, lengths, outline[:, 1]),
+        ]
+    )
+    extrusion = np.asarray(extrusion, dtype=float)
+    along = np.linspace(0.0, np.linalg.norm(extrusion), along_count)
+    fractions = np.linspace(0.0, 1.0, along_count)
+    section = np.asarray(xyz, dtype=float) + local @ axes
+    grid = section[None, :, :] + fractions[:, None, None] * extrusion
+    return StationGrid(along, around, grid)
+
+
+class Resampler:
+    """Interpolation of results at the nodes of one mesh onto stations.
+
+    The nodes are put in a KD-tree once and every station is given weights on its neighbors nearest nodes, so
+    resampling the results of any phase or run on the same mesh is a single weighted sum. method "linear" fits a
+    least-squares plane through the neighbors (exact for results varying linearly in space); "idw" weighs them by
+    inverse distance to the power. A station on a node takes that node's result either way.
+    """
+
+    def __init__(
+        self,
+        node_xyz,
+        station_xyz,
+        method="linear",
+        neighbors=DEFAULT_NEIGHBORS,
+        power=2.0,
+    ):
+        node_xyz = np.asarray(node_xyz, dtype=float).reshape(-1, 3)
+        station_xyz = np.asarray(station_xyz, dtype=float)
+        self.shape = station_xyz.shape[:-1]
+        station_xyz = station_xyz.reshape(-1, 3)
+        neighbors = min(neighbors, len(node_xyz))
+        distances, self.indices = cKDTree(node_xyz).query(station_xyz, neighbors)
+        distances = distances.reshape(len(station_xyz), neighbors)
+        self.indices = self.indices.reshape(len(station_xyz), neighbors)
+        match method:
+            case "idw":
+                with np.errstate(divide="ignore"):
+                    weights = 1.0 / distances**power
+            case "linear":
+                # fitted about the centroid of the neighbors, so the intercept is well defined even though the
+                # nodes of a plate lie (nearly) in a plane; the plane has no gradient across it
+                near = node_xyz[self.indices]
+                centroid = near.mean(axis=1)
+                design = np.concatenate(
+                    [np.ones((*self.indices.shape, 1)), near - centroid[:, None, :]],
+                    axis=2,
+                )
+                at_station = np.column_stack(
+                    [np.ones(len(station_xyz)), station_xyz - centroid]
+                )
+                weights = np.einsum(
+                    "sj,sjk->sk", at_station, np.linalg.pinv(design, rcond=RCOND)
+                )
+            case _:
+                raise ValueError(f"unknown interpolation method {method!r}")
+        on_node = distances[:, 0] < TOLERANCE
+        weights[on_node] = 0.0
+        weights[on_node, 0] = 1.0
+        self.weights = weights / weights.sum(axis=1, keepdims=True)
+
+    def resample(self, values) -> np.ndarray:
+        """The values at the stations of node values (one per node, or one row of several per node), in the shape of
+        the station grid."""
+        values = np.asarray(values, dtype=float)
+        resampled = np.einsum("sk,sk...->s...", self.weights, values[self.indices])
+        return resampled.reshape(*self.shape, *values.shape[1:])
+
+    def frame(self, node_frame: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+        """The columns of a results DataFrame (one row per node, in node order) resampled, one row per station."""
+        resampled = self.resample(node_frame[list(columns)].to_numpy())
+        return pd.DataFrame(resampled.reshape(-1, len(columns)), columns=list(columns))
@@ -1,5 +1,5 @@
 from collections.abc import MutableSequence
-from typing import overload, Iterable, TypeVar
+from typing import overload, Iterable, TypeVar, Callable
 from copy import copy
 
 _T = TypeVar("_T")
@@ -39,6 +39,32 @@ class TaskChain(MutableSequence):
     def __call__(self):
         yield from (step() for step in self._seq)
 
+    def from_template(
+        self,
+        item: str,
+        template_exists: Callable[[], bool],
+        save_template: Callable[[], object],
+        open_template: Callable[[], object],
+    ):
+        """A chain that starts from a saved template of the prefix chain ending at link `item`.
+
+        Its first link, also named `item`, opens the template when template_exists(). Otherwise it runs the prefix
+        and then calls save_template(). The links after `item` follow unchanged.
+        """
+        prefix = getattr(self, item)
+
+        def start_from_template():
+            if template_exists():
+                return open_template()
+            prefix_results = tuple(prefix())
+            save_template()
+            return prefix_results
+
+        start_from_template.__name__ = item
+        templated = self[len(prefix) :]
+        templated.insert(0, start_from_template)
+        return templated
+
     def link(self, obj):
         _guard_callable(obj)
         self._seq.append(obj)
@@ -18,6 +18,8 @@ def patch_plxscripting_new_server(g_i, s_i, mocker):
     from plxscripting.easy import new_server
 
     new_server.return_value = (s_i, g_i)
+    # plaxis_helper holds its own reference to new_server once imported
+    mocker.patch("plxhelper.plaxis_helper.new_server", new_server)
 
 
 @pytest.fixture
@@ -32,3 +34,14 @@ def plaxis_helper(plaxis_helper_connected):
     import plxhelper.plaxis_helper as plaxis_helper
 
     return plaxis_helper
+
+
+@pytest.fixture
+def fake_plaxis_helper(mocker):
+    """plaxis_helper connected to the in-process fake g_i with real geometry."""
+    from plxhelper.fake_plaxis import new_fake_server
+    import plxhelper.plaxis_helper as plaxis_helper
+
+    mocker.patch("plxhelper.plaxis_helper.new_server", new_fake_server)
+    plaxis_helper.connect_server()
+    return plaxis_helper
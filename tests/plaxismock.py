@@ -2,12 +2,27 @@
 
 from unittest import mock
 
+from plxscripting.server import InputProcessor
+
 MOCK_OK = "OK"
 
 
 @mock.patch("plxscripting.server.Server")
 class ServerMock:
-    pass
+    def __init__(self):
+        self.input_proc = InputProcessor()
+        self.commands = []
+
+    def open(self, filename):
+        self.filename = filename
+        return MOCK_OK
+
+    def call_and_handle_commands(self, *commands):
+        self.commands.extend(commands)
+        return [MOCK_OK for _ in commands]
+
+    def get_objects_property(self, proxy_objects, prop_name, phase_object=None):
+        return [getattr(obj, prop_name) for obj in proxy_objects]
 
 
 @mock.patch("plxscripting.plxproxy.PlxProxyGlobalObject")
@@ -18,9 +33,26 @@ class PlxProxyGlobalObjectMock:
     def gotomesh(self):
         return MOCK_OK
 
+    def mesh(self, *args):
+        self.mesh_count = getattr(self, "mesh_count", 0) + 1
+        return MOCK_OK
+
     def calculate(self):
         return MOCK_OK
 
+    def save(self, *args):
+        return MOCK_OK
+
+    @property
+    def Phases(self):
+        return self.__dict__.setdefault("_phases", [PhaseMock("InitialPhase")])
+
+    def phase(self, parent_phase):
+        self._phase_count = getattr(self, "_phase_count", 0) + 1
+        new_phase = PhaseMock(f"Phase_{self._phase_count}", parent_phase)
+        self.Phases.append(new_phase)
+        return new_phase
+
     def soilmat(self, *args, **kwargs):
         return object()
 
@@ -38,8 +70,15 @@ class PlxProxyGlobalObjectMock:
     def surface(self, *args):
         return object()
 
-    def delete(self, *args):
-        ...
+    def delete(self, *objs):
+        """Deleting a phase deletes its child phases too."""
+        if len(objs) == 1 and isinstance(objs[0], list):
+            objs = objs[0]
+        self.deleted = getattr(self, "deleted", []) + list(objs)
+        deleted = [obj for obj in objs if isinstance(obj, PhaseMock)]
+        while deleted:
+            self.Phases.remove(deleted_phase := deleted.pop())
+            deleted += [p for p in self.Phases if p.PreviousPhase is deleted_phase]
 
 
 class SetPropertiesMock:
@@ -70,3 +109,17 @@ class GroupMock(list):
 
     def __init__(self, *args):
         super().__init__(args)
+
+
+class NamedMock:
+    def __init__(self, name):
+        self.Name = name
+
+    def get_cmd_line_repr(self):
+        return self.Name
+
+
+class PhaseMock(NamedMock):
+    def __init__(self, name, previous_phase=None):
+        super().__init__(name)
+        self.PreviousPhase = previous_phase
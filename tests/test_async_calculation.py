@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+from plxscripting.easy import new_server
+
+import plxhelper.plaxis_helper as plaxis_helper
+from plxhelper.async_calculation import (
+    CalculationCancelled,
+    CalculationProgress,
+    start_calculation,
+)
+from plxhelper.branch_calculation import ServerAddress
+from plxhelper.mock_server import MockPlaxisServer
+
+CALCULATION_TIME = 0.1
+
+
+def _phases(server):
+    """InitialPhase <- Phase_1 <- Phase_2, and Phase_3 branching off InitialPhase."""
+    _, g = new_server("localhost", port=server.port, password="python")
+    phase_1 = g.phase(g.InitialPhase)
+    g.phase(phase_1)
+    g.phase(g.InitialPhase)
+    return g
+
+
+@pytest.fixture
+def server():
+    with MockPlaxisServer(calculation_time=CALCULATION_TIME) as server:
+        _phases(server)
+        yield server
+
+
+def test_start_calculation_returns_at_once(server):
+    progress = []
+    start = time.perf_counter()
+    calculation = start_calculation(
+        server=ServerAddress("localhost", server.port), progress=progress.append
+    )
+    assert time.perf_counter() - start < CALCULATION_TIME
+    final = calculation.result(timeout=10)
+    assert final == CalculationProgress(
+        ("InitialPhase", "Phase_1", "Phase_2", "Phase_3"), (), ()
+    )
+    assert final.fraction == 1.0
+    assert progress[0] == CalculationProgress(
+        pending=("InitialPhase", "Phase_1", "Phase_2", "Phase_3")
+    )
+    assert [len(p.calculated) for p in progress] == [0, 1, 2, 3, 4]
+    assert calculation.progress == final
+
+
+def test_default_server_is_the_connected_one(server):
+    plaxis_helper.connect_server(port=server.port, password="python")
+    calculation = start_calculation(phases=["InitialPhase"])
+    assert calculation.result(timeout=10).calculated == ("InitialPhase",)
+
+
+def test_children_of_failed_phases_are_skipped(server):
+    server.failing_phases = {"Phase_1"}
+    phases_done = []
+    calculation = start_calculation(
+        server=ServerAddress("localhost", server.port), on_phase=phases_done.append
+    )
+    final = calculation.result(timeout=10)
+    assert final.calculated == ("InitialPhase", "Phase_3")
+    assert final.failed == ("Phase_1", "Phase_2")
+    assert phases_done == ["InitialPhase", "Phase_3"]
+    # Phase_2 was never sent to the server
+    assert (
+        server.model.named_object("Phase_2").properties["CalculationResult"] == "None"
+    )
+
+
+def test_cancel_stops_before_the_next_phase(server):
+    first_done = threading.Event()
+    calculation = start_calculation(
+        server=ServerAddress("localhost", server.port),
+        on_phase=lambda phase: first_done.set(),
+    )
+    assert first_done.wait(timeout=10)
+    assert calculation.cancel()
+    with pytest.raises(CalculationCancelled) as err:
+        calculation.result(timeout=10)
+    assert err.value.progress.pending
+    assert len(calculation.progress.calculated) < 4
+    assert not calculation.cancel()
+
+
+def test_calculations_on_two_servers_overlap():
+    with MockPlaxisServer(calculation_time=CALCULATION_TIME) as server_1:
+        with MockPlaxisServer(calculation_time=CALCULATION_TIME) as server_2:
+            for server in (server_1, server_2):
+                _phases(server)
+            start = time.perf_counter()
+            calculations = [
+                start_calculation(server=ServerAddress("localhost", server.port))
+                for server in (server_1, server_2)
+            ]
+            for calculation in calculations:
+                calculation.result(timeout=10)
+            assert time.perf_counter() - start < 8 * CALCULATION_TIME
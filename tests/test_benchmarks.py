@@ -0,0 +1,40 @@
+import pytest
+
+from benchmarks.suite import BENCHMARKS, compare, run_benchmark, run_benchmarks
+
+import benchmarks.remote_calls  # noqa: F401 (registers the remote-call benchmarks)
+
+REMOTE_BENCHMARKS = [name for name, bench in BENCHMARKS.items() if bench.budget]
+
+
+@pytest.mark.parametrize("name", REMOTE_BENCHMARKS)
+def test_remote_call_budget(name):
+    result = run_benchmark(BENCHMARKS[name], repeat=1)
+    assert not result.over_budget, dict(result.remote_calls)
+
+
+def test_run_benchmarks_pattern():
+    (result,) = run_benchmarks(["geo.Vector.add"], repeat=1)
+    assert result.name == "geo.Vector.add"
+    assert result.seconds > 0
+    assert result.remote_calls is None
+
+
+def _record(**results):
+    return dict(
+        results={
+            name: dict(seconds=seconds, remote_calls=calls, budget=None)
+            for name, (seconds, calls) in results.items()
+        }
+    )
+
+
+def test_compare():
+    baseline = _record(a=(1.0, None), b=(1.0, 10), c=(1.0, None))
+    current = _record(a=(1.1, None), b=(1.5, 11), d=(5.0, None))
+    regressions = compare(baseline, current, threshold=0.2)
+    assert [(r.name, r.measure) for r in regressions] == [
+        ("b", "seconds"),
+        ("b", "remote_calls"),
+    ]
+    assert regressions[0].change == pytest.approx(0.5)
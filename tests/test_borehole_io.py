@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from plxhelper.borehole_io import read_boreholes, thin_boreholes, iter_boreholes
+from plxhelper.exceptions import BoreholeFileError
+
+CSV_TEXT = """id,x,y,top_el,water_table_el,thickness
+B1,0,0,10,8,2
+B1,0,0,,,3
+B2,1,0,10,,2.1
+B2,1,0,,,3
+B3,500,0,10,,2
+"""
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "boreholes.csv"
+    path.write_text(CSV_TEXT)
+    return path
+
+
+@pytest.fixture(params=["collection", "lines"])
+def geojson_path(tmp_path, request):
+    features = [
+        dict(
+            type="Feature",
+            id=borehole_id,
+            geometry=dict(type="Point", coordinates=coords),
+            properties=dict(layers=layers, top_el=10),
+        )
+        for borehole_id, coords, layers in [
+            ("B1", [0, 0, 10], [2, 3]),
+            ("B2", [1, 0, 10], [2.1, 3]),
+            ("B3", [500, 0, 10], [2]),
+        ]
+    ]
+    path = tmp_path / "boreholes.geojson"
+    if request.param == "collection":
+        path.write_text(
+            json.dumps(dict(type="FeatureCollection", features=features), indent=2)
+        )
+    else:
+        path.write_text("\n".join(json.dumps(feature) for feature in features))
+    return path
+
+
+def test_read_csv(csv_path):
+    boreholes_dict = read_boreholes(csv_path, -100, -100, 100, 100)
+    assert boreholes_dict == {
+        (0, 0): dict(layers=[2, 3], top_el=10, water_table_el=8),
+        (1, 0): dict(layers=[2.1, 3], top_el=10),
+    }
+
+
+def test_read_geojson(geojson_path):
+    assert list(read_boreholes(geojson_path, -100, -100, 1000, 100)) == [
+        (0, 0),
+        (1, 0),
+        (500, 0),
+    ]
+
+
+@pytest.mark.parametrize("tolerance, expected", [(0.05, 3), (0.2, 2)])
+def test_thin_boreholes(csv_path, tolerance, expected):
+    boreholes_dict = dict(iter_boreholes(csv_path))
+    assert (
+        len(thin_boreholes(boreholes_dict, radius=10, tolerance=tolerance)) == expected
+    )
+
+
+def test_bad_borehole_file(tmp_path):
+    path = tmp_path / "boreholes.csv"
+    path.write_text("id,x,y,thickness\nB1,0,zero,2\n")
+    with pytest.raises(BoreholeFileError):
+        read_boreholes(path, -100, -100, 100, 100)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100])
+def test_read_geojson_in_chunks(geojson_path, chunk_size, mocker):
+    mocker.patch("plxhelper.borehole_io.CHUNK_SIZE", chunk_size)
+    assert list(read_boreholes(geojson_path, -100, -100, 1000, 100)) == [
+        (0, 0),
+        (1, 0),
+        (500, 0),
+    ]
+
+
+def test_truncated_geojson_file(geojson_path):
+    geojson_path.write_text(geojson_path.read_text()[:-10])
+    with pytest.raises(BoreholeFileError):
+        read_boreholes(geojson_path, -100, -100, 1000, 100)
+
+
+def test_csv_file_without_id_column(tmp_path):
+    path = tmp_path / "boreholes.csv"
+    path.write_text("x,y,thickness\n0,0,2\n")
+    with pytest.raises(BoreholeFileError, match="id"):
+        read_boreholes(path, -100, -100, 100, 100)
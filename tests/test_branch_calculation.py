@@ -0,0 +1,91 @@
+import pytest
+import plaxismock as pm
+
+
+@pytest.fixture
+def reline_like_phase_tree(plaxis_helper):
+    phase = plaxis_helper.phase
+
+    @phase()
+    def initial(phase_obj):
+        ...
+
+    @phase(initial)
+    def install(phase_obj):
+        ...
+
+    @phase(install)
+    def long_term(phase_obj):
+        ...
+
+    @phase(long_term)
+    def truck(phase_obj):
+        ...
+
+    @phase(install)
+    def flood(phase_obj):
+        ...
+
+    initial.process_phase_tree()
+    return initial
+
+
+@pytest.fixture
+def fork_servers(mocker):
+    servers = []
+
+    def fake_new_server(*args, **kwargs):
+        servers.append(s := pm.ServerMock())
+        return s, pm.PlxProxyGlobalObjectMock()
+
+    mocker.patch("plxhelper.branch_calculation.new_server", fake_new_server)
+    return servers
+
+
+def test_trunk(reline_like_phase_tree):
+    assert [p.name for p in reline_like_phase_tree.trunk()] == ["initial", "install"]
+
+
+def test_calculate_branches(reline_like_phase_tree, fork_servers, tmp_path):
+    from plxhelper.branch_calculation import calculate_branches, ServerAddress
+
+    results = calculate_branches(
+        reline_like_phase_tree,
+        tmp_path / "reline.p3d",
+        [ServerAddress("localhost", 10001), ServerAddress("localhost", 10002)],
+        extract=lambda s, g, phase_name: phase_name,
+    )
+    assert results == dict(
+        initial="InitialPhase",
+        install="Phase_1",
+        flood="Phase_2",
+        long_term="Phase_3",
+        truck="Phase_4",
+    )
+    assert sorted(s.filename for s in fork_servers) == [
+        str(tmp_path / "reline_flood.p3d"),
+        str(tmp_path / "reline_long_term.p3d"),
+    ]
+    flood_server = next(s for s in fork_servers if "flood" in s.filename)
+    assert "set Phase_2.ShouldCalculate True" in flood_server.commands
+    assert "set Phase_3.ShouldCalculate False" in flood_server.commands
+
+
+def test_calculate_branches_only_given_phases(
+    reline_like_phase_tree, fork_servers, tmp_path
+):
+    from plxhelper.branch_calculation import calculate_branches, ServerAddress
+
+    truck = next(p for p in reline_like_phase_tree.traverse() if p.name == "truck")
+    results = calculate_branches(
+        reline_like_phase_tree,
+        tmp_path / "reline.p3d",
+        [ServerAddress("localhost", 10001)],
+        extract=lambda s, g, phase_name: phase_name,
+        phases=[truck],
+    )
+    # the long_term branch is forked without results, so it is calculated whole; the trunk and flood are left alone
+    assert results == dict(long_term="Phase_3", truck="Phase_4")
+    assert [s.filename for s in fork_servers] == [
+        str(tmp_path / "reline_long_term.p3d")
+    ]
@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+from plxhelper.branch_calculation import ServerAddress
+from plxhelper.core_scheduler import (
+    CoreScheduler,
+    allocate_cores,
+    calculation_time,
+)
+
+SERVERS = [ServerAddress("localhost", port) for port in range(10000, 10004)]
+
+
+def test_calculation_time():
+    assert calculation_time(10.0, 1) == pytest.approx(10.0)
+    assert calculation_time(10.0, 4, parallel_fraction=0.8) == pytest.approx(4.0)
+
+
+def test_allocate_cores_favours_large_models():
+    cores = allocate_cores([100.0, 10.0, 1.0], 8)
+    assert sum(cores) == 8
+    assert cores[0] > cores[1] >= cores[2] >= 1
+
+
+def test_allocate_cores_equal_models_share_evenly():
+    assert allocate_cores([5.0] * 4, 8) == [2, 2, 2, 2]
+
+
+def test_allocate_cores_max_cores():
+    assert allocate_cores([100.0, 1.0], 8, max_cores=3) == [3, 3]
+
+
+def test_allocate_cores_too_many_calculations():
+    with pytest.raises(ValueError):
+        allocate_cores([1.0] * 3, 2)
+
+
+def test_map_never_oversubscribes():
+    lock = threading.Lock()
+    in_use = dict(cores=0, peak=0, servers=set())
+
+    def run(job, cores, server):
+        with lock:
+            assert server not in in_use["servers"]
+            in_use["servers"].add(server)
+            in_use["cores"] += cores
+            in_use["peak"] = max(in_use["peak"], in_use["cores"])
+        time.sleep(0.01 * job)
+        with lock:
+            in_use["cores"] -= cores
+            in_use["servers"].remove(server)
+        return job, cores
+
+    sizes = [1, 5, 2, 8, 3, 1, 4, 2]
+    results = CoreScheduler(total_cores=6).map(run, sizes, sizes, SERVERS)
+    assert [job for job, _ in results] == sizes
+    assert all(cores >= 1 for _, cores in results)
+    assert in_use["peak"] <= 6
+
+
+def test_map_starts_largest_first():
+    started = []
+
+    def run(job, cores, server):
+        started.append(job)
+        return cores
+
+    sizes = [1.0, 3.0, 2.0]
+    cores = CoreScheduler(total_cores=4).map(run, sizes, sizes, SERVERS[:1])
+    assert started == [3.0, 2.0, 1.0]
+    # one server, so each calculation has every core to itself
+    assert cores == [4, 4, 4]
+
+
+def test_map_raises_errors():
+    def run(job, cores, server):
+        raise RuntimeError(job)
+
+    with pytest.raises(RuntimeError):
+        CoreScheduler(total_cores=2).map(run, ["a"], [1.0], SERVERS)
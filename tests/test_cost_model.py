@@ -0,0 +1,113 @@
+import pickle
+
+import pytest
+
+import plxhelper.single_pipe_reline_task as single_pipe_reline
+from benchmarks.remote_calls import RELINE_CHAIN_INPUTS
+from plxhelper.branch_calculation import ServerAddress
+from plxhelper.cost_model import CostModel, TimingHistory
+from plxhelper.task_chain import TaskChain
+
+
+def _features(area, coarseness=0.05, layers=1):
+    return dict(area=area, coarseness=coarseness, layers=layers)
+
+
+def _records():
+    """mesh_project time grows with area / coarseness**2, calculate_project time with area squared."""
+    return [
+        dict(
+            features=_features(area, coarseness),
+            durations=dict(
+                mesh_project=2.0 * area / coarseness**2,
+                calculate_project=0.5 * area**2,
+            ),
+            elements=100.0 * area / coarseness**3,
+        )
+        for area in (1.0, 2.0, 4.0)
+        for coarseness in (0.05, 0.1)
+    ]
+
+
+def test_timing_history_round_trip(tmp_path):
+    history = TimingHistory(tmp_path / "timings.jsonl")
+    assert history.records() == []
+    history.record(_features(1.0), dict(new_project=0.5))
+    history.record(_features(2.0), dict(new_project=0.7), elements=1200)
+    assert len(history) == 2
+    assert history.records()[1] == dict(
+        features=_features(2.0), durations=dict(new_project=0.7), elements=1200
+    )
+    # a history sent to worker processes appends to the same file
+    pickle.loads(pickle.dumps(history)).record(_features(3.0), {})
+    assert len(history) == 3
+
+
+def test_cost_model_recovers_power_laws():
+    cost_model = CostModel.from_history(_records())
+    prediction = cost_model.predict(_features(8.0, 0.2))
+    assert prediction.durations["mesh_project"] == pytest.approx(2.0 * 8.0 / 0.2**2)
+    assert prediction.durations["calculate_project"] == pytest.approx(0.5 * 8.0**2)
+    assert prediction.elements == pytest.approx(100.0 * 8.0 / 0.2**3)
+    assert prediction.total == pytest.approx(sum(prediction.durations.values()))
+
+
+def test_unvaried_features_get_no_weight():
+    cost_model = CostModel.from_history(_records())
+    assert cost_model.predict(_features(2.0, layers=5)).total == pytest.approx(
+        cost_model.predict(_features(2.0, layers=1)).total
+    )
+
+
+def test_cost_model_needs_a_history(tmp_path):
+    with pytest.raises(ValueError):
+        CostModel.from_history(TimingHistory(tmp_path / "timings.jsonl"))
+
+
+def test_run_chain_records_link_durations(tmp_path):
+    chain = TaskChain()
+
+    @chain.link
+    def build():
+        return "built"
+
+    @chain.link
+    def analyze():
+        return "results"
+
+    history = TimingHistory(tmp_path / "timings.jsonl")
+    assert single_pipe_reline._run_chain(chain, history, _features(1.0)) == "results"
+    (record,) = history.records()
+    assert list(record["durations"]) == ["build", "analyze"]
+    assert record["features"] == _features(1.0)
+
+
+def _case(width, **changes):
+    return {**RELINE_CHAIN_INPUTS, "xmin": -width / 2, "xmax": width / 2, **changes}
+
+
+def test_model_features():
+    features = single_pipe_reline.model_features(_case(100.0))
+    assert features["area"] == pytest.approx(100.0 * 360)
+    assert features["boreholes"] == 1
+    assert features["phases"] == single_pipe_reline.PHASE_COUNT
+    assert features["outline_length"] > 0
+    assert all(value > 0 for value in features.values())
+
+
+def test_run_sweep_refuses_runs_over_budget():
+    records = [
+        dict(
+            features=single_pipe_reline.model_features(_case(width)),
+            durations=dict(calculate_project=width),
+        )
+        for width in (100.0, 200.0)
+    ]
+    cost_model = CostModel.from_history(records)
+    servers = [ServerAddress("localhost", 10000)]
+    with pytest.raises(single_pipe_reline.SinglePipeRelineError, match=r"\[1\]"):
+        single_pipe_reline.run_sweep(
+            [_case(100.0), _case(400.0)], servers, cost_model=cost_model, budget=300
+        )
+    with pytest.raises(single_pipe_reline.SinglePipeRelineError):
+        single_pipe_reline.run_sweep([_case(100.0)], servers, budget=300)
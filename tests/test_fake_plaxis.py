@@ -0,0 +1,127 @@
+"""The geometry helpers of plaxis_helper run against the in-process fake g_i (see test_plaxis_helper_live.py)."""
+
+import pytest
+
+from plxhelper.geo import BoundingBox
+
+R = 80  # in
+LENGTH = 500  # in
+
+
+@pytest.fixture(params=(True, False), ids=["with_footings", "no_footings"])
+def with_footings(request):
+    return request.param
+
+
+@pytest.fixture
+def pipe_shape_info_dict(with_footings):
+    return dict(
+        Offset1=R,
+        Offset2=-R,
+        footing=(
+            dict(span=2 * R, rise=R, width=86, height=30, outside=43, key=5)
+            if with_footings
+            else None
+        ),
+        select_backfill=(
+            dict(width=2 * R + 72, height=117, h_min=42) if with_footings else None
+        ),
+        segments=[
+            dict(SegmentType="Arc", RelativeStartAngle1=90, Radius=R, CentralAngle=180),
+        ],
+    )
+
+
+@pytest.fixture
+def extruded_pipe_structures(fake_plaxis_helper, pipe_shape_info_dict):
+    pipe_structures = fake_plaxis_helper.add_pipe_structure(
+        (0, 0, 0), pipe_shape_info_dict, (1, 0, 0)
+    ).values()
+    return fake_plaxis_helper.extrude(
+        to_extrude=tuple(pipe_structures), length=LENGTH, vector=(0, 1, 0)
+    )
+
+
+@pytest.fixture
+def cutter_obj(fake_plaxis_helper):
+    return fake_plaxis_helper.g_i.surface(
+        (-2 * R, LENGTH / 2, -2 * R),
+        (2 * R, LENGTH / 2, -2 * R),
+        (2 * R, LENGTH / 2, 2 * R),
+        (-2 * R, LENGTH / 2, 2 * R),
+    )
+
+
+def test_add_box(fake_plaxis_helper):
+    box = fake_plaxis_helper.add_box(0, 0, 10, 4, 2, (1, 0, 0))
+    assert BoundingBox.from_plx(box) == ((-2, 0, 8), (2, 0, 10))
+    assert fake_plaxis_helper.g_i.Surfaces == [box]
+    assert fake_plaxis_helper.g_i.Polycurves == []
+
+
+def test_extruded_pipe_bounding_box(fake_plaxis_helper, extruded_pipe_structures):
+    pipe, *_ = extruded_pipe_structures
+    assert BoundingBox.from_plx(pipe) == ((-R, 0, -R), (R, LENGTH, 0))
+    assert pipe in fake_plaxis_helper.g_i.Surfaces
+
+
+def test_center_of_gravity(fake_plaxis_helper):
+    g_i = fake_plaxis_helper.g_i
+    volume, _soil = g_i.extrude(
+        fake_plaxis_helper.add_box(0, 0, 10, 4, 2, (1, 0, 0)), (0, 6, 0)
+    )
+    assert fake_plaxis_helper.cog(volume) == pytest.approx((0, 3, 9))
+
+
+def test_cut(fake_plaxis_helper, extruded_pipe_structures, cutter_obj, with_footings):
+    g_i = fake_plaxis_helper.g_i
+    cut_list = fake_plaxis_helper.cut(g_i.group(extruded_pipe_structures), cutter_obj)
+    assert len(cut_list) == (8 if with_footings else 2)
+    assert all(
+        BoundingBox.from_plx(piece).p_max.y <= LENGTH / 2
+        or BoundingBox.from_plx(piece).p_min.y >= LENGTH / 2
+        for piece in cut_list
+    )
+
+
+def test_skew_cut(
+    fake_plaxis_helper, extruded_pipe_structures, cutter_obj, with_footings
+):
+    results = fake_plaxis_helper.skew_cut(
+        extruded_pipe_structures, cutter_obj, 15, (0, 1)
+    )
+    kept = results if isinstance(results, list) else [results]
+    assert len(kept) == (4 if with_footings else 1)
+    assert all(fake_plaxis_helper.cog(piece).y < LENGTH / 2 for piece in kept)
+
+
+def test_translate_and_rotate(fake_plaxis_helper):
+    box = fake_plaxis_helper.add_box(0, 0, 10, 4, 2, (1, 0, 0))
+    fake_plaxis_helper.translate(box, (100, 100))
+    assert BoundingBox.from_plx(box) == ((98, 100, 8), (102, 100, 10))
+    fake_plaxis_helper.rotate(box, (100, 100, 0), rz=90)
+    p_min, p_max = BoundingBox.from_plx(box)
+    assert p_min == pytest.approx((100, 98, 8))
+    assert p_max == pytest.approx((100, 102, 10))
+
+
+def test_batch_commands(fake_plaxis_helper):
+    g_i = fake_plaxis_helper.g_i
+    box = fake_plaxis_helper.add_box(0, 0, 10, 4, 2, (1, 0, 0))
+    point, _ = fake_plaxis_helper.batch_commands(
+        (None, "point", 1, 2, 3.5),
+        (None, "move", box, (100, 100, 0)),
+    )
+    assert (point.x, point.y, point.z) == (1, 2, 3.5)
+    assert BoundingBox.from_plx(box) == ((98, 100, 8), (102, 100, 10))
+
+    # commands on objects the fake g_i does not have (phases, boreholes, ...) are only acknowledged
+    results = fake_plaxis_helper.batch_commands(
+        (box, "setproperties", ("Comment", "box"), ("Depth", 2)),
+        (fake_plaxis_helper.PlxRef(f"{point.Name}.Comment"), "set", "point"),
+        (fake_plaxis_helper.PlxRef("Phase_1.ShouldCalculate"), "set", True),
+    )
+    assert results == ["OK"] * 3
+    assert (box.Comment, box.Depth, point.Comment) == ("box", 2, "point")
+    assert fake_plaxis_helper.s_i.commands[-1] == "set Phase_1.ShouldCalculate True"
+    assert point in g_i.Points
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+from plxhelper.fingerprint import canonical, fingerprint
+
+
+def test_fingerprint_ignores_dict_order():
+    assert fingerprint(dict(a=1, b=(2, 3))) == fingerprint(dict(b=[2, 3], a=1))
+
+
+def test_fingerprint_tuple_keys():
+    boreholes_dict = {(0, 0): dict(layers=[10, 20]), (5.5, 0): dict(layers=[30])}
+    assert fingerprint(boreholes_dict) == fingerprint(dict(reversed(boreholes_dict.items())))
+
+
+def test_fingerprint_changes_with_content():
+    assert fingerprint(("SW90",), 1.0) != fingerprint(("SW90",), 1.5)
+
+
+def test_canonical_numpy():
+    assert canonical(np.array([1.5, 2.0])) == canonical([1.5, 2.0])
+
+
+def test_canonical_unsupported():
+    with pytest.raises(TypeError):
+        canonical(object())
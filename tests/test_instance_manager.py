@@ -0,0 +1,116 @@
+import pathlib
+import socket
+import sys
+
+import psutil
+import pytest
+
+from plxhelper.branch_calculation import ServerAddress
+from plxhelper.core_scheduler import CoreScheduler
+from plxhelper.instance_manager import (
+    MOCK_SERVER_COMMAND,
+    InstanceError,
+    InstanceManager,
+)
+
+REPO_ROOT = pathlib.Path(__file__).parents[1]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def _manager(count=1, **kwargs):
+    return InstanceManager(
+        MOCK_SERVER_COMMAND,
+        count=count,
+        first_port=_free_port(),
+        cwd=REPO_ROOT,
+        startup_timeout=30.0,
+        **kwargs,
+    )
+
+
+def _running(pid):
+    try:
+        return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return False
+
+
+def test_start_and_stop():
+    with _manager(count=2) as manager:
+        servers = manager.servers
+        assert [server.port for server in servers] == [
+            servers[0].port,
+            servers[0].port + 1,
+        ]
+        assert all(manager.healthy(server) for server in servers)
+        assert manager.memory(servers[0]) > 0
+        pids = [manager.pid(server) for server in servers]
+    assert not any(_running(pid) for pid in pids)
+
+
+def test_session_connects_to_a_server():
+    with _manager() as manager:
+        with manager.session() as session:
+            assert session.server == manager.servers[0]
+            phase = session.g_i.phase(session.g_i.InitialPhase)
+            assert str(phase.Name) == "Phase_1"
+        assert manager.runs(manager.servers[0]) == 1
+
+
+def test_recycled_after_max_runs():
+    with _manager(max_runs=2) as manager:
+        (server,) = manager.servers
+        pid = manager.pid(server)
+        with manager.session():
+            pass
+        assert manager.pid(server) == pid
+        with manager.session() as session:
+            session.g_i.phase(session.g_i.InitialPhase)
+        assert manager.pid(server) != pid
+        assert manager.runs(server) == 0
+        # the restarted server is a fresh project
+        with manager.session() as session:
+            assert str(session.g_i.phase(session.g_i.InitialPhase).Name) == "Phase_1"
+
+
+def test_recycled_over_max_memory():
+    with _manager(max_memory=1) as manager:
+        (server,) = manager.servers
+        pid = manager.pid(server)
+        manager.release(server)
+        assert manager.pid(server) != pid
+
+
+def test_dead_server_is_restarted():
+    with _manager() as manager:
+        (server,) = manager.servers
+        psutil.Process(manager.pid(server)).kill()
+        with manager.session() as session:
+            assert manager.healthy(session.server)
+
+
+def test_failing_command():
+    manager = InstanceManager(
+        (sys.executable, "-c", "raise SystemExit(3)"), first_port=_free_port()
+    )
+    with pytest.raises(InstanceError, match="code 3"):
+        manager.start()
+
+
+def test_scheduler_releases_servers():
+    released = []
+    servers = [ServerAddress("localhost", port) for port in (10000, 10001)]
+    CoreScheduler(total_cores=2).map(
+        lambda job, cores, server: job,
+        range(5),
+        [1.0] * 5,
+        servers,
+        on_release=released.append,
+    )
+    assert len(released) == 5
+    assert set(released) <= set(servers)
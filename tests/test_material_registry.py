@@ -0,0 +1,64 @@
+import pytest
+
+import plxhelper.plaxis_helper as plaxis_helper
+from plxhelper.material_registry import MaterialRegistry, material_key
+from plxhelper.mock_server import MockPlaxisServer
+
+GROUT = ("linear_elastic_soil", "Grout", 40)
+SHORT_TERM = ("plate", "GRPLinerPipe", "34mm", "Short")
+LONG_TERM = ("plate", "GRPLinerPipe", "34mm", "Long")
+
+
+@pytest.fixture
+def connected():
+    with MockPlaxisServer() as server:
+        plaxis_helper.connect_server(port=server.port)
+        server.clear_requests()
+        yield server
+
+
+def test_material_key():
+    assert material_key("plate", "a", b=1, a=2) == (
+        "plate",
+        ("a",),
+        (("a", 2), ("b", 1)),
+    )
+
+
+def test_get_reuses_material(connected):
+    registry = MaterialRegistry()
+    grout = registry.get(*GROUT)
+    assert registry.get(*GROUT) is grout
+    assert registry.creator(*GROUT)() is grout
+    assert len(registry) == 1
+    assert grout.Identification.value == "Lightweight Grout"
+
+
+def test_requested_materials_are_created_in_one_batch(connected):
+    registry = MaterialRegistry()
+    for material_type in (GROUT, SHORT_TERM, LONG_TERM):
+        registry.request(*material_type)
+    connected.clear_requests()
+    short_term = registry.get(*SHORT_TERM)
+    registry.get(*GROUT)
+    registry.get(*LONG_TERM)
+    # three commands sent in a single request
+    assert connected.request_counts()["commands"] == 1
+    assert connected.command_count() == 3
+    assert registry.materials()[material_key(*SHORT_TERM)] is short_term
+
+
+def test_from_names(connected):
+    registry = MaterialRegistry()
+    grout = registry.get(*GROUT)
+    restored = MaterialRegistry.from_names(registry.names())
+    assert material_key(*GROUT) in restored
+    assert plaxis_helper.plx_names([restored.get(*GROUT)]) == plaxis_helper.plx_names(
+        [grout]
+    )
+
+
+def test_material_kwargs_returns_copies():
+    kwargs = plaxis_helper.material_kwargs(*SHORT_TERM)
+    kwargs.clear()
+    assert plaxis_helper.material_kwargs(*SHORT_TERM)
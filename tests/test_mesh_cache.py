@@ -0,0 +1,64 @@
+import pytest
+
+MESH_SETTINGS = dict(Coarseness=0.05, EMRGlobalScale=1.2)
+
+
+@pytest.fixture
+def mesh_cache(plaxis_helper, tmp_path):
+    from plxhelper.mesh_cache import MeshCache
+
+    return MeshCache(tmp_path / "meshes")
+
+
+def test_geometry_fingerprint_depends_on_mesh_settings():
+    from plxhelper.mesh_cache import geometry_fingerprint
+
+    plan = dict(extents=(-500, -1000, 500, 1000), boreholes_dict={(0, 0): dict(layers=[100])})
+    assert geometry_fingerprint(plan, MESH_SETTINGS) == geometry_fingerprint(
+        dict(reversed(plan.items())), dict(reversed(MESH_SETTINGS.items()))
+    )
+    assert geometry_fingerprint(plan, MESH_SETTINGS) != geometry_fingerprint(
+        plan, dict(MESH_SETTINGS, Coarseness=0.1)
+    )
+
+
+def test_mesh_cache_reuses_mesh(mesh_cache, plaxis_helper, tmp_path):
+    restored = []
+    assert not mesh_cache.mesh("abc", MESH_SETTINGS, tmp_path / "run_1.p3d")
+    assert "abc" in mesh_cache
+    assert mesh_cache.mesh(
+        "abc", MESH_SETTINGS, tmp_path / "run_2.p3d", lambda: restored.append(True)
+    )
+    assert plaxis_helper.g_i.mesh_count == 1
+    assert plaxis_helper.s_i.filename == str(mesh_cache.project_path("abc"))
+    assert restored == [True]
+
+
+def test_mesh_cache_keeps_element_count(mesh_cache, plaxis_helper, tmp_path, mocker):
+    mocker.patch.object(
+        plaxis_helper.g_i, "mesh", return_value="Generated 1234 elements, 2345 nodes"
+    )
+    mesh_cache.mesh("abc", MESH_SETTINGS, tmp_path / "run_1.p3d")
+    assert mesh_cache.elements("abc") == 1234
+
+
+def test_partly_saved_mesh_is_not_cached(mesh_cache, plaxis_helper, tmp_path, mocker):
+    mocker.patch.object(plaxis_helper.g_i, "save", side_effect=OSError("disk full"))
+    with pytest.raises(OSError):
+        mesh_cache.mesh("abc", MESH_SETTINGS, tmp_path / "run_1.p3d")
+    assert "abc" not in mesh_cache
+    assert not any((mesh_cache.directory / "tmp").iterdir())
+
+
+def test_mesh_saved_first_by_another_worker(
+    mesh_cache, plaxis_helper, tmp_path, mocker
+):
+    def save(filename):
+        # another worker finishes saving the same mesh in the meantime
+        (mesh_cache.directory / "abc").mkdir(exist_ok=True)
+        (mesh_cache.directory / "abc" / "other").touch()
+
+    mocker.patch.object(plaxis_helper.g_i, "save", save)
+    assert not mesh_cache.mesh("abc", MESH_SETTINGS, tmp_path / "run_1.p3d")
+    assert "abc" in mesh_cache
+    assert not any((mesh_cache.directory / "tmp").iterdir())
@@ -0,0 +1,58 @@
+import pytest
+from plxscripting.easy import new_server
+
+from plxhelper.mesh_topology import MeshTopologyCache
+from plxhelper.mock_server import MockPlaxisServer
+from plxhelper.output_results import LazyResults
+
+COLUMNS = dict(n="Plate.N22", m="Plate.M22")
+
+
+@pytest.fixture
+def output_server():
+    with MockPlaxisServer() as server:
+        s_o, g_o = new_server("localhost", port=server.port, password="python")
+        g_o.plate((0, 0, 0), (1, 0, 0), (1, 1, 0))
+        g_o.phase(g_o.InitialPhase)
+        for phase_idx, phase_name in enumerate(("InitialPhase", "Phase_1")):
+            for name, values in dict(
+                X=[0, 1], Y=[2, 3], Z=[4, 5], N22=[phase_idx, 1], M22=[6, 7]
+            ).items():
+                server.set_results("Plate_1", phase_name, f"Plate.{name}", values)
+        server.clear_requests()
+        yield server, s_o, g_o
+
+
+def test_coordinates_fetched_once_per_mesh(output_server, tmp_path):
+    server, s_o, g_o = output_server
+    topology = MeshTopologyCache(tmp_path)
+    first = topology.frame(
+        LazyResults(s_o, g_o), "mesh", "InitialPhase", "Plate_1", COLUMNS
+    )
+    assert first.columns.tolist() == ["x", "y", "z", "n", "m"]
+    assert server.command_count() == 5
+    server.clear_requests()
+
+    # another run sharing the mesh, in another process
+    second = MeshTopologyCache(tmp_path).frame(
+        LazyResults(s_o, g_o), "mesh", "Phase_1", "Plate_1", COLUMNS
+    )
+    assert second.values.tolist() == [[0, 2, 4, 1, 6], [1, 3, 5, 1, 7]]
+    assert server.command_count() == 2
+    assert server.request_counts()["commands"] == 1
+
+
+def test_other_mesh_fetches_coordinates(output_server):
+    server, s_o, g_o = output_server
+    topology = MeshTopologyCache()
+    topology.frame(LazyResults(s_o, g_o), "mesh", "Phase_1", "Plate_1", COLUMNS)
+    assert topology.get("mesh", "Plate_1").tolist() == [[0, 2, 4], [1, 3, 5]]
+    assert topology.get("other mesh", "Plate_1") is None
+
+
+def test_node_count_mismatch(output_server):
+    _, s_o, g_o = output_server
+    topology = MeshTopologyCache()
+    topology.put("mesh", "Plate_1", [[0, 0, 0]])
+    with pytest.raises(ValueError):
+        topology.frame(LazyResults(s_o, g_o), "mesh", "Phase_1", "Plate_1", COLUMNS)
@@ -0,0 +1,88 @@
+import pytest
+from plxscripting.easy import new_server
+from plxscripting.plx_scripting_exceptions import PlxScriptingError
+
+import plxhelper.plaxis_helper as plaxis_helper
+from plxhelper.mock_server import MockPlaxisServer, parse_command, Ref
+
+
+@pytest.fixture
+def mock_server():
+    with MockPlaxisServer() as server:
+        yield server
+
+
+@pytest.fixture
+def connected(mock_server):
+    plaxis_helper.connect_server(port=mock_server.port)
+    mock_server.clear_requests()
+    return mock_server
+
+
+def test_parse_command():
+    assert parse_command('soilmat ("Identification" "Sand") ("gammaUnsat" 20.5)') == (
+        "soilmat",
+        [("Identification", "Sand"), ("gammaUnsat", 20.5)],
+    )
+    assert parse_command("set Plate_1.Material Phase_1 True") == (
+        "set",
+        [Ref("Plate_1.Material"), Ref("Phase_1"), True],
+    )
+
+
+def test_objects_and_properties(connected):
+    g_i = plaxis_helper.g_i
+    material = g_i.soilmat(("Identification", "Sand"), ("gammaUnsat", 20))
+    assert material.Identification.value == "Sand"
+    phase = g_i.phase(g_i.InitialPhase)
+    assert plaxis_helper.plx_names(g_i.Phases) == ["InitialPhase", "Phase_1"]
+    assert phase.PreviousPhase.value.Name.value == "InitialPhase"
+
+
+def test_meshing_cuts_volumes(connected):
+    g_i = plaxis_helper.g_i
+    surface = g_i.surface((0, 0, 0), (1, 0, 0), (1, 1, 0))
+    volume, _ = g_i.extrude(surface, 0, 0, 1)
+    g_i.gotomesh()
+    parts = getattr(g_i, str(volume.Name))
+    assert plaxis_helper.plx_names(parts) == ["Volume_1_1", "Volume_1_2"]
+    phase = g_i.phase(g_i.InitialPhase)
+    parts[1].Soil.WaterConditions.Conditions.set(phase, "dry")
+
+
+def test_process_boreholes_round_trips(connected):
+    boreholes_dict = {
+        (x, 0): dict(layers=[2, 3], top_el=10, water_table_el=8) for x in range(10)
+    }
+    g_i = plaxis_helper.g_i
+    materials = [g_i.soilmat(), g_i.soilmat()]
+    connected.clear_requests()
+    plaxis_helper.process_boreholes(boreholes_dict, materials)
+    assert connected.request_counts()["commands"] == 3
+    zone = g_i.Soillayers[1].Zones[9]
+    assert (zone.Top.value, zone.Bottom.value) == (8, 5)
+    assert g_i.Soillayers[0].Soil.Material.value.Name.value == "SoilMat_1"
+
+
+def test_latency_is_added(mock_server):
+    mock_server.latency = 0.05
+    s_i, g_i = new_server("localhost", mock_server.port, password="python")
+    mock_server.clear_requests()
+    s_i.call_and_handle_commands("gotostructures")
+    assert [request.endpoint for request in mock_server.requests] == ["commands"]
+    assert mock_server.requests[0].duration >= 0.05
+
+
+def test_failed_command(connected):
+    with pytest.raises(PlxScriptingError):
+        plaxis_helper.s_i.call_and_handle_commands("set Missing_1.Top 5")
+
+
+def test_save_and_open(connected, tmp_path):
+    g_i = plaxis_helper.g_i
+    g_i.point(1, 2, 3)
+    g_i.save(str(tmp_path / "project.p3d"))
+    plaxis_helper.s_i.new()
+    assert len(g_i.Points) == 0
+    plaxis_helper.s_i.open(str(tmp_path / "project.p3d"))
+    assert len(g_i.Points) == 1
@@ -0,0 +1,87 @@
+import time
+
+import numpy as np
+import pytest
+from plxscripting.easy import new_server
+from plxscripting.plx_scripting_exceptions import PlxScriptingError
+
+import plxhelper.plaxis_helper as plaxis_helper
+from plxhelper.branch_calculation import ServerAddress
+from plxhelper.mock_server import MockPlaxisServer
+from plxhelper.output_extraction import (
+    OutputExtractionError,
+    ResultRequest,
+    extract_array,
+    extract_results,
+)
+
+PHASES = [f"Phase_{idx}" for idx in range(1, 7)]
+PLATE_TYPES = ("Plate.N22", "Plate.M22")
+REQUESTS = [
+    ResultRequest(phase, "Plate_1", result_type)
+    for phase in PHASES
+    for result_type in PLATE_TYPES
+]
+
+
+def _latency(endpoint):
+    return 0.05 if endpoint == "commands" else 0.0
+
+
+@pytest.fixture
+def output_server():
+    with MockPlaxisServer(latency=_latency) as server:
+        _, g_o = new_server("localhost", port=server.port, password="python")
+        g_o.plate((0, 0, 0), (1, 0, 0), (1, 1, 0))
+        for phase_idx, phase_name in enumerate(PHASES):
+            g_o.phase(g_o.InitialPhase)
+            for type_idx, result_type in enumerate(PLATE_TYPES):
+                server.set_results(
+                    "Plate_1", phase_name, result_type, [phase_idx, type_idx]
+                )
+        server.clear_requests()
+        yield server
+
+
+def _expected():
+    return [
+        [phase_idx, type_idx]
+        for phase_idx in range(len(PHASES))
+        for type_idx in range(len(PLATE_TYPES))
+    ]
+
+
+def test_results_in_request_order(output_server):
+    servers = [ServerAddress("localhost", output_server.port)]
+    results = extract_results(REQUESTS, servers, connections_per_server=3, chunk_size=1)
+    assert [values.tolist() for values in results] == _expected()
+    assert np.array_equal(extract_array(REQUESTS, servers, chunk_size=5), _expected())
+
+
+def test_chunks_run_concurrently(output_server):
+    servers = [ServerAddress("localhost", output_server.port)]
+    start = time.monotonic()
+    extract_results(REQUESTS, servers, connections_per_server=6, chunk_size=1)
+    # 12 round-trips of 0.05 s take 0.6 s one after another
+    assert time.monotonic() - start < 0.4
+
+
+def test_failed_chunks_are_retried(output_server, mocker):
+    batch_commands = plaxis_helper.batch_commands
+    failures = iter([OSError("connection reset"), PlxScriptingError("busy")])
+
+    def flaky_batch_commands(*calls, server=None):
+        if (error := next(failures, None)) is not None:
+            raise error
+        return batch_commands(*calls, server=server)
+
+    mocker.patch.object(plaxis_helper, "batch_commands", flaky_batch_commands)
+    servers = [ServerAddress("localhost", output_server.port)]
+    results = extract_results(REQUESTS, servers, chunk_size=4)
+    assert [values.tolist() for values in results] == _expected()
+
+
+def test_failing_chunks_raise(output_server):
+    servers = [ServerAddress("localhost", output_server.port)]
+    with pytest.raises(OutputExtractionError):
+        extract_results([("Phase_1", "Plate_1", "Plate.Q12")], servers, retries=1)
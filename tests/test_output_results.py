@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from plxscripting.easy import new_server
+
+from plxhelper.mock_server import MockPlaxisServer
+from plxhelper.output_results import LazyResults
+
+PLATE_TYPES = ("Plate.X", "Plate.N22", "Plate.M22")
+
+
+@pytest.fixture
+def output_server():
+    with MockPlaxisServer() as server:
+        s_o, g_o = new_server("localhost", port=server.port, password="python")
+        g_o.plate((0, 0, 0), (1, 0, 0), (1, 1, 0))
+        g_o.phase(g_o.InitialPhase)
+        for phase_idx, phase_name in enumerate(("InitialPhase", "Phase_1")):
+            for type_idx, result_type in enumerate(PLATE_TYPES):
+                server.set_results(
+                    "Plate_1", phase_name, result_type, [phase_idx, type_idx, 1.5]
+                )
+        server.set_results(None, "Phase_1", "Soil.Utot", [0.25])
+        yield server, s_o, g_o
+
+
+def _commands(server):
+    return server.request_counts()["commands"]
+
+
+def test_fetches_once(output_server):
+    server, s_o, g_o = output_server
+    results = LazyResults(s_o, g_o)
+    n22 = results["Phase_1", "Plate_1", "Plate.N22"]
+    assert n22.tolist() == [1.0, 1.0, 1.5]
+    assert not n22.flags.writeable
+    server.clear_requests()
+    assert results[g_o.Phase_1, g_o.Plate_1, g_o.ResultTypes.Plate.N22] is n22
+    assert _commands(server) == 0
+    assert results.cache_info()[:2] == (1, 1)
+    assert results["Phase_1", None, "Soil.Utot"].tolist() == [0.25]
+
+
+def test_prefetches_result_types_seen_for_the_object(output_server):
+    server, s_o, g_o = output_server
+    results = LazyResults(s_o, g_o)
+    for result_type in PLATE_TYPES:
+        results["InitialPhase", "Plate_1", result_type]
+    server.clear_requests()
+    assert results["Phase_1", "Plate_1", "Plate.X"].tolist() == [1.0, 0.0, 1.5]
+    assert _commands(server) == 1
+    assert ("Phase_1", "Plate_1", "Plate.M22") in results
+    results["Phase_1", "Plate_1", "Plate.N22"]
+    results["Phase_1", "Plate_1", "Plate.M22"]
+    assert _commands(server) == 1
+
+
+def test_frame_in_one_round_trip(output_server):
+    server, s_o, g_o = output_server
+    results = LazyResults(s_o, g_o)
+    results.frame("Phase_1", "Plate_1", dict(x="Plate.X"))
+    server.clear_requests()
+    frame = results.frame("Phase_1", "Plate_1", dict(x="Plate.X", n="Plate.N22"))
+    assert frame.columns.tolist() == ["x", "n"]
+    assert frame["n"].tolist() == [1.0, 1.0, 1.5]
+    assert _commands(server) == 1
+
+
+def test_least_recently_used_are_evicted(output_server):
+    server, s_o, g_o = output_server
+    results = LazyResults(s_o, g_o, max_bytes=2 * 3 * 8, prefetch=0)
+    x = results["InitialPhase", "Plate_1", "Plate.X"]
+    results["InitialPhase", "Plate_1", "Plate.N22"]
+    results["InitialPhase", "Plate_1", "Plate.X"]
+    results["InitialPhase", "Plate_1", "Plate.M22"]
+    assert ("InitialPhase", "Plate_1", "Plate.N22") not in results
+    assert results["InitialPhase", "Plate_1", "Plate.X"] is x
+    assert results.cache_info().evictions == 1
+    assert results.cache_info().nbytes == 2 * 3 * 8
+    assert np.array_equal(x, [0.0, 0.0, 1.5])
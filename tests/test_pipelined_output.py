@@ -0,0 +1,96 @@
+import time
+
+import pytest
+from plxscripting.easy import new_server
+
+from plxhelper.branch_calculation import ServerAddress
+from plxhelper.mock_server import MockPlaxisServer
+from plxhelper.pipelined_output import calculate_pipelined
+
+CALCULATION_TIME = 0.1
+EXTRACTION_LATENCY = 0.1
+PHASES = ["InitialPhase", "Phase_1", "Phase_2", "Phase_3"]
+
+
+def _latency(endpoint):
+    return EXTRACTION_LATENCY if endpoint == "commands" else 0.0
+
+
+@pytest.fixture
+def servers():
+    with MockPlaxisServer(latency=_latency) as output_server:
+        _, g_o = new_server("localhost", port=output_server.port, password="python")
+        g_o.plate((0, 0, 0), (1, 0, 0), (1, 1, 0))
+        for phase_idx, phase_name in enumerate(PHASES):
+            if phase_idx:
+                g_o.phase(g_o.InitialPhase)
+            output_server.set_results("Plate_1", phase_name, "Plate.N22", [phase_idx])
+        with MockPlaxisServer(
+            calculation_time=CALCULATION_TIME, output_port=output_server.port
+        ) as input_server:
+            _, g_i = new_server("localhost", port=input_server.port, password="python")
+            for _ in PHASES[1:]:
+                g_i.phase(g_i.InitialPhase)
+            yield input_server, output_server
+
+
+def _extract(results, phase_name):
+    return list(results[phase_name, "Plate_1", "Plate.N22"])
+
+
+def test_calculate_pipelined_streams_each_phase(servers):
+    input_server, _ = servers
+    streamed = []
+    extracted = calculate_pipelined(
+        _extract,
+        sink=lambda phase_name, values: streamed.append((phase_name, values)),
+        server=ServerAddress("localhost", input_server.port),
+    )
+    assert extracted == {phase: [idx] for idx, phase in enumerate(PHASES)}
+    assert streamed == list(extracted.items())
+
+
+def test_extraction_overlaps_calculation(servers):
+    input_server, _ = servers
+    # phase name: (start, end) of its extraction, on the clock of the recorded requests
+    extraction_times = {}
+
+    def extract(results, phase_name):
+        start = time.monotonic()
+        values = _extract(results, phase_name)
+        extraction_times[phase_name] = start, time.monotonic()
+        return values
+
+    calculate_pipelined(extract, server=ServerAddress("localhost", input_server.port))
+    calculations = [
+        (request.start, request.start + request.duration)
+        for request in input_server.requests
+        if request.endpoint == "commands"
+        and request.action["commands"] == ["calculate"]
+    ]
+    assert len(calculations) == len(PHASES)
+    # each phase is extracted while the next one calculates
+    for phase_name, (next_start, next_end) in zip(PHASES, calculations[1:]):
+        extraction_start, extraction_end = extraction_times[phase_name]
+        assert extraction_start < next_end and extraction_end > next_start
+
+
+def test_failed_phases_are_not_extracted(servers):
+    input_server, _ = servers
+    input_server.failing_phases = {"Phase_2"}
+    extracted = calculate_pipelined(
+        _extract, server=ServerAddress("localhost", input_server.port)
+    )
+    assert list(extracted) == ["InitialPhase", "Phase_1", "Phase_3"]
+
+
+def test_extraction_errors_are_raised(servers):
+    input_server, _ = servers
+
+    def extract(results, phase_name):
+        raise ValueError(phase_name)
+
+    with pytest.raises(ValueError):
+        calculate_pipelined(
+            extract, server=ServerAddress("localhost", input_server.port)
+        )
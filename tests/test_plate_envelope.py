@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from plxhelper.plate_envelope import (
+    PlateResults,
+    PlateSection,
+    envelope,
+    plate_section,
+    stations,
+)
+
+SECTION = PlateSection(d=2.0, W11=0.5, YieldStress11=100.0)
+
+
+def _frame(n, m, x=(0.0, 1.0)):
+    return pd.DataFrame(dict(x=x, y=[0.0, 0.0], z=[0.0, 0.0], n=n, m=m))
+
+
+@pytest.fixture
+def results():
+    return PlateResults.from_frames(
+        {
+            ("run", "phase_1"): _frame(n=[-10.0, -20.0], m=[5.0, -1.0]),
+            ("run", "phase_2"): _frame(n=[-30.0, 4.0], m=[-2.0, 60.0]),
+        }
+    )
+
+
+def test_plate_section():
+    assert plate_section("GRPLinerPipe", "34mm", "Long") == (1.33, 0.442225, 6962.0)
+    assert plate_section("GRPLinerPipe", "33mm", "Long") == (1.30, 0.4225, 6962.0)
+
+
+def test_node_envelope(results):
+    envelope_df = envelope(results, SECTION)
+    assert envelope_df[["x", "y", "z"]].values.tolist() == [[0, 0, 0], [1, 0, 0]]
+    assert envelope_df["n_min"].tolist() == [-30.0, -20.0]
+    assert envelope_df["n_min_case"].tolist() == [
+        ("run", "phase_2"),
+        ("run", "phase_1"),
+    ]
+    assert envelope_df["m_max"].tolist() == [5.0, 60.0]
+    assert envelope_df["m_max_case"].tolist() == [
+        ("run", "phase_1"),
+        ("run", "phase_2"),
+    ]
+    # N/d +- |M|/W11
+    assert envelope_df["stress_max"].tolist() == [5.0, 122.0]
+    assert envelope_df["stress_min"].tolist() == [-19.0, -118.0]
+    assert envelope_df["utilization"].tolist() == pytest.approx([0.19, 1.22])
+    assert envelope_df["exceeds"].tolist() == [False, True]
+
+
+def test_sections_by_case(results):
+    sections = {
+        ("run", "phase_1"): SECTION,
+        ("run", "phase_2"): SECTION._replace(YieldStress11=1000.0),
+    }
+    envelope_df = envelope(results, sections)
+    assert envelope_df["utilization_case"].tolist() == [
+        ("run", "phase_1"),
+        ("run", "phase_2"),
+    ]
+    assert not envelope_df["exceeds"].any()
+
+
+def test_station_envelope(results):
+    station = stations(results, origin=(0, 0, 0), axis=(2, 0, 0), spacing=5.0)
+    assert station.tolist() == [0.0, 0.0, 0.0, 0.0]
+    envelope_df = envelope(results, SECTION, station=station)
+    assert envelope_df.index.tolist() == [0.0]
+    assert envelope_df["n_max"].tolist() == [4.0]
+    assert envelope_df["utilization_case"].tolist() == [("run", "phase_2")]
+
+
+def test_nodes_matched_by_rounded_coordinates():
+    results = PlateResults.from_frames(
+        {
+            "a": _frame(n=[1.0, 2.0], m=[0.0, 0.0], x=(0.0, 1.0)),
+            "b": _frame(n=[3.0, 0.0], m=[0.0, 0.0], x=(1e-9, 1.0 + 1e-9)),
+        }
+    )
+    envelope_df = envelope(results, SECTION)
+    assert len(envelope_df) == 2
+    assert envelope_df["n_max_case"].tolist() == ["b", "a"]
+    assert np.array_equal(envelope(results, SECTION, decimals=12).index, range(4))
@@ -84,3 +84,189 @@ def add_pipe_params(request):
 
 def test_add_pipe(plaxis_helper, add_pipe_params):
     assert plaxis_helper.add_pipe_structure(*add_pipe_params)
+
+
+@pytest.fixture
+def make_phase_tree(plaxis_helper):
+    """initial -> excavate -> long_term, with long_term declaring long_term_state under the parent named."""
+    phase, PhaseState = plaxis_helper.phase, plaxis_helper.PhaseState
+
+    def make(long_term_state, long_term_parent="excavate"):
+        @phase()
+        def initial(phase_obj):
+            return PhaseState(water_conditions={"Soil_1": "dry", "Soil_2": "dry"})
+
+        @phase(initial)
+        def excavate(phase_obj):
+            return PhaseState(
+                inactive=["Soil_1"],
+                active=["Plate_1", "Group_1"],
+                water_conditions={"Soil_1": "dry", "Soil_2": "globallevel"},
+            )
+
+        @phase(dict(initial=initial, excavate=excavate)[long_term_parent])
+        def long_term(phase_obj):
+            return PhaseState(**long_term_state)
+
+        return initial
+
+    return make
+
+
+def _long_term_state(plate_mat):
+    return dict(active=["Plate_1"], materials={"Plate_1": plate_mat})
+
+
+@pytest.fixture
+def phase_tree(make_phase_tree):
+    return make_phase_tree(_long_term_state("PlateMat_2"))
+
+
+def test_phase_tree_sends_only_delta(phase_tree, plaxis_helper):
+    phase_tree.process_phase_tree()
+    assert plaxis_helper.s_i.commands == [
+        'set Soil_1.WaterConditions.Conditions InitialPhase "dry"',
+        'set Soil_2.WaterConditions.Conditions InitialPhase "dry"',
+        "activate (Plate_1 Group_1) Phase_1",
+        "deactivate (Soil_1) Phase_1",
+        'set Soil_2.WaterConditions.Conditions Phase_1 "globallevel"',
+        "set Plate_1.Material Phase_2 PlateMat_2",
+    ]
+
+
+def test_phase_tree_inherits_state(phase_tree):
+    phase_tree.process_phase_tree()
+    (long_term,) = phase_tree.children[0].children
+    assert long_term.state["active"] == {"Soil_1": False, "Plate_1": True, "Group_1": True}
+    assert long_term.state["water_conditions"]["Soil_2"] == "globallevel"
+
+
+@pytest.fixture
+def processed_phase_tree(phase_tree, plaxis_helper):
+    phase_tree.process_phase_tree()
+    return phase_tree
+
+
+@pytest.fixture
+def edited_phase_tree(processed_phase_tree, make_phase_tree, plaxis_helper):
+    initial = make_phase_tree(_long_term_state("PlateMat_3"))
+    plaxis_helper.s_i.commands.clear()
+    initial.process_phase_tree(previous=processed_phase_tree)
+    return initial
+
+
+def test_phase_hash_includes_ancestors(processed_phase_tree):
+    hashes = {p.definition_hash for p in processed_phase_tree.traverse()}
+    assert len(hashes) == 3
+
+
+def test_edited_phase_tree_reuses_phases(edited_phase_tree, plaxis_helper):
+    assert len(plaxis_helper.g_i.Phases) == 3
+    assert plaxis_helper.s_i.commands == ["set Plate_1.Material Phase_2 PlateMat_3"]
+
+
+def test_mark_changed_phases(edited_phase_tree, processed_phase_tree, plaxis_helper):
+    plaxis_helper.s_i.commands.clear()
+    marked = edited_phase_tree.mark_changed_phases(calculated=processed_phase_tree)
+    assert [p.name for p in marked] == ["long_term"]
+    assert plaxis_helper.s_i.commands == [
+        "set InitialPhase.ShouldCalculate False",
+        "set Phase_1.ShouldCalculate False",
+        "set Phase_2.ShouldCalculate True",
+    ]
+
+
+@pytest.fixture
+def boreholes_dict():
+    return {
+        (0, 0): dict(layers=[2, 3], top_el=10, water_table_el=8),
+        (50, 0): dict(layers=[4]),
+    }
+
+
+def test_borehole_layer_boundaries(plaxis_helper, boreholes_dict):
+    boundaries = plaxis_helper.borehole_layer_boundaries(boreholes_dict)
+    assert boundaries.tolist() == [[10, 8, 5], [0, -4, -4]]
+
+
+def test_process_boreholes_batches_commands(plaxis_helper, boreholes_dict):
+    from plaxismock import NamedMock
+
+    soil_layer_1, soil_layer_2 = NamedMock("Soillayer_1"), NamedMock("Soillayer_2")
+    soil_layer_1.Zones = [NamedMock("BVLayerZone_1"), NamedMock("BVLayerZone_2")]
+    soil_layer_2.Zones = [NamedMock("BVLayerZone_3"), NamedMock("BVLayerZone_4")]
+    plaxis_helper.g_i.Soillayers = [soil_layer_1, soil_layer_2]
+    plaxis_helper.s_i.commands.clear()
+    plaxis_helper.process_boreholes(
+        boreholes_dict, [NamedMock("SoilMat_1"), NamedMock("SoilMat_2")]
+    )
+    commands = plaxis_helper.s_i.commands
+    assert commands[:4] == ["borehole 0 0", "borehole 50 0", "soillayer 0", "soillayer 0"]
+    assert "set Soillayer_2.Soil.Material SoilMat_2" in commands
+    assert "set BVLayerZone_3.Top 8.0" in commands
+    assert "set BVLayerZone_4.Bottom -4.0" in commands
+    assert len(commands) == 4 + 2 + 2 + 2 * 2 * 2
+
+
+def _phase_names(g_i):
+    return [p.Name for p in g_i.Phases]
+
+
+def test_removed_declaration_reverts_to_parent_state(make_phase_tree, plaxis_helper):
+    previous = make_phase_tree(dict(water_conditions={"Soil_2": "dry"}))
+    previous.process_phase_tree()
+    plaxis_helper.s_i.commands.clear()
+    make_phase_tree({}).process_phase_tree(previous=previous)
+    assert plaxis_helper.s_i.commands == [
+        'set Soil_2.WaterConditions.Conditions Phase_2 "globallevel"'
+    ]
+    assert _phase_names(plaxis_helper.g_i) == ["InitialPhase", "Phase_1", "Phase_2"]
+
+
+def test_removed_declaration_unknown_to_parent_renews_phase(
+    make_phase_tree, plaxis_helper
+):
+    previous = make_phase_tree(_long_term_state("PlateMat_2"))
+    previous.process_phase_tree()
+    plaxis_helper.s_i.commands.clear()
+    edited = make_phase_tree(dict(materials={"Soil_2": "SoilMat_2"}))
+    edited.process_phase_tree(previous=previous)
+    assert [p.Name for p in plaxis_helper.g_i.deleted] == ["Phase_2"]
+    assert _phase_names(plaxis_helper.g_i) == ["InitialPhase", "Phase_1", "Phase_3"]
+    (long_term,) = edited.children[0].children
+    assert long_term.phase_obj.PreviousPhase.Name == "Phase_1"
+    assert plaxis_helper.s_i.commands[-1] == "set Soil_2.Material Phase_3 SoilMat_2"
+
+
+def test_moved_phase_is_renewed_under_its_new_parent(make_phase_tree, plaxis_helper):
+    previous = make_phase_tree(dict(active=["Plate_1"]))
+    previous.process_phase_tree()
+    edited = make_phase_tree(dict(active=["Plate_1"]), long_term_parent="initial")
+    edited.process_phase_tree(previous=previous)
+    long_term = next(p for p in edited.traverse() if p.name == "long_term")
+    assert long_term.phase_obj.PreviousPhase.Name == "InitialPhase"
+    assert long_term.phase_name == "Phase_3"
+    assert [p.Name for p in plaxis_helper.g_i.deleted] == ["Phase_2"]
+    assert _phase_names(plaxis_helper.g_i) == ["InitialPhase", "Phase_1", "Phase_3"]
+
+
+def test_removed_parent_is_deleted_before_children_are_reused(
+    plaxis_helper, make_phase_tree
+):
+    phase, PhaseState = plaxis_helper.phase, plaxis_helper.PhaseState
+    previous = make_phase_tree(dict(active=["Plate_1"]))
+    previous.process_phase_tree()
+
+    @phase()
+    def initial(phase_obj):
+        return PhaseState(water_conditions={"Soil_1": "dry", "Soil_2": "dry"})
+
+    @phase(initial)
+    def long_term(phase_obj):
+        return PhaseState(active=["Plate_1"])
+
+    initial.process_phase_tree(previous=previous)
+    # excavate is deleted along with the long_term phase under it, which is added anew under initial
+    assert [p.Name for p in plaxis_helper.g_i.deleted] == ["Phase_1"]
+    assert _phase_names(plaxis_helper.g_i) == ["InitialPhase", "Phase_3"]
+    assert long_term.phase_name == "Phase_3"
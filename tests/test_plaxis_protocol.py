@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from plxhelper.plaxis_protocol import floatify, floatify_many, FloatifyError
+
+
+class PlxNumber:
+    """Stands in for a Plaxis number proxy, which converts through str()."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        return str(self.value)
+
+
+@pytest.mark.parametrize("value", [1.5, 3, "1.5e2", PlxNumber(-2.25), np.float64(4)])
+def test_floatify(value):
+    assert floatify(value) == float(str(value))
+    assert type(floatify(value)) is float
+
+
+@pytest.mark.parametrize("value", [True, "x", None, PlxNumber("nope")])
+def test_floatify_error(value):
+    with pytest.raises(FloatifyError):
+        floatify(value)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [1, 2.5, 3],
+        ["1", "2.5", "3e0"],
+        np.array([1, 2.5, 3]),
+        map(PlxNumber, [1, 2.5, 3]),
+    ],
+    ids=["numbers", "strings", "array", "proxies"],
+)
+def test_floatify_many(values):
+    result = floatify_many(values)
+    assert result.dtype == float
+    assert result.tolist() == [1.0, 2.5, 3.0]
+
+
+def test_floatify_many_error_positions():
+    with pytest.raises(FloatifyError) as exc_info:
+        floatify_many(["1", "x", 2, PlxNumber("y"), True])
+    assert exc_info.value.positions == (1, 3, 4)
+
+
+@pytest.mark.parametrize(
+    "values, positions",
+    [
+        ([None, 1.0], (0,)),
+        ([1.0, True, np.bool_(False)], (1, 2)),
+        (np.array([True, False]), (0, 1)),
+    ],
+    ids=["none", "bools", "bool array"],
+)
+def test_floatify_many_rejects_what_floatify_rejects(values, positions):
+    with pytest.raises(FloatifyError) as exc_info:
+        floatify_many(values)
+    assert exc_info.value.positions == positions
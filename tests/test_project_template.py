@@ -0,0 +1,20 @@
+import pytest
+
+
+@pytest.fixture
+def templates(plaxis_helper, tmp_path):
+    from plxhelper.project_template import ProjectTemplates
+
+    return ProjectTemplates(tmp_path / "templates")
+
+
+def test_project_template_save_open(templates, plaxis_helper, tmp_path):
+    state = dict(namespace=dict(annular_fill_soilmat_obj="SoilMat_3"))
+    assert "abc" not in templates
+    templates.save("abc", state, tmp_path / "run_1.p3d")
+    assert "abc" in templates
+    assert templates.open("abc", tmp_path / "run_2.p3d") == state
+    assert plaxis_helper.s_i.filename == str(
+        templates.template_path("abc") / "template.p3d"
+    )
+    assert not any((templates.directory / "tmp").iterdir())
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+from plxhelper.run_cache import RunCache
+
+
+@pytest.fixture
+def run_cache(tmp_path):
+    return RunCache(tmp_path / "runs")
+
+
+@pytest.fixture
+def results():
+    return pd.DataFrame(dict(n=[1.0, 2.0], m=[3.0, 4.0]))
+
+
+def test_run_cache_key():
+    inputs = dict(boreholes_dict={(0, 0): dict(layers=[120])}, lane_load="AASHTO Lane Load")
+    assert RunCache.key(**inputs) == RunCache.key(**dict(reversed(inputs.items())))
+    assert RunCache.key(**inputs) != RunCache.key(**inputs, xmin=-500)
+
+
+def test_run_cache_miss(run_cache):
+    assert run_cache.get(RunCache.key(xmin=0)) is None
+
+
+def test_run_cache_put_get(run_cache, results):
+    key = RunCache.key(xmin=0)
+    saved = []
+    assert run_cache.put(key, results, saved.append)
+    assert key in run_cache
+    pd.testing.assert_frame_equal(run_cache.get(key), results)
+    assert saved[0].name == "project.p3d"
+
+
+def test_run_cache_second_put_loses(run_cache, results):
+    key = RunCache.key(xmin=0)
+    assert run_cache.put(key, results)
+    assert not run_cache.put(key, results * 2)
+    pd.testing.assert_frame_equal(run_cache.get(key), results)
+    assert not any((run_cache.directory / "tmp").iterdir())
+
+
+def test_run_cache_claim_releases(run_cache):
+    key = RunCache.key(xmin=0)
+    with run_cache.claim(key):
+        assert (run_cache.directory / "tmp" / f"{key}.lock").exists()
+    with run_cache.claim(key, poll_interval=0):
+        ...
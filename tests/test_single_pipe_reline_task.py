@@ -0,0 +1,184 @@
+import functools
+
+import pytest
+from plxscripting.easy import new_server
+
+import plxhelper.plaxis_helper as plaxis_helper
+import plxhelper.single_pipe_reline_task as single_pipe_reline
+from benchmarks.remote_calls import RELINE_CHAIN_INPUTS
+from plxhelper.branch_calculation import ServerAddress
+from plxhelper.cost_model import CostModel, TimingHistory
+from plxhelper.mesh_cache import MeshCache
+from plxhelper.mock_server import MockPlaxisServer
+from plxhelper.project_template import ProjectTemplates
+
+PHASE_NAMES = [
+    "InitialPhase",
+    *(f"Phase_{idx}" for idx in range(1, single_pipe_reline.PHASE_COUNT)),
+]
+
+
+@pytest.fixture
+def output_server():
+    """Output with plate results of every phase of the reline project; N22 is the phase index."""
+    with MockPlaxisServer() as server:
+        _, g_o = new_server("localhost", port=server.port, password="python")
+        for _ in range(2):
+            g_o.plate((0, 0, 0), (1, 0, 0), (1, 1, 0))
+        for _ in PHASE_NAMES[1:]:
+            g_o.phase(g_o.InitialPhase)
+        for phase_idx, phase_name in enumerate(PHASE_NAMES):
+            for name, values in dict(
+                X=[0, 1], Y=[2, 3], Z=[4, 5], N22=[phase_idx] * 2, M22=[6, 7]
+            ).items():
+                server.set_results("Plate_2", phase_name, f"Plate.{name}", values)
+        yield server
+
+
+@pytest.fixture
+def reline_server(mocker, output_server):
+    with MockPlaxisServer(output_port=output_server.port) as server:
+        mocker.patch.object(
+            single_pipe_reline,
+            "connect_server",
+            functools.partial(plaxis_helper.connect_server, port=server.port),
+        )
+        yield server
+
+
+def test_branch_servers_need_a_project_path():
+    with pytest.raises(single_pipe_reline.SinglePipeRelineError, match="project_path"):
+        single_pipe_reline.task_chain(
+            **RELINE_CHAIN_INPUTS,
+            branch_servers=[ServerAddress("localhost", 10001)],
+        )
+
+
+def test_template_link_must_be_a_template_link(tmp_path):
+    with pytest.raises(single_pipe_reline.SinglePipeRelineError, match="mesh_project"):
+        single_pipe_reline.task_chain(
+            **RELINE_CHAIN_INPUTS,
+            templates=ProjectTemplates(tmp_path / "templates"),
+            template_link="mesh_project",
+        )
+
+
+def _commands(server, method_name):
+    return [
+        command
+        for request in server.requests
+        for command in request.action.get("commands", ())
+        if command.startswith(f"{method_name} ")
+    ]
+
+
+def test_template_restores_namespace_values(reline_server, tmp_path):
+    templates = ProjectTemplates(tmp_path / "templates")
+    l_parent = RELINE_CHAIN_INPUTS["ymax"] - RELINE_CHAIN_INPUTS["ymin"]
+    for _ in range(2):
+        chain = single_pipe_reline.task_chain(
+            **RELINE_CHAIN_INPUTS,
+            project_path=tmp_path / "reline.p3d",
+            templates=templates,
+            template_link="host_pipe_setup",
+        )
+        reline_server.clear_requests()
+        tuple(chain.reline_pipe_setup())
+        # the reline pipe is extruded along the host pipe length set by host_pipe_setup
+        *_, extrude = _commands(reline_server, "extrude")
+        assert extrude.endswith(f" 0 {l_parent} 0")
+    # the second chain opened the template instead of drawing the host pipe
+    assert len(_commands(reline_server, "extrude")) == 1
+
+
+def test_mesh_reused_only_with_the_same_material_roles(reline_server, tmp_path):
+    mesh_cache = MeshCache(tmp_path / "meshes")
+    grout = RELINE_CHAIN_INPUTS["annular_fill_type"]
+    (sw,) = RELINE_CHAIN_INPUTS["soil_layer_materials_list"]
+    for soil_layer_materials_list, annular_fill_type in [
+        ([sw], grout),
+        # other properties, same roles: the mesh is reused
+        ([(*sw[:-1], 20.0)], grout),
+        # the soil layer shares the fill material, so the saved project has other materials on it
+        ([grout], grout),
+    ]:
+        chain = single_pipe_reline.task_chain(
+            **dict(
+                RELINE_CHAIN_INPUTS,
+                soil_layer_materials_list=soil_layer_materials_list,
+                annular_fill_type=annular_fill_type,
+            ),
+            project_path=tmp_path / "reline.p3d",
+            mesh_cache=mesh_cache,
+        )
+        tuple(chain.mesh_project())
+    assert len(list(mesh_cache.directory.glob("*/*.p3d"))) == 2
+
+
+def test_results_sink_to_analyze_output(reline_server):
+    streamed = {}
+    chain = single_pipe_reline.task_chain(
+        **RELINE_CHAIN_INPUTS, results_sink=streamed.__setitem__
+    )
+    *_, frame = chain()
+    assert sorted(streamed) == sorted(
+        ["initial_dry", "phase_1", "phase_2", "phase_3"]
+        + ["phase_4a", "phase_5a", "phase_5b", "phase_4b"]
+    )
+    assert frame is streamed["phase_5b"]
+    assert frame.columns.tolist() == ["x", "y", "z", "n", "m"]
+
+
+def test_mesh_cache_without_project_path(reline_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mesh_cache = MeshCache(tmp_path / "meshes")
+    for _ in range(2):
+        chain = single_pipe_reline.task_chain(
+            **RELINE_CHAIN_INPUTS, mesh_cache=mesh_cache
+        )
+        tuple(chain.mesh_project())
+    # the reused mesh continues as a temporary project, not as a file named "None"
+    assert not (tmp_path / "None").exists()
+    assert reline_server.filename.endswith("project.p3d")
+    assert len(list(mesh_cache.directory.glob("*/*.p3d"))) == 1
+
+
+def _views(server):
+    return sum(
+        command.startswith("view")
+        for request in server.requests
+        for command in request.action.get("commands", ())
+    )
+
+
+def test_branch_results_extracted_on_branch_servers(
+    reline_server, output_server, tmp_path
+):
+    with MockPlaxisServer(output_port=output_server.port) as branch_server:
+        chain = single_pipe_reline.task_chain(
+            **RELINE_CHAIN_INPUTS,
+            project_path=tmp_path / "reline.p3d",
+            branch_servers=[ServerAddress("localhost", branch_server.port)],
+        )
+        *_, frame = chain()
+    # the trunk phases are opened in Output from the trunk project, the others (phase 5b too) from their branch's
+    assert _views(reline_server) == 4
+    assert _views(branch_server) == single_pipe_reline.PHASE_COUNT - 4
+    assert (tmp_path / "reline_phase_4a.p3d").exists()
+    assert frame.columns.tolist() == ["x", "y", "z", "n", "m"]
+
+
+def _case(width):
+    return {**RELINE_CHAIN_INPUTS, "xmin": -width / 2, "xmax": width / 2}
+
+
+def test_element_counts_fitted_from_history(reline_server, tmp_path):
+    history = TimingHistory(tmp_path / "timings.jsonl")
+    for width in (400.0, 800.0):
+        single_pipe_reline.run(**_case(width), timing_history=history)
+    # the stand-in reports an element count in proportion to the model area
+    assert [record["elements"] for record in history.records()] == [1440, 2880]
+    prediction = CostModel.from_history(history).predict(
+        single_pipe_reline.model_features(_case(1600.0))
+    )
+    assert prediction.elements == pytest.approx(5760)
@@ -0,0 +1,57 @@
+import pytest
+
+from plxhelper.geo import BoundingBox
+from plxhelper.spatial_index import SpatialIndex
+
+
+@pytest.fixture
+def index():
+    return SpatialIndex(
+        "abcd",
+        [
+            ((0, 0, 0), (1, 1, 1)),
+            ((2, 0, 0), (3, 1, 1)),
+            ((5, 5, 5), (6, 6, 6)),
+            ((0, 0, 0), (10, 0, 0)),
+        ],
+    )
+
+
+def test_intersecting_box(index):
+    assert index.intersecting_box(((0.5, 0.5, 0.5), (2.5, 0.6, 0.6))) == ["a", "b"]
+    assert index.intersecting_box(((1, 1, 1), (1, 1, 1))) == ["a"]
+    assert index.intersecting_box(((7, 7, 7), (8, 8, 8))) == []
+
+
+def test_plane_and_half_space(index):
+    plane = (1.5, 0, 0), (1, 0, 0)
+    assert index.intersecting_plane(*plane) == ["d"]
+    assert index.intersecting_half_space(*plane) == ["b", "c", "d"]
+    assert index.within_half_space(*plane) == ["b", "c"]
+    assert index.intersecting_plane((0, 0, 0), (1, 1, 0)) == ["a", "d"]
+
+
+def test_update_and_remove(index):
+    index.add(["c", "e"], [((0, 0, 0), (0, 0, 0)), ((9, 9, 9), (9, 9, 9))])
+    assert index.box("c") == ((0, 0, 0), (0, 0, 0))
+    index.remove(["b", "missing"])
+    assert list(index) == ["a", "c", "d", "e"]
+    assert "b" not in index
+    assert index.intersecting_box(((0, 0, 0), (0, 0, 0))) == ["a", "c", "d"]
+
+
+def test_cut_skips_objects_the_cutter_misses(fake_plaxis_helper):
+    g_i = fake_plaxis_helper.g_i
+    index = SpatialIndex()
+    boxes = [
+        fake_plaxis_helper.add_box(x, 0, 10, 20, 10, (1, 0, 0))
+        for x in range(0, 500, 50)
+    ]
+    volumes = fake_plaxis_helper.extrude(boxes, vector=(0, 100, 0), index=index)
+    assert len(index) == len(volumes) == 10
+    cutter = g_i.surface((-20, 50, -20), (20, 50, -20), (20, 50, 20), (-20, 50, 20))
+    pieces = fake_plaxis_helper.cut(g_i.group(volumes), cutter, index)
+    assert len(pieces) == 11
+    assert pieces[2:] == volumes[1:]
+    assert all(piece in index for piece in pieces)
+    assert BoundingBox.from_plx(pieces[0]) == index.box(pieces[0])
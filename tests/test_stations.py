@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from plxhelper.stations import Resampler, outline_points, station_grid
+
+CIRCLE = dict(
+    segments=[
+        dict(SegmentType="Arc", RelativeStartAngle1=180, Radius=1, CentralAngle=180),
+        dict(SegmentType="SymmetricExtend"),
+        dict(SegmentType="SymmetricClose"),
+    ]
+)
+
+
+def test_outline_points():
+    square = outline_points(
+        [
+            dict(SegmentType="Line", Length=2),
+            dict(SegmentType="Line", RelativeStartAngle1=90, Length=1),
+        ],
+        offset=(1, 0),
+    )
+    assert square == pytest.approx(np.array([[1, 0], [3, 0], [3, 1]]))
+    circle = outline_points(CIRCLE["segments"])
+    assert circle[0] == pytest.approx(circle[-1])
+    assert np.hypot(circle[:, 0], circle[:, 1] + 1) == pytest.approx(1)
+
+
+def test_station_grid():
+    grid = station_grid((0, 10, 5), (1, 0, 0), (0, 0, 1), CIRCLE, (0, 4, 0), 3, 4)
+    assert grid.along.tolist() == [0, 2, 4]
+    assert grid.around == pytest.approx(np.arange(4) * np.pi / 2, rel=1e-3)
+    assert grid.xyz.shape == (3, 4, 3)
+    # the crown, then a quarter turn at a time, heading away from axis1 first
+    assert grid.xyz[1] == pytest.approx(
+        np.array([[0, 12, 5], [-1, 12, 4], [0, 12, 3], [1, 12, 4]]), abs=1e-3
+    )
+
+
+@pytest.fixture
+def plane_nodes():
+    rng = np.random.default_rng(1)
+    return np.column_stack([rng.random((200, 2)) * 10, np.zeros(200)])
+
+
+def test_linear_is_exact_for_linear_results(plane_nodes):
+    stations = np.array([[[2.5, 2.5, 0.0], [7.1, 3.3, 0.01]]])
+    resampler = Resampler(plane_nodes, stations)
+    values = 1 + 2 * plane_nodes[:, 0] + 3 * plane_nodes[:, 1]
+    resampled = resampler.resample(values)
+    assert resampled.shape == (1, 2)
+    assert resampled[0] == pytest.approx([13.5, 25.1])
+    both = resampler.resample(np.column_stack([values, -values]))
+    assert both.shape == (1, 2, 2)
+    assert both[0, :, 1] == pytest.approx([-13.5, -25.1])
+
+
+def test_idw(plane_nodes):
+    stations = np.array([plane_nodes[3], [5.0, 5.0, 0.0]])
+    resampler = Resampler(plane_nodes, stations, method="idw")
+    values = np.arange(len(plane_nodes), dtype=float)
+    assert resampler.resample(values)[0] == 3.0
+    assert resampler.resample(np.full(len(plane_nodes), 7.0)) == pytest.approx(7.0)
+    frame = resampler.frame(pd.DataFrame(dict(n=values, m=values)), ["n", "m"])
+    assert frame.columns.tolist() == ["n", "m"]
+    assert frame.loc[0].tolist() == [3.0, 3.0]
+
+
+def test_unknown_method(plane_nodes):
+    with pytest.raises(ValueError):
+        Resampler(plane_nodes, plane_nodes[:2], method="cubic")
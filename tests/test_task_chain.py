@@ -100,3 +100,31 @@ def test_mixed_chain(mixed_chain, task_chain_start, task_chain_step_1):
         task_chain_step_1(),
         task_chain_step_1(),
     )
+
+
+@pytest.fixture
+def templates():
+    return []
+
+
+@pytest.fixture
+def templated_chain(task_chain_step_1, task_chain, templates):
+    return task_chain.from_template(
+        "start",
+        template_exists=lambda: bool(templates),
+        save_template=lambda: templates.append("saved"),
+        open_template=lambda: "opened",
+    )
+
+
+def test_templated_chain(templated_chain, task_chain_step_1):
+    assert len(templated_chain) == 2
+    assert templated_chain[-1] is task_chain_step_1
+    assert templated_chain.start[0].__name__ == "start"
+
+
+def test_templated_chain_saves_then_opens(templated_chain, templates):
+    assert tuple(templated_chain()) == ((TRUTHY_VALUE,), TRUTHY_VALUE)
+    assert templates == ["saved"]
+    assert tuple(templated_chain()) == ("opened", TRUTHY_VALUE)
+    assert templates == ["saved"]
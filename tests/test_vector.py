@@ -1,5 +1,5 @@
 import pytest
-from plxhelper.geo import Vector
+from plxhelper.geo import Point, Vector
 
 
 @pytest.fixture
@@ -69,3 +69,27 @@ def test_rotate_z(vector_a):
     assert vector_a.rotate_z(-90) == pytest.approx(
         (vector_a.j, -vector_a.i, vector_a.k)
     )
+
+
+def test_rotate_z_quarter_turns_are_exact(vector_a):
+    assert vector_a.rotate_z(90) == (-vector_a.j, vector_a.i, vector_a.k)
+    assert vector_a.rotate_z(180) == (-vector_a.i, -vector_a.j, vector_a.k)
+    assert vector_a.rotate_z(-90) == vector_a.rotate_z(270)
+
+
+@pytest.mark.parametrize("other_type", [tuple, list, Vector, Point])
+def test_result_takes_other_type(vector_a, tuple_b, other_type):
+    other = other_type(tuple_b) if other_type in (tuple, list) else other_type(*tuple_b)
+    assert type(vector_a + other) is other_type
+    assert type(vector_a - other) is other_type
+    assert type(other - vector_a) is other_type
+
+
+def test_unbound_on_tuples(tuple_a, tuple_b, a_plus_b, a_minus_b):
+    assert Vector.__add__(tuple_a, tuple_b) == a_plus_b
+    assert Vector.__sub__(tuple_a, tuple_b) == a_minus_b
+
+
+def test_length_mismatch(vector_a):
+    with pytest.raises(ValueError):
+        vector_a + (1, 2)